@@ -0,0 +1,209 @@
+# benchmarks/bench.py
+# Benchmark de rendimiento de punta a punta — sin PyQt6
+# Genera el corpus de benchmarks/corpus.py, lo procesa con BatchExecutor
+# (el mismo camino que la GUI y cli.py) y reporta:
+#   paginas/s, archivos/s, latencia por archivo p50/p95/p99 y RSS maximo
+# Cada corrida se agrega como una linea JSON a --resultados para poder
+# comparar corridas en el tiempo; se muestra la diferencia con la anterior
+# de la misma configuracion.
+#
+# Ejecutar:
+#   python benchmarks/bench.py                       # motor sintetico
+#   python benchmarks/bench.py -m tesseract -w 8 --escala 2
+
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import subprocess
+import multiprocessing
+
+BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE)
+
+from core import utils
+from core.utils import load_defaults
+from core.executor import BatchExecutor, num_workers
+from benchmarks.corpus import generar_corpus
+
+RESULTADOS = os.path.join(BASE, "benchmarks", "resultados.jsonl")
+
+
+def percentil(valores: list, p: float) -> float:
+    """Percentil por rango mas cercano (p en 0-100)."""
+    if not valores:
+        return 0.0
+    orden = sorted(valores)
+    k = max(0, min(len(orden) - 1, int(round(p / 100 * len(orden) + 0.5)) - 1))
+    return orden[k]
+
+
+def rss_maximo_mb() -> dict:
+    """RSS maximo de este proceso y del mayor hijo, en MB (None si no se puede)."""
+    try:
+        import resource
+    except ImportError:
+        return {"principal": None, "hijos": None}
+    # ru_maxrss esta en KB en Linux y en bytes en macOS
+    div = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return {
+        "principal": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / div, 1),
+        "hijos": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / div, 1),
+    }
+
+
+def _version_pil():
+    try:
+        from PIL import __version__
+    except ImportError:
+        return None
+    return __version__
+
+
+def _commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BASE,
+            capture_output=True, text=True, timeout=5).stdout.strip()
+    except Exception:
+        return ""
+
+
+def correr(corpus_dir: str, manifiesto: dict, cfg: dict) -> dict:
+    rutas   = [os.path.join(corpus_dir, a["ruta"]) for a in manifiesto["archivos"]]
+    latencias, errores, etapas = {}, {}, {}
+    # Paginas que el motor realmente proceso, no las del manifiesto: el
+    # motor sintetico lee un TIFF multipagina como una sola
+    paginas = 0
+
+    def on_evento(tipo, ruta, valor):
+        nonlocal paginas
+        if tipo == "error":
+            errores[ruta] = valor
+        elif tipo == "registro":
+            paginas += valor["n_paginas"]
+            for etapa, seg in valor["etapas"].items():
+                etapas[etapa] = etapas.get(etapa, 0.0) + seg
+        elif tipo == "terminado":
+            latencias[ruta] = valor
+
+    t0 = time.perf_counter()
+    BatchExecutor(cfg).ejecutar(rutas, on_evento)
+    wall = time.perf_counter() - t0
+
+    lat = list(latencias.values())
+    return {
+        "archivos":       len(rutas),
+        "paginas":        paginas,
+        "errores":        len(errores),
+        "segundos":       round(wall, 3),
+        "paginas_s":      round(paginas / wall, 2),
+        "archivos_s":     round(len(rutas) / wall, 2),
+        "latencia_p50":   round(percentil(lat, 50), 3),
+        "latencia_p95":   round(percentil(lat, 95), 3),
+        "latencia_p99":   round(percentil(lat, 99), 3),
+        "etapas_s":       {e: round(v, 3) for e, v in etapas.items()},
+        "primer_error":   next(iter(errores.values()), None),
+    }
+
+
+def _anterior(ruta_resultados: str, firma: dict):
+    if not os.path.exists(ruta_resultados):
+        return None
+    previo = None
+    with open(ruta_resultados, "r", encoding="utf-8") as f:
+        for linea in f:
+            try:
+                r = json.loads(linea)
+            except ValueError:
+                continue
+            if r.get("firma") == firma:
+                previo = r
+    return previo
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(
+        prog="bench.py",
+        description="Benchmark de punta a punta sobre un corpus sintetico.")
+    ap.add_argument("-m", "--motor", default="sintetico")
+    ap.add_argument("-w", "--workers", default="auto")
+    ap.add_argument("--sintetico-ms", type=float, default=50)
+    ap.add_argument("--dpi", default="300")
+    ap.add_argument("--escala", type=float, default=1.0, help="multiplica la cantidad de archivos")
+    ap.add_argument("--semilla", type=int, default=1234)
+    ap.add_argument("--corpus", default=os.path.join(tempfile.gettempdir(), "localocr_bench"))
+    ap.add_argument("--resultados", default=RESULTADOS)
+    ap.add_argument("--capa-texto", action="store_true",
+                    help="usar el texto incrustado de los PDF (por defecto se mide el OCR)")
+    ap.add_argument("--etiqueta", default="", help="nota libre guardada con la corrida")
+    args = ap.parse_args(argv)
+
+    manifiesto = generar_corpus(args.corpus, args.escala, args.semilla)
+
+    # Defaults de fabrica, no la config del usuario: corridas reproducibles
+    cfg = load_defaults()
+    salida = tempfile.mkdtemp(prefix="localocr_bench_out_")
+    cfg.update({
+        "motor": args.motor, "workers": args.workers, "dpi": args.dpi,
+        "sintetico_ms": args.sintetico_ms, "cache_activa": False,
+        "output_dir": salida, "modo_salida": "texto",
+        # Los PDF del corpus traen texto: sin esto no se mediria su OCR
+        "usar_capa_texto": args.capa_texto,
+    })
+    # El log de tiempos va a la carpeta temporal: las corridas no llenan
+    # el log del usuario (~/.localocr_tiempos.jsonl)
+    utils.TIEMPOS_PATH = os.path.join(salida, "tiempos.jsonl")
+    try:
+        metricas = correr(args.corpus, manifiesto, cfg)
+    finally:
+        shutil.rmtree(salida, ignore_errors=True)
+    metricas["rss_mb"] = rss_maximo_mb()
+
+    firma = {"motor": args.motor, "workers": num_workers(cfg), "dpi": args.dpi,
+             "sintetico_ms": args.sintetico_ms, "escala": args.escala,
+             "semilla": args.semilla, "capa_texto": args.capa_texto,
+             "pil": _version_pil()}
+    registro = {
+        "fecha":    time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit":   _commit(),
+        "etiqueta": args.etiqueta,
+        "maquina":  {"cpus": os.cpu_count(), "python": platform.python_version(),
+                     "sistema": platform.platform()},
+        "firma":    firma,
+        "metricas": metricas,
+    }
+    previo = _anterior(args.resultados, firma)
+    os.makedirs(os.path.dirname(os.path.abspath(args.resultados)), exist_ok=True)
+    with open(args.resultados, "a", encoding="utf-8") as f:
+        f.write(json.dumps(registro, ensure_ascii=False) + "\n")
+
+    m = metricas
+    print(f"{m['archivos']} archivos / {m['paginas']} paginas en {m['segundos']}s "
+          f"({firma['workers']} procesos, motor {args.motor})")
+    print(f"  paginas/s   {m['paginas_s']}")
+    print(f"  archivos/s  {m['archivos_s']}")
+    print(f"  latencia    p50 {m['latencia_p50']}s  p95 {m['latencia_p95']}s  "
+          f"p99 {m['latencia_p99']}s")
+    print(f"  RSS max     principal {m['rss_mb']['principal']} MB  "
+          f"hijo mayor {m['rss_mb']['hijos']} MB")
+    print("  etapas      " + "  ".join(
+        f"{e} {v}s" for e, v in sorted(m["etapas_s"].items(), key=lambda x: -x[1])))
+    if m["errores"]:
+        print(f"  errores     {m['errores']} (p. ej. {m['primer_error']})")
+    if previo:
+        antes = previo["metricas"]["paginas_s"]
+        cambio = (m["paginas_s"] - antes) / antes * 100 if antes else 0.0
+        print(f"  vs {previo['fecha']} ({previo['commit']}): "
+              f"{antes} -> {m['paginas_s']} paginas/s ({cambio:+.1f}%)")
+    print(f"Resultado agregado a {args.resultados}")
+    return 1 if m["errores"] else 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,231 @@
+# benchmarks/corpus.py
+# Generador de corpus sintetico para benchmarks — sin PyQt6
+# Crea PDF (1 a 100 paginas), PNG, JPG/JPEG, TIFF multipagina y BMP, una
+# mezcla por cada extension de EXTENSIONES_VALIDAS, siempre iguales para
+# la misma semilla. Los PDF llevan texto real (Helvetica) para que
+# Tesseract/EasyOCR tambien tengan algo que leer.
+#
+# Solo usa la libreria estandar; si Pillow esta instalado las imagenes
+# llevan texto dibujado y se generan tambien los JPEG (sin Pillow no
+# hay codificador JPEG y esas entradas se omiten).
+
+import os
+import json
+import zlib
+import random
+import struct
+
+# (extension, paginas, (ancho, alto) en px, cantidad)
+ESPEC = [
+    (".pdf",  1,   None,         6),
+    (".pdf",  5,   None,         4),
+    (".pdf",  20,  None,         2),
+    (".pdf",  100, None,         1),
+    (".png",  1,   (1275, 1650), 6),
+    (".jpg",  1,   (1275, 1650), 4),
+    (".jpeg", 1,   (850, 1100),  2),
+    (".tiff", 3,   (1275, 1650), 2),
+    (".bmp",  1,   (850, 1100),  2),
+]
+
+_PALABRAS = (
+    "factura contrato fecha total cliente importe pagina documento "
+    "numero firma anexo clausula registro domicilio cantidad concepto "
+    "the invoice amount date signature page section account"
+).split()
+
+
+def _lineas(rnd: random.Random, n: int) -> list:
+    return [" ".join(rnd.choice(_PALABRAS) for _ in range(rnd.randint(4, 10)))
+            for _ in range(n)]
+
+
+# ── PDF ──────────────────────────────────────────────────────────
+def _escapar_pdf(texto: str) -> str:
+    return texto.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def escribir_pdf(ruta: str, paginas: list):
+    """PDF minimo y valido; `paginas` es una lista de listas de lineas."""
+    objetos = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    hijos, n = [], 4
+    for lineas in paginas:
+        flujo = ("BT /F1 12 Tf 16 TL 72 740 Td "
+                 + " ".join(f"({_escapar_pdf(l)}) '" for l in lineas)
+                 + " ET").encode("latin-1")
+        objetos[n] = (b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                      b"/Resources << /Font << /F1 3 0 R >> >> "
+                      b"/Contents %d 0 R >>" % (n + 1))
+        objetos[n + 1] = (b"<< /Length %d >>\nstream\n" % len(flujo)
+                          + flujo + b"\nendstream")
+        hijos.append(n)
+        n += 2
+    objetos[2] = (b"<< /Type /Pages /Kids ["
+                  + b" ".join(b"%d 0 R" % k for k in hijos)
+                  + b"] /Count %d >>" % len(hijos))
+
+    salida, offsets = bytearray(b"%PDF-1.4\n"), {}
+    for num in sorted(objetos):
+        offsets[num] = len(salida)
+        salida += b"%d 0 obj\n" % num + objetos[num] + b"\nendobj\n"
+    xref = len(salida)
+    salida += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objetos) + 1)
+    for num in sorted(objetos):
+        salida += b"%010d 00000 n \n" % offsets[num]
+    salida += (b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+               % (len(objetos) + 1, xref))
+    with open(ruta, "wb") as f:
+        f.write(salida)
+
+
+# ── Imagenes sin Pillow (escala de grises, 8 bits) ───────────────
+def _pixeles(ancho: int, alto: int, rnd: random.Random) -> list:
+    """Filas de bytes con "renglones" de tinta, para que no sea una hoja vacia."""
+    blanca = bytes([255]) * ancho
+    filas, y = [], 0
+    while y < alto:
+        if alto * 0.08 < y < alto * 0.92 and rnd.random() < 0.6:
+            largo = rnd.randint(ancho // 3, ancho * 8 // 10)
+            margen = ancho // 12
+            tinta = (bytes([255]) * margen + bytes([20]) * largo
+                     + bytes([255]) * (ancho - margen - largo))
+            filas.extend([tinta] * min(14, alto - y))
+            y += 14
+        filas.extend([blanca] * min(24, max(0, alto - y)))
+        y += 24
+    return filas[:alto]
+
+
+def escribir_png(ruta: str, ancho: int, alto: int, filas: list):
+    crudo = b"".join(b"\x00" + f for f in filas)
+
+    def trozo(tipo, datos):
+        return (struct.pack(">I", len(datos)) + tipo + datos
+                + struct.pack(">I", zlib.crc32(tipo + datos) & 0xFFFFFFFF))
+
+    with open(ruta, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(trozo(b"IHDR", struct.pack(">IIBBBBB", ancho, alto, 8, 0, 0, 0, 0)))
+        f.write(trozo(b"IDAT", zlib.compress(crudo, 6)))
+        f.write(trozo(b"IEND", b""))
+
+
+def escribir_bmp(ruta: str, ancho: int, alto: int, filas: list):
+    relleno = (4 - (ancho * 3) % 4) % 4
+    datos = b"".join(bytes(b for p in f for b in (p, p, p)) + b"\x00" * relleno
+                     for f in reversed(filas))
+    with open(ruta, "wb") as f:
+        f.write(b"BM" + struct.pack("<IHHI", 54 + len(datos), 0, 0, 54))
+        f.write(struct.pack("<IiiHHIIiiII", 40, ancho, alto, 1, 24, 0,
+                            len(datos), 2835, 2835, 0, 0))
+        f.write(datos)
+
+
+def escribir_tiff(ruta: str, ancho: int, alto: int, paginas: list):
+    """TIFF sin compresion, un IFD (una pagina) por cada lista de filas."""
+    salida = bytearray(b"II*\x00" + struct.pack("<I", 0))
+    ptr_anterior = 4
+    for filas in paginas:
+        offset_datos = len(salida)
+        salida += b"".join(filas)
+        if len(salida) % 2:
+            salida += b"\x00"
+        etiquetas = [
+            (256, 4, ancho), (257, 4, alto), (258, 3, 8), (259, 3, 1),
+            (262, 3, 1), (273, 4, offset_datos), (277, 3, 1),
+            (278, 4, alto), (279, 4, ancho * alto),
+        ]
+        offset_ifd = len(salida)
+        struct.pack_into("<I", salida, ptr_anterior, offset_ifd)
+        salida += struct.pack("<H", len(etiquetas))
+        for tag, tipo, valor in etiquetas:
+            fmt = "<HHIH2x" if tipo == 3 else "<HHII"
+            salida += struct.pack(fmt, tag, tipo, 1, valor)
+        ptr_anterior = len(salida)
+        salida += struct.pack("<I", 0)
+    with open(ruta, "wb") as f:
+        f.write(salida)
+
+
+# ── Imagenes con Pillow ──────────────────────────────────────────
+def _pagina_pil(ancho: int, alto: int, rnd: random.Random):
+    from PIL import Image, ImageDraw, ImageFont
+    img = Image.new("L", (ancho, alto), 255)
+    dib = ImageDraw.Draw(img)
+    tam = max(14, ancho // 50)
+    try:
+        fuente = ImageFont.truetype("DejaVuSans.ttf", tam)
+    except OSError:
+        fuente = ImageFont.load_default()
+    y = alto // 12
+    for linea in _lineas(rnd, (alto * 5 // 6) // (tam * 2)):
+        dib.text((ancho // 12, y), linea, fill=0, font=fuente)
+        y += tam * 2
+    return img
+
+
+def _hay_pil() -> bool:
+    try:
+        import PIL  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _escribir_imagen(ruta, ext, paginas, tam, rnd, pil):
+    ancho, alto = tam
+    if pil:
+        imgs = [_pagina_pil(ancho, alto, rnd) for _ in range(paginas)]
+        if ext == ".tiff":
+            imgs[0].save(ruta, save_all=True, append_images=imgs[1:])
+        else:
+            imgs[0].save(ruta)
+        return True
+    if ext in (".jpg", ".jpeg"):
+        return False
+    if ext == ".tiff":
+        escribir_tiff(ruta, ancho, alto,
+                      [_pixeles(ancho, alto, rnd) for _ in range(paginas)])
+    elif ext == ".png":
+        escribir_png(ruta, ancho, alto, _pixeles(ancho, alto, rnd))
+    else:
+        escribir_bmp(ruta, ancho, alto, _pixeles(ancho, alto, rnd))
+    return True
+
+
+# ── Corpus completo ──────────────────────────────────────────────
+def generar_corpus(carpeta: str, escala: float = 1.0, semilla: int = 1234) -> dict:
+    """
+    Genera (o reutiliza) el corpus en `carpeta` y devuelve su manifiesto:
+    {"semilla", "escala", "archivos": [{"ruta", "paginas", "bytes"}]}.
+    """
+    manifiesto_ruta = os.path.join(carpeta, "manifiesto.json")
+    pil = _hay_pil()
+    firma = {"semilla": semilla, "escala": escala, "pil": pil, "espec": repr(ESPEC)}
+    if os.path.exists(manifiesto_ruta):
+        with open(manifiesto_ruta, "r", encoding="utf-8") as f:
+            previo = json.load(f)
+        if previo.get("firma") == firma:
+            return previo
+
+    os.makedirs(carpeta, exist_ok=True)
+    rnd, archivos = random.Random(semilla), []
+    for ext, paginas, tam, cantidad in ESPEC:
+        for i in range(max(1, round(cantidad * escala))):
+            nombre = f"{ext[1:]}_{paginas:03d}p_{i:02d}{ext}"
+            ruta = os.path.join(carpeta, nombre)
+            if ext == ".pdf":
+                escribir_pdf(ruta, [_lineas(rnd, 40) for _ in range(paginas)])
+            elif not _escribir_imagen(ruta, ext, paginas, tam, rnd, pil):
+                continue
+            archivos.append({"ruta": nombre, "paginas": paginas,
+                             "bytes": os.path.getsize(ruta)})
+
+    manifiesto = {"firma": firma, "semilla": semilla, "escala": escala,
+                  "archivos": archivos}
+    with open(manifiesto_ruta, "w", encoding="utf-8") as f:
+        json.dump(manifiesto, f, indent=2)
+    return manifiesto
@@ -0,0 +1,216 @@
+# cli.py
+# Punto de entrada sin GUI — Local OCR
+# Procesa archivos o carpetas con el mismo motor y pool que la GUI, sin
+# importar PyQt6 (servidores, cron, scripts).
+#
+# Ejecutar:
+#   python cli.py escaneos/ contrato.pdf -o salida/ -w 8
+#   python cli.py --vigilar bandeja/ -o salida/      # desatendido
+#   python cli.py --help
+
+import os
+import sys
+import time
+import argparse
+import multiprocessing
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BASE)
+
+from core.utils import load_config
+from core.ingesta import Busqueda
+from core.vigilancia import Vigilante
+from core.executor import BatchExecutor, num_workers
+
+
+def expandir_rutas(entradas, recursivo: bool = True) -> list:
+    """Archivos validos de la lista, entrando en las carpetas. Sin duplicados."""
+    busqueda = Busqueda(entradas, recursivo=recursivo)
+    rutas = list(busqueda)
+    for entrada in busqueda.faltantes:
+        print(f"Aviso: no existe {entrada}", file=sys.stderr)
+    if busqueda.descartados:
+        print(f"Aviso: {busqueda.descartados} archivo(s) descartado(s): "
+              "el contenido no coincide con la extension", file=sys.stderr)
+    return rutas
+
+
+def _avisar(ruta: str, registro: dict):
+    """Salidas que no se pudieron escribir (el archivo igual cuenta como OK)."""
+    for aviso in registro.get("avisos", ()):
+        print(f"Aviso: {aviso}  {ruta}", file=sys.stderr)
+
+
+def _mb(n: float) -> str:
+    return f"{n / (1024 * 1024):.0f} MB"
+
+
+def _memoria(executor) -> str:
+    """Uso de memoria de paginas para las lineas de avance."""
+    uso = executor.uso_memoria()
+    return f"mem {_mb(uso[0]):>7}" if uso else ""
+
+
+def _pico_memoria(executor) -> str:
+    uso = executor.uso_memoria()
+    if not uso:
+        return ""
+    limite = f"de {_mb(uso[2])}" if uso[2] else "sin limite"
+    return f"Memoria de paginas: pico {_mb(uso[1])} ({limite})"
+
+
+def _argumentos(argv):
+    ap = argparse.ArgumentParser(
+        prog="cli.py",
+        description="Local OCR sin interfaz grafica. Usa la configuracion "
+                    "guardada (~/.localocr_config.json); las opciones la "
+                    "sobrescriben solo para esta ejecucion.")
+    ap.add_argument("entradas", nargs="*", help="archivos o carpetas")
+    ap.add_argument("--vigilar", metavar="CARPETA",
+                    help="procesar cada archivo nuevo que llegue a la carpeta "
+                         "y moverlo a procesados/ (o errores/) hasta Ctrl-C")
+    ap.add_argument("-o", "--output-dir", help="carpeta de salida")
+    ap.add_argument("-w", "--workers", help="procesos en paralelo (auto = uno por nucleo)")
+    ap.add_argument("-m", "--motor", help="tesseract, easyocr o sintetico")
+    ap.add_argument("--lang", help="idioma OCR, p. ej. spa+eng")
+    ap.add_argument("--dpi", help="DPI para rasterizar PDF, o auto (elegido por pagina)")
+    ap.add_argument("--modo-salida", choices=["ambos", "pdf", "texto"])
+    ap.add_argument("--orden", choices=["largos", "cortos", "lista"],
+                    help="orden del lote: largos primero (termina antes), cortos "
+                         "primero (resultados antes) o el de la lista")
+    ap.add_argument("--memoria-max", metavar="MB",
+                    help="tope de memoria para paginas rasterizadas, todos los "
+                         "procesos juntos (0 = sin limite)")
+    ap.add_argument("--sin-cache", action="store_true", help="no usar la cache de resultados")
+    ap.add_argument("--preproceso",
+                    help="pasos antes del OCR: gris,recortar,enderezar,umbral (\"\" = ninguno)")
+    ap.add_argument("--forzar-ocr", action="store_true",
+                    help="hacer OCR tambien en paginas de PDF que ya traen texto")
+    ap.add_argument("--no-recursivo", action="store_true", help="no entrar en subcarpetas")
+    ap.add_argument("-q", "--quiet", action="store_true", help="solo el resumen final")
+    args = ap.parse_args(argv)
+    if not args.entradas and not args.vigilar:
+        ap.error("indique archivos o carpetas, o --vigilar CARPETA")
+    return args
+
+
+def main(argv=None) -> int:
+    args = _argumentos(argv)
+    cfg  = load_config()
+    for clave, valor in (("output_dir", args.output_dir), ("workers", args.workers),
+                         ("motor", args.motor), ("lang", args.lang),
+                         ("dpi", args.dpi), ("modo_salida", args.modo_salida),
+                         ("preproceso", args.preproceso),
+                         ("orden_lote", args.orden),
+                         ("memoria_max_mb", args.memoria_max)):
+        if valor is not None:
+            cfg[clave] = valor
+    if args.sin_cache:
+        cfg["cache_activa"] = False
+    if args.forzar_ocr:
+        cfg["usar_capa_texto"] = False
+
+    if args.vigilar:
+        return vigilar(args.vigilar, cfg, args.quiet)
+
+    rutas = expandir_rutas(args.entradas, recursivo=not args.no_recursivo)
+    if not rutas:
+        print("No hay archivos validos para procesar.", file=sys.stderr)
+        return 2
+
+    total   = len(rutas)
+    errores = {}
+    etapas  = {}
+    paginas = 0
+    hechos  = 0
+    t0      = time.time()
+    if not args.quiet:
+        print(f"{total} archivo(s), {num_workers(cfg)} proceso(s), "
+              f"motor {cfg.get('motor')}, salida {cfg.get('output_dir')}")
+
+    executor = BatchExecutor(cfg)
+
+    def on_evento(tipo, ruta, valor):
+        nonlocal hechos, paginas
+        if tipo == "error":
+            errores[ruta] = valor
+        elif tipo == "registro":
+            paginas += valor["n_paginas"]
+            for etapa, seg in valor["etapas"].items():
+                etapas[etapa] = etapas.get(etapa, 0.0) + seg
+            _avisar(ruta, valor)
+        elif tipo == "terminado":
+            hechos += 1
+            if not args.quiet:
+                estado = "ERROR" if ruta in errores else "OK   "
+                print(f"[{hechos:>{len(str(total))}}/{total}] {estado} "
+                      f"{valor:6.1f}s  {_memoria(executor)}  {ruta}")
+                if ruta in errores:
+                    print(f"      {errores[ruta]}")
+
+    try:
+        executor.ejecutar(rutas, on_evento)
+    except KeyboardInterrupt:
+        executor.detener()
+        print("\nDetenido.", file=sys.stderr)
+        return 130
+
+    elapsed = max(time.time() - t0, 1e-9)
+    mb = sum(os.path.getsize(r) for r in rutas) / (1024 * 1024)
+    print(f"Listo: {hechos - len(errores)} OK, {len(errores)} error(es) "
+          f"en {elapsed:.1f}s  ·  {hechos / elapsed:.2f} archivos/s  "
+          f"·  {paginas / elapsed:.2f} paginas/s  ·  {mb / elapsed:.2f} MB/s")
+    print(_pico_memoria(executor))
+    if etapas and not args.quiet:
+        print("Tiempo por etapa (suma de todos los procesos): " + ",  ".join(
+            f"{e} {s:.1f}s" for e, s in sorted(etapas.items(), key=lambda x: -x[1])))
+    return 1 if errores else 0
+
+
+def vigilar(carpeta: str, cfg: dict, quiet: bool = False) -> int:
+    """Modo desatendido: un lote abierto alimentado por la carpeta."""
+    if not os.path.isdir(carpeta):
+        print(f"No existe la carpeta {carpeta}", file=sys.stderr)
+        return 2
+    vigilante = Vigilante(
+        carpeta, cfg,
+        avisar=lambda msg: print(f"Aviso: {msg}", file=sys.stderr))
+    executor  = BatchExecutor(cfg)
+    errores   = {}
+    cuenta    = {"ok": 0, "error": 0}
+
+    def on_evento(tipo, ruta, valor):
+        if tipo == "error":
+            errores[ruta] = valor
+        elif tipo == "registro":
+            _avisar(ruta, valor)
+        elif tipo == "terminado":
+            error = errores.pop(ruta, None)
+            vigilante.retirar(ruta, ok=error is None)
+            cuenta["ok" if error is None else "error"] += 1
+            if not quiet:
+                estado = "ERROR" if error else "OK   "
+                print(f"{time.strftime('%H:%M:%S')} {estado} {valor:6.1f}s  "
+                      f"{_memoria(executor)}  {ruta}")
+                if error:
+                    print(f"      {error}")
+
+    vigilante.iniciar()
+    print(f"Vigilando {vigilante.carpeta} ({vigilante.modo}), "
+          f"{num_workers(cfg)} proceso(s), salida {cfg.get('output_dir')}. "
+          "Ctrl-C para salir.")
+    try:
+        executor.ejecutar([], on_evento, entrada=vigilante.cola)
+    except KeyboardInterrupt:
+        executor.detener()
+        print("\nDetenido.", file=sys.stderr)
+    finally:
+        vigilante.detener()
+    print(f"{cuenta['ok']} OK, {cuenta['error']} error(es).")
+    print(_pico_memoria(executor))
+    return 130
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
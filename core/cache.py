@@ -0,0 +1,148 @@
+# core/cache.py
+# Cache persistente de resultados OCR — sin PyQt6
+# La clave es el hash del contenido del archivo mas los ajustes que
+# cambian el texto (motor y su version, idioma, DPI, capa de texto,
+# paginas en blanco y duplicadas): el mismo escaneo en otra carpeta o
+# con otro nombre reutiliza el resultado.
+# Se guarda en SQLite (modo WAL) para que varios procesos del pool
+# puedan leer y escribir a la vez; se expulsa por LRU al pasar el tope.
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+from core.motores import version_motor
+from core.resolucion import firma_dpi
+from core.preproceso import pasos
+from core.pipeline import capa_min
+from core import huellas as hu
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".localocr_cache")
+
+_abiertas = {}   # (carpeta, max_bytes) -> CacheOCR de este proceso
+
+
+def hash_archivo(ruta: str) -> str:
+    """SHA-256 del contenido, leido en bloques de 1 MB."""
+    h = hashlib.sha256()
+    with open(ruta, "rb") as f:
+        for bloque in iter(lambda: f.read(1 << 20), b""):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+def clave_cache(ruta: str, cfg: dict) -> str:
+    """Clave del resultado: contenido + ajustes que afectan la salida."""
+    ajustes = [
+        cfg.get("motor", "tesseract"),
+        version_motor(cfg),
+        cfg.get("lang", "spa+eng"),
+        firma_dpi(cfg),
+        f"capa{capa_min(cfg)}" if cfg.get("usar_capa_texto", True) else "ocr",
+        "+".join(pasos(cfg)),
+        # Paginas omitidas o con texto reutilizado cambian la salida
+        f"blanco{hu.max_tinta(cfg)}",
+        (f"dup{hu.max_diferencia(cfg)}"
+         if cfg.get("detectar_duplicadas", False) else "sin-dup"),
+    ]
+    datos = hash_archivo(ruta) + json.dumps(ajustes)
+    return hashlib.sha256(datos.encode("utf-8")).hexdigest()
+
+
+def abrir_cache(cfg: dict):
+    """CacheOCR segun cfg, o None si la cache esta desactivada."""
+    if not cfg.get("cache_activa", True):
+        return None
+    try:
+        max_bytes = int(float(cfg.get("cache_max_mb", 512)) * 1024 * 1024)
+    except (TypeError, ValueError):
+        max_bytes = 512 * 1024 * 1024
+    clave = (cfg.get("cache_dir") or CACHE_DIR, max_bytes)
+    if clave not in _abiertas:
+        _abiertas[clave] = CacheOCR(*clave)
+    return _abiertas[clave]
+
+
+class CacheOCR:
+    """
+    Texto OCR por clave, con tope de tamano y expulsion LRU.
+    Cada proceso, y dentro de el cada hilo, abre su propia conexion
+    (sqlite3 no se comparte): la GUI corre cada lote en un QThread nuevo.
+    """
+
+    def __init__(self, carpeta: str = CACHE_DIR, max_bytes: int = 512 << 20):
+        self.carpeta   = carpeta
+        self.max_bytes = max_bytes
+        self._local    = threading.local()
+
+    def _conexion(self) -> sqlite3.Connection:
+        con = getattr(self._local, "con", None)
+        if con is None:
+            os.makedirs(self.carpeta, exist_ok=True)
+            con = sqlite3.connect(
+                os.path.join(self.carpeta, "ocr_cache.sqlite"), timeout=30)
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute(
+                "CREATE TABLE IF NOT EXISTS entradas ("
+                " clave TEXT PRIMARY KEY, texto TEXT NOT NULL,"
+                " bytes INTEGER NOT NULL, usado REAL NOT NULL)")
+            con.execute(
+                "CREATE INDEX IF NOT EXISTS idx_usado ON entradas(usado)")
+            con.commit()
+            self._local.con = con
+        return con
+
+    def obtener(self, clave: str):
+        """Texto guardado para la clave, o None. Marca la entrada como usada."""
+        try:
+            con = self._conexion()
+            fila = con.execute(
+                "SELECT texto FROM entradas WHERE clave = ?", (clave,)).fetchone()
+            if fila is None:
+                return None
+            with con:
+                con.execute("UPDATE entradas SET usado = ? WHERE clave = ?",
+                            (time.time(), clave))
+            return fila[0]
+        except sqlite3.Error:
+            # Una cache danada o bloqueada nunca debe tumbar el OCR
+            return None
+
+    def guardar(self, clave: str, texto: str):
+        tam = len(texto.encode("utf-8"))
+        if tam > self.max_bytes:
+            return
+        try:
+            con = self._conexion()
+            with con:
+                con.execute(
+                    "INSERT OR REPLACE INTO entradas VALUES (?, ?, ?, ?)",
+                    (clave, texto, tam, time.time()))
+                self._expulsar(con)
+        except sqlite3.Error:
+            pass
+
+    def _expulsar(self, con):
+        total = con.execute(
+            "SELECT COALESCE(SUM(bytes), 0) FROM entradas").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        sobra, viejas = total - self.max_bytes, []
+        for clave, tam in con.execute(
+                "SELECT clave, bytes FROM entradas ORDER BY usado"):
+            if sobra <= 0:
+                break
+            viejas.append((clave,))
+            sobra -= tam
+        con.executemany("DELETE FROM entradas WHERE clave = ?", viejas)
+
+    def limpiar(self):
+        try:
+            con = self._conexion()
+            with con:
+                con.execute("DELETE FROM entradas")
+        except sqlite3.Error:
+            pass
@@ -0,0 +1,128 @@
+# core/diario.py
+# Diario de lotes a prueba de cortes — sin PyQt6
+# Cada lote escribe un archivo JSONL de solo agregado en DIARIO_DIR:
+#   {"tipo": "lote", "fecha", "rutas": n}                 — cabecera
+#   {"ruta", "estado": "en_cola"|"en_curso"|"ok"|"error",
+#    "salida": [...], "duracion": s, "error": msg}        — una por cambio
+#   {"tipo": "fin"}                                       — lote cerrado
+# Un lote sin "fin" quedo a medias (la app se cerro o se colgo): al volver
+# a abrir se puede reanudar saltando los archivos ya hechos. El estado de
+# un archivo es su ultima linea; una linea cortada por el corte se ignora.
+#
+# Escribir es una linea por cambio de estado (write + flush, sin fsync
+# por linea); fsync se hace como mucho una vez por segundo.
+
+import os
+import json
+import time
+import threading
+
+DIARIO_DIR = os.path.join(os.path.expanduser("~"), ".localocr_lotes")
+
+HECHO = "ok"
+
+
+class DiarioLote:
+    """Diario de un lote. Se puede escribir desde cualquier hilo."""
+
+    def __init__(self, ruta: str):
+        self.ruta      = ruta
+        self._f        = open(ruta, "a", encoding="utf-8")
+        self._lock     = threading.Lock()
+        self._ult_sync = 0.0
+
+    @classmethod
+    def nuevo(cls, rutas, carpeta: str = DIARIO_DIR) -> "DiarioLote":
+        os.makedirs(carpeta, exist_ok=True)
+        nombre = time.strftime("lote_%Y%m%d_%H%M%S") + f"_{os.getpid()}.jsonl"
+        diario = cls(os.path.join(carpeta, nombre))
+        rutas = list(rutas)
+        lineas = [{"tipo": "lote", "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                   "rutas": len(rutas)}]
+        lineas += [{"ruta": r, "estado": "en_cola"} for r in rutas]
+        diario._escribir(lineas)
+        return diario
+
+    def marcar(self, ruta: str, estado: str, **extra):
+        self._escribir([{"ruta": ruta, "estado": estado, **extra}])
+
+    def _escribir(self, registros: list):
+        with self._lock:
+            if self._f is None:
+                return
+            try:
+                self._f.write("".join(
+                    json.dumps(r, ensure_ascii=False) + "\n" for r in registros))
+                self._f.flush()
+                ahora = time.monotonic()
+                if ahora - self._ult_sync >= 1.0:
+                    os.fsync(self._f.fileno())
+                    self._ult_sync = ahora
+            except OSError:
+                pass
+
+    def cerrar(self, borrar: bool = True):
+        """Marca el lote como terminado; por defecto borra el diario."""
+        self._escribir([{"tipo": "fin"}])
+        with self._lock:
+            if self._f is None:
+                return
+            self._f.close()
+            self._f = None
+        if borrar:
+            try:
+                os.remove(self.ruta)
+            except OSError:
+                pass
+
+
+def leer_diario(ruta: str) -> tuple:
+    """
+    (estados, cerrado): estados es {ruta: ultimo registro}, en el orden
+    en que se encolaron; cerrado indica si el lote llego a "fin".
+    """
+    estados, cerrado = {}, False
+    try:
+        with open(ruta, "r", encoding="utf-8") as f:
+            for linea in f:
+                try:
+                    r = json.loads(linea)
+                except ValueError:
+                    continue
+                if r.get("tipo") == "fin":
+                    cerrado = True
+                elif "ruta" in r:
+                    estados[r["ruta"]] = r
+    except OSError:
+        pass
+    return estados, cerrado
+
+
+def lote_interrumpido(carpeta: str = DIARIO_DIR):
+    """
+    (ruta_diario, estados) del lote interrumpido mas reciente, o None.
+    Los diarios cerrados que hayan quedado se borran al pasar.
+    """
+    try:
+        nombres = sorted(n for n in os.listdir(carpeta)
+                         if n.startswith("lote_") and n.endswith(".jsonl"))
+    except OSError:
+        return None
+    for nombre in reversed(nombres):
+        ruta = os.path.join(carpeta, nombre)
+        estados, cerrado = leer_diario(ruta)
+        if cerrado or not estados:
+            try:
+                os.remove(ruta)
+            except OSError:
+                pass
+            continue
+        return ruta, estados
+    return None
+
+
+def descartar(ruta: str):
+    try:
+        os.remove(ruta)
+    except OSError:
+        pass
@@ -0,0 +1,152 @@
+# core/eta.py
+# Tiempo restante de un lote por trabajo, no por archivos — sin PyQt6
+# Un lote con un PDF de 800 paginas y 50 tickets no avanza al ritmo de
+# los archivos terminados. La unidad de trabajo es la pagina, pesada
+# por su area en pixeles (una pagina a 400 DPI cuesta ~1.8 veces una a
+# 300): el restante es lo que falta en pixeles sobre el ritmo reciente
+# en pixeles por segundo.
+#
+# Las paginas de un archivo se conocen cuando el ejecutor lo parte en
+# rangos (evento "paginas") o al terminar; antes se estiman por su
+# tamano en bytes, con los bytes por pagina aprendidos de los archivos
+# ya terminados del mismo tipo. Las imagenes sueltas son una pagina.
+# Los resultados de la cache no cuentan: no cuestan nada.
+
+import os
+import time
+from collections import deque
+
+MULTIPAGINA      = {".pdf", ".tif", ".tiff"}
+BYTES_POR_PAGINA = 80_000    # supuesto inicial para PDF y TIFF
+VENTANA_S        = 30.0      # el ritmo se mide sobre los ultimos segundos
+MUESTRAS_MIN_S   = 3.0       # con menos historia se usa el promedio total
+
+
+def _tipo(ruta: str) -> str:
+    ext = os.path.splitext(ruta)[1].lower()
+    return ".tiff" if ext == ".tif" else ext
+
+
+class EstimadorLote:
+    """
+    Lleva la cuenta del trabajo hecho y pendiente de un lote.
+    Se usa desde un solo hilo (la UI): avance(), paginas(), terminado()
+    al llegar los eventos y muestra() una vez por segundo.
+    """
+
+    def __init__(self, rutas, t0: float = None):
+        self._t0       = time.monotonic() if t0 is None else t0
+        self._bytes    = {}
+        self._conocidas = {}   # ruta -> paginas (abiertos con conteo exacto)
+        self._avance   = {}    # ruta -> 0-1, archivos en curso
+        self._sin_contar = {}  # tipo -> bytes de abiertos sin conteo
+        self._paginas_fijas = 0
+        # Terminados
+        self._paginas_hechas = 0
+        self._pixeles_hechos = 0
+        self._aprendido = {}   # tipo -> [bytes, paginas]
+        self._muestras  = deque()   # (t, paginas hechas, pixeles hechos)
+        for ruta in rutas:
+            try:
+                tam = os.path.getsize(ruta)
+            except OSError:
+                tam = 0
+            self._bytes[ruta] = tam
+            if _tipo(ruta) in MULTIPAGINA:
+                tipo = _tipo(ruta)
+                self._sin_contar[tipo] = self._sin_contar.get(tipo, 0) + tam
+            else:
+                self._conocidas[ruta] = 1
+                self._paginas_fijas += 1
+
+    # ── Eventos ──────────────────────────────────────────────────
+    def avance(self, ruta: str, pct: int):
+        if ruta in self._bytes:
+            self._avance[ruta] = max(0, min(100, pct)) / 100
+
+    def paginas(self, ruta: str, n: int):
+        """Conteo exacto de un archivo abierto (lo parte el ejecutor)."""
+        if ruta not in self._bytes or ruta in self._conocidas:
+            return
+        tipo = _tipo(ruta)
+        self._sin_contar[tipo] -= self._bytes[ruta]
+        self._conocidas[ruta] = n
+        self._paginas_fijas += n
+
+    def terminado(self, ruta: str, registro: dict = None):
+        """Cierra el archivo; registro es el del evento "registro"."""
+        tam = self._bytes.pop(ruta, None)
+        if tam is None:
+            return
+        self._avance.pop(ruta, None)
+        if ruta in self._conocidas:
+            self._paginas_fijas -= self._conocidas.pop(ruta)
+        else:
+            self._sin_contar[_tipo(ruta)] -= tam
+        if not registro or registro.get("estado") == "cache":
+            return
+        paginas = registro.get("paginas", [])
+        self._paginas_hechas += len(paginas)
+        self._pixeles_hechos += sum(p.get("pixeles", 0) for p in paginas)
+        if registro.get("estado") == "ok" and registro.get("n_paginas"):
+            aprendido = self._aprendido.setdefault(_tipo(ruta), [0, 0])
+            aprendido[0] += tam
+            aprendido[1] += registro["n_paginas"]
+
+    # ── Estimacion ───────────────────────────────────────────────
+    def _bytes_por_pagina(self, tipo: str) -> float:
+        b, p = self._aprendido.get(tipo, (0, 0))
+        return b / p if p and b else BYTES_POR_PAGINA
+
+    def _paginas_de(self, ruta: str) -> float:
+        if ruta in self._conocidas:
+            return self._conocidas[ruta]
+        return max(1.0, self._bytes[ruta] / self._bytes_por_pagina(_tipo(ruta)))
+
+    def _pixeles_por_pagina(self) -> float:
+        """Area media de las paginas terminadas (1 = contar paginas)."""
+        if self._paginas_hechas and self._pixeles_hechos:
+            return self._pixeles_hechos / self._paginas_hechas
+        return 1.0
+
+    def _en_curso(self) -> float:
+        """Paginas hechas de los archivos que aun no terminan."""
+        return sum(f * self._paginas_de(r) for r, f in self._avance.items())
+
+    def paginas_pendientes(self) -> float:
+        total = self._paginas_fijas + sum(
+            b / self._bytes_por_pagina(t) for t, b in self._sin_contar.items())
+        return max(0.0, total - self._en_curso())
+
+    def muestra(self, t: float = None):
+        """Anota el trabajo hecho hasta ahora (llamar a ritmo fijo)."""
+        t = time.monotonic() if t is None else t
+        parcial = self._en_curso()
+        self._muestras.append((t, self._paginas_hechas + parcial,
+                               self._pixeles_hechos + parcial * self._pixeles_por_pagina()))
+        while len(self._muestras) > 2 and t - self._muestras[1][0] >= VENTANA_S:
+            self._muestras.popleft()
+
+    def _ritmos(self):
+        """(paginas/s, pixeles/s) de la ventana reciente, o None."""
+        if not self._muestras:
+            return None
+        t, pags, px = self._muestras[-1]
+        t_ant, pags_ant, px_ant = self._muestras[0]
+        if t - t_ant < MUESTRAS_MIN_S:
+            t_ant, pags_ant, px_ant = self._t0, 0.0, 0.0
+        dt = t - t_ant
+        if dt <= 0 or pags <= pags_ant:
+            return None
+        return (pags - pags_ant) / dt, (px - px_ant) / dt
+
+    def paginas_por_s(self):
+        ritmos = self._ritmos()
+        return ritmos[0] if ritmos else None
+
+    def restante(self):
+        """Segundos que faltan, o None mientras no haya ritmo."""
+        ritmos = self._ritmos()
+        if not ritmos or ritmos[1] <= 0:
+            return None
+        return self.paginas_pendientes() * self._pixeles_por_pagina() / ritmos[1]
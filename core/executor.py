@@ -0,0 +1,561 @@
+# core/executor.py
+# Ejecutor de lotes multiproceso — sin PyQt6
+# Reparte los archivos de un lote entre N procesos y devuelve al hilo
+# que llama a ejecutar() los eventos de cada archivo:
+#   progreso / resultado / error / terminado
+#
+# El lote se envia en el orden de cfg["orden_lote"] (core/planificador.py:
+# los mas costosos primero, por defecto). Los documentos con muchas
+# paginas se parten en rangos que compiten por el mismo pool que el
+# resto del lote; el texto se reensambla en orden de pagina antes de
+# emitir "resultado". Cada texto terminado se guarda en output_dir
+# (core/salida.py).
+#
+# Se usa "spawn" en todas las plataformas: es lo que hace Windows de
+# todos modos y evita hacer fork de un proceso con hilos de Qt vivos.
+#
+# La memoria de las paginas rasterizadas tiene un tope para todo el
+# pool (cfg["memoria_max_mb"], core/memoria.py): un proceso que no
+# tiene lugar espera antes de rasterizar. uso_memoria() da el uso y el
+# pico del lote desde cualquier hilo.
+#
+# Detener: cada proceso revisa la bandera antes de cada pagina. Si al
+# cabo de plazo_detener_s siguen tareas en vuelo (una pagina enorme,
+# tesseract o pdftoppm colgados) se matan los procesos del pool junto
+# con sus hijos, asi la CPU queda libre en un tiempo acotado.
+#
+# Si un proceso del pool muere (el OOM killer, un motor que revienta)
+# ProcessPoolExecutor da el pool entero por roto: fallan solo los
+# documentos que estaban en vuelo, se arma un pool nuevo y el lote sigue.
+
+import os
+import json
+import time
+import queue
+import signal
+import tempfile
+import threading
+import subprocess
+import multiprocessing as mp
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+
+from core.pipeline import procesar_archivo, contar_paginas, sumar_etapa, ProcesoDetenido
+from core.motores import precargar
+from core.cache import abrir_cache, clave_cache
+from core.salida import guardar_resultado
+from core.huellas import HuellasLote, max_diferencia
+from core.planificador import ordenar
+from core import memoria
+from core.utils import TIEMPOS_MAX, abrir_log_tiempos
+
+
+def num_workers(cfg: dict) -> int:
+    """Procesos a usar segun cfg["workers"] ("auto" = un proceso por nucleo)."""
+    try:
+        n = int(cfg.get("workers", "auto"))
+    except (TypeError, ValueError):
+        n = 0
+    return n if n > 0 else (os.cpu_count() or 1)
+
+
+def paginas_por_bloque(cfg: dict) -> int:
+    """Tamano de los rangos en que se parte un documento grande."""
+    try:
+        return max(1, int(cfg.get("paginas_por_bloque", 10)))
+    except (TypeError, ValueError):
+        return 10
+
+
+def partir_rangos(n_paginas: int, bloque: int) -> list:
+    """[(1, bloque), (bloque+1, 2*bloque), ...] cubriendo n_paginas."""
+    return [(i, min(i + bloque - 1, n_paginas))
+            for i in range(1, n_paginas + 1, bloque)]
+
+
+def plazo_detener(cfg: dict) -> float:
+    """Segundos que se espera a las tareas en vuelo antes de matarlas."""
+    try:
+        return max(0.0, float(cfg.get("plazo_detener_s", 3)))
+    except (TypeError, ValueError):
+        return 3.0
+
+
+def _matar_arbol(pid: int):
+    """Mata un proceso del pool y los ejecutables que haya lanzado."""
+    try:
+        if os.name == "nt":
+            subprocess.run(["taskkill", "/F", "/T", "/PID", str(pid)],
+                           capture_output=True, timeout=10)
+            return
+        try:
+            # Cada proceso del pool encabeza su propio grupo (_init_proceso)
+            os.killpg(pid, signal.SIGKILL)
+        except OSError:
+            os.kill(pid, signal.SIGKILL)
+    except (OSError, subprocess.SubprocessError):
+        pass
+
+
+# ── Lado del proceso hijo ────────────────────────────────────────
+# Cada proceso del pool recibe la cola de eventos y la bandera de
+# cancelacion una sola vez, al arrancar (no se pueden pasar por submit),
+# y deja el motor OCR cargado para todas las tareas que le toquen.
+# _huellas es la base de paginas ya reconocidas del lote (core/huellas.py).
+_eventos  = None
+_cancelar = None
+_huellas  = None
+
+
+def _vigilar_padre():
+    """
+    Si el proceso principal muere (cierre forzado, cuelgue) el pool no se
+    entera: los hermanos mantienen abierta la cola de tareas. Este hilo
+    espera al padre y se lleva consigo al proceso y a sus ejecutables.
+    """
+    from multiprocessing.connection import wait as esperar
+    padre = mp.parent_process()
+    if padre is None:
+        return
+    esperar([padre.sentinel])
+    if hasattr(os, "killpg") and os.getpgid(0) == os.getpid():
+        os.killpg(0, signal.SIGKILL)
+    os._exit(1)
+
+
+def _init_proceso(eventos, cancelar, cfg, ruta_huellas=None, presupuesto=None):
+    global _eventos, _cancelar, _huellas
+    _eventos, _cancelar = eventos, cancelar
+    memoria.instalar(presupuesto, cancelar.is_set)
+    if ruta_huellas:
+        _huellas = HuellasLote(ruta_huellas, max_diferencia(cfg))
+    # Grupo de procesos propio: tesseract/pdftoppm lo heredan y se
+    # pueden matar todos juntos. Tambien deja a los hijos fuera del
+    # Ctrl-C de la terminal, que atiende el proceso principal.
+    if hasattr(os, "setsid"):
+        try:
+            os.setsid()
+        except OSError:
+            pass
+    threading.Thread(target=_vigilar_padre, daemon=True).start()
+    precargar(cfg)
+
+
+def _tarea(ruta: str, cfg: dict, rango=None, dividir=False):
+    """
+    Procesa un archivo completo (rango=None) o un rango de paginas.
+    Devuelve (tipo, valor, clave_cache, registro):
+        ("cache", texto, ...)       — resultado ya guardado, sin OCR
+        ("dividir", n_paginas, ...) — supera paginas_por_bloque y
+                                      dividir=True: el proceso principal
+                                      reparte los rangos
+        ("texto", texto, ...)       — OCR hecho
+    La clave solo se calcula para el archivo entero (rango=None).
+    registro lleva los tiempos por etapa y por pagina (ver pipeline).
+    """
+    if _cancelar.is_set():
+        raise ProcesoDetenido("Proceso detenido por el usuario.")
+    clave, registro = None, {}
+    if rango is None:
+        cache = abrir_cache(cfg)
+        if cache:
+            t = time.perf_counter()
+            clave = clave_cache(ruta, cfg)
+            texto = cache.obtener(clave)
+            sumar_etapa(registro, "cache", time.perf_counter() - t)
+            if texto is not None:
+                return "cache", texto, clave, registro
+
+    if rango is None and dividir:
+        t = time.perf_counter()
+        n = contar_paginas(ruta, cfg)
+        sumar_etapa(registro, "apertura", time.perf_counter() - t)
+        if n > paginas_por_bloque(cfg):
+            return "dividir", n, clave, registro
+
+    parte = rango[0] if rango else 0
+    _eventos.put(("progreso", ruta, parte, 0))
+    texto = procesar_archivo(
+        ruta, cfg,
+        progreso=lambda p: _eventos.put(("progreso", ruta, parte, p)),
+        detener=_cancelar.is_set,
+        paginas=rango,
+        registro=registro,
+        huellas=_huellas)
+    return "texto", texto, clave, registro
+
+
+# ── Lado del proceso principal ───────────────────────────────────
+class _Documento:
+    """Estado de un archivo del lote: entero o repartido en rangos."""
+
+    def __init__(self, ruta: str):
+        self.ruta    = ruta
+        self.t0      = time.time()
+        self.rangos  = {}      # primera pagina -> ultima pagina
+        self.partes  = {}      # primera pagina -> texto
+        self.avance  = {}      # primera pagina (0 = entero) -> %
+        self.clave   = None    # clave de cache del archivo entero
+        self.etapas  = {}      # etapa -> segundos, sumando todos los rangos
+        self.paginas = []      # tiempos por pagina, de todos los rangos
+        self.avisos  = []      # salidas que no se pudieron escribir
+        self.cerrado = False
+
+    def porcentaje(self) -> int:
+        if not self.rangos:
+            return self.avance.get(0, 0)
+        total = sum(u - p + 1 for p, u in self.rangos.items())
+        hecho = sum(self.avance.get(p, 0) * (u - p + 1)
+                    for p, u in self.rangos.items())
+        return int(hecho / total)
+
+    def texto(self) -> str:
+        return "\n\n".join(self.partes[p] for p in sorted(self.partes))
+
+    def sumar(self, registro: dict):
+        for etapa, seg in registro.get("etapas", {}).items():
+            self.etapas[etapa] = self.etapas.get(etapa, 0.0) + seg
+        self.paginas.extend(registro.get("paginas", []))
+
+    def registro(self, estado: str, total: float, cfg: dict) -> dict:
+        """Registro estructurado del archivo (evento "registro" y log)."""
+        paginas = sorted(self.paginas, key=lambda p: p["pagina"])
+        confs   = [p["confianza"] for p in paginas if p["confianza"] is not None]
+        return {
+            "fecha":     time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "ruta":      self.ruta,
+            "estado":    estado,
+            "motor":     cfg.get("motor", "tesseract"),
+            "dpi":       cfg.get("dpi", "300"),
+            "total":     round(total, 4),
+            "n_paginas": len(paginas),
+            "confianza": round(sum(confs) / len(confs), 3) if confs else None,
+            "etapas":    {k: round(v, 4) for k, v in self.etapas.items()},
+            "paginas":   paginas,
+            "avisos":    list(self.avisos),
+        }
+
+
+class BatchExecutor:
+    """
+    Ejecuta un lote de archivos en un pool de procesos.
+
+    ejecutar() bloquea hasta terminar el lote y llama a
+    on_evento(tipo, ruta, valor) desde el hilo que lo invoco:
+        "progreso"  (int)   — porcentaje 0-100 del archivo
+        "paginas"   (int)   — paginas del archivo, en cuanto se conocen
+                              (al partirlo en rangos)
+        "resultado" (str)   — texto extraido
+        "error"     (str)   — mensaje de error
+        "registro"  (dict)  — tiempos por etapa y por pagina, y avisos
+                              de salidas omitidas (antes de "terminado");
+                              tambien va a TIEMPOS_PATH (rotado)
+        "terminado" (float) — segundos que tomo el archivo
+
+    Con diario (core/diario.py) cada archivo queda registrado al empezar
+    y al terminar, con sus salidas y duracion.
+
+    Con entrada (queue.Queue) el lote queda abierto: las rutas que
+    lleguen por ahi se suman a la cola con el pool ya caliente, hasta
+    leer None o hasta detener() (modo vigilancia, core/vigilancia.py).
+    """
+
+    def __init__(self, cfg: dict, workers: int = None, diario=None):
+        self.cfg      = dict(cfg)
+        self.diario   = diario
+        self.workers  = workers or num_workers(cfg)
+        self._ctx     = mp.get_context("spawn")
+        self._cancelar = self._ctx.Event()
+        self._cache   = abrir_cache(self.cfg)
+        self._log     = None
+        self._t_detener = None
+        self._memoria = None
+
+    def detener(self):
+        """Pide detener el lote; se puede llamar desde cualquier hilo."""
+        if self._t_detener is None:
+            self._t_detener = time.monotonic()
+        self._cancelar.set()
+
+    def uso_memoria(self):
+        """(bytes en uso, pico, limite) de las paginas del lote, o None."""
+        if self._memoria is None:
+            return None
+        return (*self._memoria.uso(), self._memoria.limite)
+
+    def ejecutar(self, rutas, on_evento, entrada=None):
+        # Cola de tareas: (ruta, rango); rango=None es el archivo entero.
+        # Con menos archivos que procesos el orden no cambia nada.
+        rutas = list(rutas)
+        if len(rutas) > self.workers:
+            rutas = ordenar(rutas, self.cfg)
+        pendientes = deque((ruta, None) for ruta in rutas)
+        abierto    = entrada is not None
+        if not pendientes and not abierto:
+            return
+        eventos  = self._ctx.Queue()
+        dividir  = self.workers > 1
+        docs     = {}   # ruta -> _Documento
+        en_vuelo = {}   # future -> (ruta, rango)
+
+        # El pool se dimensiona con self.workers: los rangos de un
+        # documento grande pueden ocupar mas procesos que archivos haya.
+        if self.cfg.get("log_tiempos", True):
+            try:
+                self._log = abrir_log_tiempos()
+            except OSError:
+                self._log = None
+
+        # Base de paginas reconocidas, compartida por el pool solo en este lote
+        ruta_huellas = None
+        if self.cfg.get("detectar_duplicadas", False):
+            fd, ruta_huellas = tempfile.mkstemp(prefix="localocr_huellas_",
+                                                suffix=".sqlite")
+            os.close(fd)
+
+        self._memoria = memoria.PresupuestoMemoria(
+            memoria.memoria_max(self.cfg), self._ctx)
+        pool = self._nuevo_pool(eventos, ruta_huellas)
+        matado = False
+        try:
+            while pendientes or en_vuelo or (abierto and not self._cancelar.is_set()):
+                if abierto:
+                    # Sin nada que hacer se espera a la entrada, sin girar
+                    ocioso = not pendientes and not en_vuelo
+                    abierto = self._recoger(entrada, pendientes, docs,
+                                            0.2 if ocioso else 0)
+                # Solo se envian tantas tareas como procesos haya: asi
+                # detener() no tiene que vaciar una cola interna del pool
+                # y los rangos nuevos pueden adelantarse en la cola.
+                roto = False
+                while (pendientes and len(en_vuelo) < self.workers
+                       and not self._cancelar.is_set()):
+                    ruta, rango = pendientes.popleft()
+                    doc = docs.setdefault(ruta, _Documento(ruta))
+                    if doc.cerrado:
+                        continue
+                    try:
+                        fut = pool.submit(_tarea, ruta, self.cfg, rango,
+                                          dividir)
+                    except BrokenProcessPool:
+                        # Se rompio entre dos vueltas: la tarea vuelve a la cola
+                        pendientes.appendleft((ruta, rango))
+                        roto = True
+                        break
+                    en_vuelo[fut] = (ruta, rango)
+                    if rango is None and self.diario:
+                        self.diario.marcar(ruta, "en_curso")
+                if self._cancelar.is_set():
+                    pendientes.clear()
+                if roto and not en_vuelo:
+                    pool = self._rehacer_pool(pool, eventos, ruta_huellas)
+                    continue
+                if not en_vuelo:
+                    if abierto and not self._cancelar.is_set():
+                        continue
+                    break
+                if self._vencido():
+                    self._matar(pool, en_vuelo, docs, on_evento)
+                    matado = True
+                    break
+
+                if roto:
+                    # Con el pool roto todo lo que estaba en vuelo ya fallo
+                    hechos, _ = wait(en_vuelo)
+                else:
+                    hechos, _ = wait(en_vuelo, timeout=0.1,
+                                     return_when=FIRST_COMPLETED)
+                self._vaciar(eventos, docs, on_evento)
+                for fut in hechos:
+                    ruta, rango = en_vuelo.pop(fut)
+                    if isinstance(fut.exception(), BrokenProcessPool):
+                        roto = True
+                    self._recibir(fut, docs[ruta], rango, pendientes, on_evento)
+                if roto and not en_vuelo:
+                    pool = self._rehacer_pool(pool, eventos, ruta_huellas)
+                if entrada is not None and hechos:
+                    # Lote abierto: los documentos cerrados no se acumulan.
+                    # Antes se sacan de la cola sus rangos pendientes: sin
+                    # su documento volverian como un archivo nuevo.
+                    cerrados = {r for r, d in docs.items() if d.cerrado}
+                    if any(r in cerrados and rango is not None
+                           for r, rango in pendientes):
+                        vigentes = [(r, rango) for r, rango in pendientes
+                                    if rango is None or r not in cerrados]
+                        pendientes.clear()
+                        pendientes.extend(vigentes)
+                    ocupados = {r for r, _ in en_vuelo.values()}
+                    for r in [r for r, d in docs.items()
+                              if d.cerrado and r not in ocupados]:
+                        del docs[r]
+        except BaseException:
+            # Ctrl-C o un error en on_evento: no esperar al pool
+            self.detener()
+            self._matar(pool, {}, docs, None)
+            matado = True
+            raise
+        finally:
+            pool.shutdown(wait=not matado, cancel_futures=True)
+            eventos.close()
+            if ruta_huellas:
+                for sufijo in ("", "-wal", "-shm"):
+                    try:
+                        os.remove(ruta_huellas + sufijo)
+                    except OSError:
+                        pass
+            if self._log:
+                self._log.close()
+                self._log = None
+
+    def _nuevo_pool(self, eventos, ruta_huellas):
+        return ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=self._ctx,
+            initializer=_init_proceso,
+            initargs=(eventos, self._cancelar, self.cfg, ruta_huellas,
+                      self._memoria))
+
+    def _rehacer_pool(self, pool, eventos, ruta_huellas):
+        """Reemplaza un pool roto, ya sin tareas en vuelo."""
+        pool.shutdown(wait=True, cancel_futures=True)
+        # Los procesos muertos no soltaron su memoria reservada
+        self._memoria.vaciar()
+        return self._nuevo_pool(eventos, ruta_huellas)
+
+    def _recoger(self, entrada, pendientes, docs, espera: float) -> bool:
+        """Pasa a la cola las rutas nuevas de entrada; False al leer None."""
+        try:
+            ruta = entrada.get(timeout=espera) if espera else entrada.get_nowait()
+            while True:
+                if ruta is None:
+                    return False
+                # La misma ruta puede volver (otro archivo con ese nombre)
+                if ruta in docs and docs[ruta].cerrado:
+                    del docs[ruta]
+                pendientes.append((ruta, None))
+                ruta = entrada.get_nowait()
+        except queue.Empty:
+            return True
+
+    def _vencido(self) -> bool:
+        if not self._cancelar.is_set():
+            return False
+        if self._t_detener is None:
+            self._t_detener = time.monotonic()
+        return time.monotonic() - self._t_detener >= plazo_detener(self.cfg)
+
+    def _matar(self, pool, en_vuelo, docs, on_evento):
+        # _processes es interno de ProcessPoolExecutor, pero es la unica
+        # forma de llegar a los pids sin dependencias extra
+        for pid in list((getattr(pool, "_processes", None) or {}).keys()):
+            _matar_arbol(pid)
+        for ruta, _rango in en_vuelo.values():
+            doc = docs[ruta]
+            if not doc.cerrado:
+                self._cerrar(doc, on_evento,
+                             error="Proceso detenido por el usuario.")
+        en_vuelo.clear()
+
+    def _vaciar(self, eventos, docs, on_evento):
+        while True:
+            try:
+                _tipo, ruta, parte, pct = eventos.get_nowait()
+            except queue.Empty:
+                return
+            doc = docs.get(ruta)
+            # El progreso tardio de un documento ya cerrado se ignora
+            if doc is None or doc.cerrado:
+                continue
+            doc.avance[parte] = pct
+            on_evento("progreso", ruta, doc.porcentaje())
+
+    def _recibir(self, fut, doc, rango, pendientes, on_evento):
+        if doc.cerrado:
+            return
+        try:
+            tipo, valor, clave, registro = fut.result()
+        except ProcesoDetenido as e:
+            return self._cerrar(doc, on_evento, error=str(e))
+        except BrokenProcessPool:
+            return self._cerrar(
+                doc, on_evento,
+                error="El proceso que lo atendia termino de golpe (¿sin "
+                      "memoria?); el resto del lote sigue.")
+        except Exception as e:
+            return self._cerrar(doc, on_evento, error=f"Error inesperado: {e}")
+
+        doc.sumar(registro)
+        if rango is None:
+            doc.clave = clave
+        if tipo == "cache":
+            return self._cerrar(doc, on_evento, texto=valor, estado="cache")
+        if tipo == "dividir":
+            rangos = partir_rangos(valor, paginas_por_bloque(self.cfg))
+            doc.rangos = dict(rangos)
+            on_evento("paginas", doc.ruta, valor)
+            # Al frente de la cola: el documento grande no se queda al final
+            pendientes.extendleft((doc.ruta, r) for r in reversed(rangos))
+            return
+        if rango is None:
+            return self._cerrar(doc, on_evento, texto=valor, nuevo=True)
+
+        doc.partes[rango[0]] = valor
+        doc.avance[rango[0]] = 100
+        on_evento("progreso", doc.ruta, doc.porcentaje())
+        if len(doc.partes) == len(doc.rangos):
+            self._cerrar(doc, on_evento, texto=doc.texto(), nuevo=True)
+
+    def _cerrar(self, doc, on_evento, texto=None, error=None, nuevo=False,
+                estado="ok"):
+        doc.cerrado = True
+        if error is None and self._cancelar.is_set():
+            # Lo que termina despues de detener no deja salida ni cache:
+            # la UI ya lo mostro como detenido
+            error = "Proceso detenido por el usuario."
+        # Los resultados nuevos los guarda solo este proceso, una vez
+        # reensamblado el documento; el pool solo consulta la cache.
+        if nuevo and error is None and self._cache and doc.clave:
+            self._cache.guardar(doc.clave, texto)
+        salidas = []
+        if error is None:
+            # Primero se guarda: el archivo termina con "resultado" o con
+            # "error", nunca con los dos
+            t = time.perf_counter()
+            try:
+                salidas, doc.avisos = guardar_resultado(
+                    doc.ruta, texto, self.cfg)
+            except Exception as e:
+                error = f"No se pudo guardar la salida: {e}"
+            doc.etapas["salida"] = time.perf_counter() - t
+        if error is None:
+            on_evento("resultado", doc.ruta, texto)
+        else:
+            on_evento("error", doc.ruta, error)
+            estado = "error"
+
+        total = time.time() - doc.t0
+        if self.diario:
+            if error is None:
+                self.diario.marcar(doc.ruta, "ok", salida=salidas,
+                                   duracion=round(total, 3))
+            else:
+                self.diario.marcar(doc.ruta, "error", error=error,
+                                   duracion=round(total, 3))
+        registro = doc.registro(estado, total, self.cfg)
+        self._escribir_log(registro)
+        on_evento("registro", doc.ruta, registro)
+        on_evento("terminado", doc.ruta, total)
+
+    def _escribir_log(self, registro: dict):
+        if not self._log:
+            return
+        try:
+            self._log.write(json.dumps(registro, ensure_ascii=False) + "\n")
+            self._log.flush()
+            # Un lote abierto (vigilancia) puede escribir por dias
+            if self._log.tell() >= TIEMPOS_MAX:
+                self._log.close()
+                self._log = None
+                self._log = abrir_log_tiempos()
+        except OSError:
+            pass
@@ -0,0 +1,196 @@
+# core/huellas.py
+# Paginas en blanco y repetidas — sin PyQt6
+# Antes del OCR, cada pagina rasterizada pasa por dos chequeos baratos
+# (imagen reducida, solo PIL):
+#   tinta   — fraccion de pixeles oscuros en el centro de la hoja; bajo
+#             blanco_max_tinta y sin ningun trazo (grupo de pixeles
+#             conectados del tamano de una letra) es una hoja en blanco
+#             (separadores, dorsos de escaneos duplex) y no se reconoce.
+#             Una hoja casi vacia con un titulo ("Anexo II") tiene poca
+#             tinta, pero sus letras son trazos: se reconoce
+#   huella  — dHash de 256 bits; si coincide (distancia de Hamming) con
+#             una pagina ya reconocida en el mismo lote y sus mascaras de
+#             tinta son iguales, se reutiliza su texto. Es opcional
+#             (detectar_duplicadas, apagado por defecto)
+# La huella sola no distingue dos paginas del mismo formulario que solo
+# cambian en montos o en el numero de pagina (distancia 1): la mascara
+# tiene que coincidir pixel a pixel (duplicado_max_dif, 0 por defecto y
+# nunca mas de DIFERENCIA_TOPE). Ante la duda la pagina se reconoce de
+# nuevo; el texto nunca debe cambiar.
+#
+# HuellasLote guarda las paginas reconocidas en un SQLite (modo WAL) que
+# comparten todos los procesos del pool durante un lote.
+
+import sqlite3
+
+LADO_HUELLA = 16            # dHash de 16 x 16 bits
+MINIATURA   = (320, 414)    # proporcion carta, 1 bit por pixel (~16 KB)
+DISTANCIA_MAX = 10          # bits de Hamming para ser candidata
+DIFERENCIA_TOPE = 0.001     # tope de duplicado_max_dif: casi identicas
+TRAZO_MIN   = 4             # pixeles conectados (reducida 4x) que ya son una letra
+
+
+def max_tinta(cfg: dict) -> float:
+    """Tope de tinta de una hoja en blanco; 0 desactiva la deteccion."""
+    if not cfg.get("detectar_blancas", True):
+        return 0.0
+    try:
+        return max(0.0, float(cfg.get("blanco_max_tinta", 0.0001)))
+    except (TypeError, ValueError):
+        return 0.0001
+
+
+def max_diferencia(cfg: dict) -> float:
+    """Fraccion de la tinta que puede diferir entre dos paginas iguales."""
+    try:
+        return min(DIFERENCIA_TOPE, max(0.0, float(cfg.get("duplicado_max_dif", 0.0))))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _gris(img):
+    return img if img.mode == "L" else img.convert("L")
+
+
+def _centro(img, margen: float):
+    """La hoja sin los margenes (sombra del escaner), reducida 4x."""
+    gris = _gris(img)
+    ancho, alto = gris.size
+    dx, dy = int(ancho * margen), int(alto * margen)
+    centro = gris.crop((dx, dy, ancho - dx, alto - dy))
+    return centro.reduce(4) if min(centro.size) >= 64 else centro
+
+
+def tinta(img, margen: float = 0.05) -> float:
+    """
+    Fraccion de la hoja con tinta, sin los margenes (sombra del escaner).
+    Se mide reducida 4x: el polvo suelto se diluye y no cuenta.
+    """
+    hist = _centro(img, margen).histogram()
+    total = sum(hist)
+    return sum(hist[:160]) / total if total else 0.0
+
+
+def hay_trazos(img, minimo: int = TRAZO_MIN, margen: float = 0.05) -> bool:
+    """
+    True si algun grupo de pixeles oscuros conectados (8 vecinos) llega
+    a `minimo` en la hoja reducida: una letra, no una mota de polvo.
+    Pensado para hojas con muy poca tinta: solo recorre los oscuros.
+    """
+    chica = _centro(img, margen)
+    ancho = chica.size[0]
+    datos = chica.point(lambda v: 255 if v < 160 else 0).tobytes()
+    oscuros, i = set(), datos.find(b"\xff")
+    while i >= 0:
+        oscuros.add(i)
+        i = datos.find(b"\xff", i + 1)
+    while oscuros:
+        pila, grupo = [oscuros.pop()], 0
+        while pila:
+            p = pila.pop()
+            grupo += 1
+            if grupo >= minimo:
+                return True
+            x = p % ancho
+            for dy in (-ancho, 0, ancho):
+                for dx in (-1, 0, 1):
+                    if (dx == -1 and x == 0) or (dx == 1 and x == ancho - 1):
+                        continue
+                    vecino = p + dy + dx
+                    if vecino in oscuros:
+                        oscuros.remove(vecino)
+                        pila.append(vecino)
+    return False
+
+
+def huella(img) -> int:
+    """dHash: compara cada pixel con su vecino derecho en una imagen de 17 x 16."""
+    from PIL import Image
+    chica = _gris(img).resize((LADO_HUELLA + 1, LADO_HUELLA), Image.BOX)
+    px = list(chica.getdata())
+    bits = 0
+    for fila in range(LADO_HUELLA):
+        base = fila * (LADO_HUELLA + 1)
+        for col in range(LADO_HUELLA):
+            bits = (bits << 1) | (px[base + col] > px[base + col + 1])
+    return bits
+
+
+def miniatura(img) -> bytes:
+    """Mascara de tinta reducida (modo "1": blanco = tinta)."""
+    from PIL import Image
+    chica = _gris(img).resize(MINIATURA, Image.BOX)
+    # Reducida, una letra queda gris claro; un punto de polvo, casi blanco
+    return chica.point(lambda v: 255 if v < 230 else 0).convert("1").tobytes()
+
+
+def diferencia(a: bytes, b: bytes) -> float:
+    """Pixeles de tinta que no coinciden, como fraccion de la tinta (0-1)."""
+    from PIL import Image, ImageChops
+    ia = Image.frombytes("1", MINIATURA, a)
+    ib = Image.frombytes("1", MINIATURA, b)
+    distintos = ImageChops.logical_xor(ia, ib).histogram()[255]
+    tinta = max(ia.histogram()[255], ib.histogram()[255])
+    return distintos / tinta if tinta else 0.0
+
+
+class HuellasLote:
+    """
+    Paginas reconocidas en el lote actual: huella, miniatura y texto.
+    ruta=":memory:" sirve para un solo proceso.
+    """
+
+    def __init__(self, ruta: str, max_dif: float = 0.0):
+        self.ruta    = ruta
+        self.max_dif = max_dif
+        self._con    = None
+        self._vistas = []    # (rowid, huella) ya leidas de la base
+        self._ultima = 0
+
+    def _conexion(self) -> sqlite3.Connection:
+        if self._con is None:
+            con = sqlite3.connect(self.ruta, timeout=30)
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute(
+                "CREATE TABLE IF NOT EXISTS paginas ("
+                " huella TEXT NOT NULL, miniatura BLOB NOT NULL,"
+                " texto TEXT NOT NULL)")
+            con.commit()
+            self._con = con
+        return self._con
+
+    def buscar(self, h: int, mini: bytes):
+        """Texto de una pagina ya reconocida igual a esta, o None."""
+        try:
+            con = self._conexion()
+            # Solo se traen las huellas nuevas desde la ultima busqueda
+            for rowid, hx in con.execute(
+                    "SELECT rowid, huella FROM paginas WHERE rowid > ?",
+                    (self._ultima,)):
+                self._vistas.append((rowid, int(hx, 16)))
+                self._ultima = rowid
+            for rowid, otra in self._vistas:
+                if bin(h ^ otra).count("1") > DISTANCIA_MAX:
+                    continue
+                fila = con.execute(
+                    "SELECT miniatura, texto FROM paginas WHERE rowid = ?",
+                    (rowid,)).fetchone()
+                if fila and diferencia(mini, fila[0]) <= self.max_dif:
+                    return fila[1]
+        except sqlite3.Error:
+            pass
+        return None
+
+    def guardar(self, h: int, mini: bytes, texto: str):
+        try:
+            con = self._conexion()
+            with con:
+                con.execute("INSERT INTO paginas VALUES (?, ?, ?)",
+                            (format(h, "x"), mini, texto))
+        except sqlite3.Error:
+            pass
+
+    def cerrar(self):
+        if self._con is not None:
+            self._con.close()
+            self._con = None
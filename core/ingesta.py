@@ -0,0 +1,97 @@
+# core/ingesta.py
+# Busqueda de archivos en carpetas — sin PyQt6
+# Recorre archivos y carpetas (recursivo, con os.scandir) y entrega las
+# rutas validas de a bloques: la UI puede ir llenando la cola mientras
+# la busqueda sigue, aunque la carpeta tenga decenas de miles de
+# escaneos. Cada candidato se confirma por su contenido (los primeros
+# bytes, ver utils.tipo_contenido), no solo por la extension.
+#
+# El orden es el de un listado: en cada carpeta primero sus archivos
+# por nombre y despues sus subcarpetas. Los enlaces a carpetas no se
+# siguen (como os.walk), asi no hay ciclos.
+
+import os
+import time
+
+from core.utils import es_archivo_valido
+
+BLOQUE      = 500    # rutas por bloque, como maximo
+INTERVALO_S = 0.1    # un bloque incompleto se entrega pasado este tiempo
+
+
+class Busqueda:
+    """
+    Rutas validas (absolutas, sin repetir) de una lista de archivos y
+    carpetas. detener() se puede llamar desde otro hilo.
+    """
+
+    def __init__(self, entradas, recursivo: bool = True,
+                 revisar_contenido: bool = True):
+        self.entradas  = list(entradas)
+        self.recursivo = recursivo
+        self.revisar_contenido = revisar_contenido
+        self.descartados = 0     # extension valida pero contenido no
+        self.faltantes   = []    # entradas que no existen
+        self._detener    = False
+
+    def detener(self):
+        self._detener = True
+
+    def __iter__(self):
+        vistos = set()
+        for entrada in self.entradas:
+            if self._detener:
+                return
+            if os.path.isdir(entrada):
+                candidatos = self._carpeta(entrada)
+            elif os.path.isfile(entrada):
+                candidatos = (entrada,)
+            else:
+                self.faltantes.append(entrada)
+                continue
+            for ruta in candidatos:
+                ruta = os.path.abspath(ruta)
+                if ruta in vistos or not es_archivo_valido(ruta):
+                    continue
+                vistos.add(ruta)
+                if (self.revisar_contenido
+                        and not es_archivo_valido(ruta, revisar_contenido=True)):
+                    self.descartados += 1
+                    continue
+                yield ruta
+
+    def _carpeta(self, raiz: str):
+        pendientes = [raiz]
+        while pendientes and not self._detener:
+            carpeta = pendientes.pop()
+            try:
+                with os.scandir(carpeta) as it:
+                    entradas = sorted(it, key=lambda e: e.name)
+            except OSError:
+                continue
+            subcarpetas = []
+            for e in entradas:
+                if self._detener:
+                    return
+                try:
+                    if e.is_dir(follow_symlinks=False):
+                        subcarpetas.append(e.path)
+                    elif e.is_file():
+                        yield e.path
+                except OSError:
+                    continue
+            if self.recursivo:
+                # Pila: la primera subcarpeta por nombre sale primero
+                pendientes.extend(reversed(subcarpetas))
+
+    def bloques(self, tam: int = BLOQUE, intervalo: float = INTERVALO_S):
+        """Las mismas rutas en listas de hasta `tam`, o lo hallado cada `intervalo` s."""
+        bloque, t = [], time.monotonic()
+        for ruta in self:
+            bloque.append(ruta)
+            ahora = time.monotonic()
+            if len(bloque) >= tam or ahora - t >= intervalo:
+                yield bloque
+                bloque, t = [], ahora
+        if bloque:
+            yield bloque
@@ -0,0 +1,114 @@
+# core/memoria.py
+# Presupuesto de memoria para las paginas rasterizadas — sin PyQt6
+# Cada proceso del pool rasteriza sus paginas por su cuenta; con 16
+# procesos a 600 DPI (una carta RGB son ~135 MB) la suma no tiene techo
+# y el sistema termina matando el programa. El presupuesto es uno solo
+# para todo el lote, compartido entre procesos: antes de rasterizar una
+# ventana de paginas se reservan sus bytes y, si no alcanzan, el
+# proceso espera a que otro suelte los suyos.
+#
+# Cuenta los pixeles decodificados tal como los guarda PIL (4 bytes por
+# pixel en color, 1 en gris), no la memoria total del proceso. Una
+# ventana mas grande que todo el presupuesto pasa igual, pero sola: asi
+# nunca se bloquea el lote. cfg["memoria_max_mb"] = 0 quita el limite.
+#
+# En cada proceso del pool el ejecutor instala el presupuesto del lote
+# (instalar); los documentos reservan y liberan con reservar/liberar.
+
+ESPERA_S = 0.2     # cada cuanto mira la bandera de detener mientras espera
+
+
+def memoria_max(cfg: dict) -> int:
+    """Presupuesto en bytes segun cfg["memoria_max_mb"]; 0 = sin limite."""
+    try:
+        return max(0, int(float(cfg.get("memoria_max_mb", 2048)) * 1024 * 1024))
+    except (TypeError, ValueError):
+        return 2048 * 1024 * 1024
+
+
+def bytes_imagen(ancho: int, alto: int, modo: str = "RGB") -> int:
+    """Memoria de una imagen PIL decodificada."""
+    por_pixel = 1 if modo in ("1", "L", "P") else 4
+    return int(ancho) * int(alto) * por_pixel
+
+
+class PresupuestoMemoria:
+    """
+    Bytes de paginas en vuelo de todo el lote. Se crea en el proceso
+    principal con el contexto del pool y se pasa a cada proceso al
+    arrancar (initargs); uso() se puede leer desde cualquier hilo.
+    """
+
+    def __init__(self, limite: int, ctx):
+        self.limite = limite
+        self._cond  = ctx.Condition()
+        self._uso   = ctx.RawArray("q", 2)     # [en uso, pico]
+
+    def tomar(self, n: int, detener=None) -> bool:
+        """Reserva n bytes, esperando si hace falta. False si se pidio detener."""
+        with self._cond:
+            while (self.limite and self._uso[0]
+                   and self._uso[0] + n > self.limite):
+                if detener and detener():
+                    return False
+                self._cond.wait(ESPERA_S)
+            self._uso[0] += n
+            self._uso[1] = max(self._uso[1], self._uso[0])
+        return True
+
+    def sumar(self, n: int):
+        """Suma n bytes sin esperar (la memoria ya esta ocupada)."""
+        with self._cond:
+            self._uso[0] += n
+            self._uso[1] = max(self._uso[1], self._uso[0])
+
+    def soltar(self, n: int):
+        if n <= 0:
+            return
+        with self._cond:
+            self._uso[0] = max(0, self._uso[0] - n)
+            self._cond.notify_all()
+
+    def vaciar(self):
+        """Todo en cero salvo el pico: los procesos que reservaban murieron."""
+        with self._cond:
+            self._uso[0] = 0
+            self._cond.notify_all()
+
+    def uso(self) -> tuple:
+        """(bytes en uso, pico del lote)."""
+        return self._uso[0], self._uso[1]
+
+
+# ── Presupuesto del proceso ──────────────────────────────────────
+# Fuera del pool (un archivo suelto, las pruebas) no hay presupuesto y
+# reservar() no hace nada.
+_presupuesto = None
+_detener     = None
+
+
+def instalar(presupuesto, detener=None):
+    global _presupuesto, _detener
+    _presupuesto, _detener = presupuesto, detener
+
+
+def reservar(n: int) -> bool:
+    """Reserva n bytes del presupuesto del lote; False si se pidio detener."""
+    if _presupuesto is None or n <= 0:
+        return True
+    return _presupuesto.tomar(n, _detener)
+
+
+def liberar(n: int):
+    if _presupuesto is not None:
+        _presupuesto.soltar(n)
+
+
+def ajustar(diferencia: int):
+    """Corrige una reserva con lo que realmente ocupo (+/- bytes)."""
+    if _presupuesto is None or not diferencia:
+        return
+    if diferencia > 0:
+        _presupuesto.sumar(diferencia)
+    else:
+        _presupuesto.soltar(-diferencia)
@@ -0,0 +1,32 @@
+# core/miniaturas.py
+# Primera pagina de un documento, reducida para la vista previa — sin PyQt6
+# Se decodifica solo lo que hace falta para el tamano pedido:
+#   PDF   — pdftoppm rasteriza directo al tamano (-scale-to), no a 300 DPI
+#   JPEG  — draft(): el decodificador reduce a 1/2, 1/4 o 1/8 al leer
+#   resto — se decodifica el primer cuadro y se reduce con thumbnail()
+# El resultado es siempre una imagen PIL RGB que cabe en ancho x alto.
+
+from core.motores import es_pdf, ruta_poppler
+
+
+def miniatura(ruta: str, ancho: int, alto: int, cfg: dict = None):
+    """Primera pagina de `ruta` reducida para caber en ancho x alto."""
+    from PIL import Image
+    ancho, alto = max(1, int(ancho)), max(1, int(alto))
+    if es_pdf(ruta):
+        from pdf2image import convert_from_path
+        # Lado mayor = el mayor de la caja; el ajuste fino lo hace thumbnail()
+        paginas = convert_from_path(
+            ruta, first_page=1, last_page=1, size=max(ancho, alto),
+            poppler_path=ruta_poppler(cfg or {}))
+        if not paginas:
+            raise ValueError("El PDF no tiene paginas")
+        img = paginas[0]
+    else:
+        with Image.open(ruta) as original:
+            original.draft("RGB", (ancho, alto))
+            img = original.copy()
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+    img.thumbnail((ancho, alto), Image.Resampling.BILINEAR, reducing_gap=2.0)
+    return img
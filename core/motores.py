@@ -0,0 +1,466 @@
+# core/motores.py
+# Motores OCR intercambiables — sin PyQt6
+#
+# Todo motor implementa la interfaz MotorOCR:
+#   abrir(ruta)        -> documento con n_paginas y paginas(primera, ultima)
+#                         y, opcional, capa_texto(primera, ultima): el
+#                         texto ya incrustado de cada pagina ("" si no hay)
+#   reconocer(pagina)  -> Reconocimiento(texto, confianza 0-1)
+#   version(cfg)       -> str, para la clave de la cache de resultados
+#
+# Motores incluidos (cfg["motor"]):
+#   tesseract — pdf2image/PIL + pytesseract
+#   easyocr   — pdf2image/PIL + easyocr.Reader
+#   sintetico — deterministico y solo CPU, con costo por pagina
+#               configurable (cfg["sintetico_ms"]); no necesita ningun OCR
+#               instalado, sirve para probar y medir el resto del sistema
+#
+# Cada proceso carga un motor una sola vez por (motor, idiomas, ejecutable)
+# y lo reutiliza en todos los archivos y paginas del lote. Con EasyOCR
+# esto evita recargar el modelo de red neuronal en cada archivo.
+
+import os
+import re
+import time
+import hashlib
+import subprocess
+from collections import namedtuple
+
+from core import memoria
+from core.memoria import bytes_imagen
+from core.resolucion import es_auto, dpi_fijo, elegir_dpi, limites, DPI_SONDA
+
+# Codigos de idioma de Tesseract -> EasyOCR
+IDIOMAS_EASYOCR = {"spa": "es", "eng": "en"}
+
+Reconocimiento = namedtuple("Reconocimiento", "texto confianza")
+
+_cargados  = {}   # clave -> motor ya inicializado en este proceso
+_versiones = {}   # clave -> version del motor (para la cache de resultados)
+
+
+def es_pdf(ruta: str) -> bool:
+    return os.path.splitext(ruta)[1].lower() == ".pdf"
+
+
+def ventana_paginas(cfg: dict) -> int:
+    """Paginas que se rasterizan de una vez (memoria maxima por proceso)."""
+    try:
+        return max(1, int(cfg.get("ventana_paginas", 2)))
+    except (TypeError, ValueError):
+        return 2
+
+
+def ruta_poppler(cfg: dict):
+    ruta = cfg.get("poppler_path", "")
+    return ruta if ruta and os.path.isdir(ruta) else None
+
+
+# ── Interfaz ─────────────────────────────────────────────────────
+class MotorOCR:
+    """Interfaz comun de los motores OCR."""
+
+    def __init__(self, cfg: dict):
+        self.cfg = cfg
+
+    def abrir(self, ruta: str):
+        """Devuelve un documento con n_paginas y paginas(primera, ultima)."""
+        raise NotImplementedError
+
+    def reconocer(self, pagina) -> Reconocimiento:
+        raise NotImplementedError
+
+    @staticmethod
+    def version(cfg: dict) -> str:
+        raise NotImplementedError
+
+
+# ── Documentos rasterizados (Tesseract / EasyOCR) ────────────────
+class DocumentoRaster:
+    """PDF (via pdf2image) o imagen (via PIL), pagina por pagina."""
+
+    def __init__(self, ruta: str, cfg: dict):
+        self.ruta  = ruta
+        self.cfg   = cfg
+        self._n    = None
+        self._info = None
+
+    def _pdfinfo(self) -> dict:
+        if self._info is None:
+            from pdf2image import pdfinfo_from_path
+            self._info = pdfinfo_from_path(self.ruta, poppler_path=ruta_poppler(self.cfg))
+        return self._info
+
+    @property
+    def n_paginas(self) -> int:
+        """Paginas del documento (PDF via pdfinfo, TIFF por frames, resto 1)."""
+        if self._n is None:
+            if es_pdf(self.ruta):
+                self._n = int(self._pdfinfo()["Pages"])
+            else:
+                from PIL import Image
+                with Image.open(self.ruta) as img:
+                    self._n = getattr(img, "n_frames", 1)
+        return self._n
+
+    def paginas(self, primera: int = 1, ultima: int = None):
+        """
+        Genera las paginas primera..ultima como imagenes PIL, de a una.
+
+        Los PDF se rasterizan en ventanas de ventana_paginas: nunca hay mas
+        de una ventana en memoria, sin importar cuantas paginas tenga el
+        documento. Quien consume el generador debe soltar cada imagen
+        antes de pedir la siguiente: ahi se devuelve su memoria al
+        presupuesto del lote (core/memoria.py). Si se pide detener
+        mientras espera memoria, el generador termina antes.
+        Cada imagen lleva su resolucion en img.info["dpi"].
+        """
+        ultima = ultima or self.n_paginas
+        if es_pdf(self.ruta):
+            paso = ventana_paginas(self.cfg)
+            for ini in range(primera, ultima + 1, paso):
+                fin = min(ini + paso - 1, ultima)
+                for dpi, desde, hasta in self._tramos(ini, fin):
+                    if not (yield from self._ventana(dpi, desde, hasta)):
+                        return
+            return
+
+        # Las imagenes ya vienen rasterizadas: el DPI no aplica
+        from PIL import Image
+        with Image.open(self.ruta) as img:
+            n = getattr(img, "n_frames", 1)
+            for i in range(primera - 1, min(ultima, n)):
+                img.seek(i)
+                # El cuadro decodificado queda en img ademas de la copia
+                tam = 2 * bytes_imagen(*img.size, img.mode)
+                if not memoria.reservar(tam):
+                    return
+                try:
+                    yield img.copy()
+                finally:
+                    memoria.liberar(tam)
+
+    def _bytes_pagina(self, dpi: int, modo: str = "RGB") -> int:
+        """Memoria de una pagina a `dpi`, por el tamano que informa pdfinfo."""
+        ancho, alto = 612.0, 792.0      # carta, si pdfinfo no lo dice
+        try:
+            medida = re.match(r"\s*([\d.]+)\s*x\s*([\d.]+)",
+                              str(self._pdfinfo().get("Page size", "")))
+            if medida:
+                ancho, alto = float(medida.group(1)), float(medida.group(2))
+        except Exception:
+            pass
+        return bytes_imagen(ancho / 72 * dpi, alto / 72 * dpi, modo)
+
+    def _ventana(self, dpi: int, desde: int, hasta: int):
+        """
+        Rasteriza desde..hasta con su memoria reservada y la suelta pagina
+        a pagina. Devuelve False si se pidio detener mientras esperaba.
+        """
+        tomado = self._bytes_pagina(dpi) * (hasta - desde + 1)
+        if not memoria.reservar(tomado):
+            return False
+        try:
+            imgs = self._rasterizar(dpi, desde, hasta)
+            # Lo reservado era una estimacion: desde aqui cuenta lo real
+            reales = [bytes_imagen(*img.size, img.mode) for img in imgs]
+            memoria.ajustar(sum(reales) - tomado)
+            tomado = sum(reales)
+            while imgs:
+                img = imgs.pop(0)
+                img.info["dpi"] = (dpi, dpi)
+                yield img
+                tam = reales.pop(0)
+                memoria.liberar(tam)
+                tomado -= tam
+        finally:
+            memoria.liberar(tomado)
+        return True
+
+    def capa_texto(self, primera: int, ultima: int) -> list:
+        """
+        Texto incrustado de cada pagina del PDF, via pdftotext de poppler
+        (una sola llamada para todo el rango). Lista vacia si no es PDF o
+        si pdftotext no esta disponible: todo pasa por el OCR.
+        """
+        if not es_pdf(self.ruta):
+            return []
+        carpeta = ruta_poppler(self.cfg)
+        exe = os.path.join(carpeta, "pdftotext") if carpeta else "pdftotext"
+        extra = {"creationflags": subprocess.CREATE_NO_WINDOW} if os.name == "nt" else {}
+        try:
+            r = subprocess.run(
+                [exe, "-f", str(primera), "-l", str(ultima), "-enc", "UTF-8",
+                 self.ruta, "-"],
+                capture_output=True, timeout=120, **extra)
+        except (OSError, subprocess.SubprocessError):
+            return []
+        if r.returncode != 0:
+            return []
+        # pdftotext cierra cada pagina con un salto de pagina (\f)
+        return r.stdout.decode("utf-8", "replace").split("\f")[:ultima - primera + 1]
+
+    def _rasterizar(self, dpi: int, primera: int, ultima: int, **opciones) -> list:
+        from pdf2image import convert_from_path
+        return convert_from_path(
+            self.ruta, dpi=dpi, poppler_path=ruta_poppler(self.cfg),
+            first_page=primera, last_page=ultima, **opciones)
+
+    def _tramos(self, primera: int, ultima: int) -> list:
+        """
+        [(dpi, desde, hasta)] para las paginas primera..ultima. Con DPI
+        fijo es un solo tramo; en modo auto se sondea cada pagina y las
+        consecutivas con el mismo DPI se rasterizan juntas.
+        """
+        if not es_auto(self.cfg):
+            return [(dpi_fijo(self.cfg), primera, ultima)]
+        tomado = self._bytes_pagina(DPI_SONDA, "L") * (ultima - primera + 1)
+        if not memoria.reservar(tomado):
+            return []
+        tramos = []
+        try:
+            sondas = self._rasterizar(DPI_SONDA, primera, ultima, grayscale=True)
+            for n, sonda in enumerate(sondas, start=primera):
+                dpi = elegir_dpi(sonda, self.cfg)
+                sonda.close()
+                if tramos and tramos[-1][0] == dpi:
+                    tramos[-1][2] = n
+                else:
+                    tramos.append([dpi, n, n])
+        finally:
+            memoria.liberar(tomado)
+        return [tuple(t) for t in tramos]
+
+
+class MotorTesseract(MotorOCR):
+    """pytesseract sobre imagenes PIL."""
+
+    def __init__(self, cfg: dict):
+        super().__init__(cfg)
+        import pytesseract
+        if os.path.isfile(cfg.get("tesseract_path", "")):
+            pytesseract.pytesseract.tesseract_cmd = cfg["tesseract_path"]
+        self._tess = pytesseract
+        self.lang  = cfg.get("lang", "spa+eng")
+
+    def abrir(self, ruta: str):
+        return DocumentoRaster(ruta, self.cfg)
+
+    def reconocer(self, pagina) -> Reconocimiento:
+        # Una sola pasada de Tesseract da palabras y confianza; el texto
+        # se rearma por linea y parrafo en el orden de lectura.
+        d = self._tess.image_to_data(
+            pagina, lang=self.lang, output_type=self._tess.Output.DICT)
+        lineas, confs, previo = [], [], None
+        for i, palabra in enumerate(d["text"]):
+            if not palabra.strip():
+                continue
+            bloque = (d["block_num"][i], d["par_num"][i])
+            linea  = bloque + (d["line_num"][i],)
+            if linea != previo:
+                if previo is not None and bloque != previo[:2]:
+                    lineas.append("")
+                lineas.append(palabra)
+                previo = linea
+            else:
+                lineas[-1] += " " + palabra
+            conf = float(d["conf"][i])
+            if conf >= 0:
+                confs.append(conf)
+        confianza = sum(confs) / len(confs) / 100 if confs else 0.0
+        return Reconocimiento("\n".join(lineas), confianza)
+
+    @staticmethod
+    def version(cfg: dict) -> str:
+        import pytesseract
+        if os.path.isfile(cfg.get("tesseract_path", "")):
+            pytesseract.pytesseract.tesseract_cmd = cfg["tesseract_path"]
+        return str(pytesseract.get_tesseract_version())
+
+
+class MotorEasyOCR(MotorOCR):
+    """easyocr.Reader cargado una vez; recibe imagenes PIL."""
+
+    def __init__(self, cfg: dict):
+        super().__init__(cfg)
+        import easyocr
+        import numpy as np
+        idiomas = [IDIOMAS_EASYOCR.get(l, l)
+                   for l in cfg.get("lang", "spa+eng").split("+")]
+        self._np     = np
+        self._reader = easyocr.Reader(idiomas, gpu=False, verbose=False)
+
+    def abrir(self, ruta: str):
+        return DocumentoRaster(ruta, self.cfg)
+
+    def reconocer(self, pagina) -> Reconocimiento:
+        res = self._reader.readtext(self._np.asarray(pagina), detail=1)
+        texto = "\n".join(t for _caja, t, _conf in res)
+        confianza = sum(c for *_, c in res) / len(res) if res else 0.0
+        return Reconocimiento(texto, float(confianza))
+
+    @staticmethod
+    def version(cfg: dict) -> str:
+        # Sin construir el Reader: no hace falta cargar el modelo
+        from importlib.metadata import version
+        return version("easyocr")
+
+
+# ── Motor sintetico ──────────────────────────────────────────────
+_PALABRAS = (
+    "factura contrato fecha total cliente importe pagina documento "
+    "numero firma anexo clausula registro domicilio cantidad concepto "
+    "the invoice amount date signature page section account"
+).split()
+
+
+class PaginaSintetica:
+    """Pagina sin pixeles: solo numero, tamano y semilla del contenido."""
+
+    def __init__(self, numero: int, semilla: bytes, dpi: int):
+        self.numero  = numero
+        self.semilla = semilla
+        # Carta a la resolucion configurada, como si se hubiera rasterizado
+        self.size    = (int(8.5 * dpi), int(11 * dpi))
+        self.info    = {"dpi": (dpi, dpi)}
+
+    def close(self):
+        pass
+
+
+class DocumentoSintetico:
+    """
+    Cuenta las paginas de un PDF buscando objetos /Type /Page en el
+    archivo (sin poppler); cualquier otro archivo es de una pagina.
+    Con dpi "auto" cada pagina recibe un DPI deterministico entre
+    dpi_min y dpi_max, como si se hubiera sondeado.
+    """
+
+    def __init__(self, ruta: str, cfg: dict):
+        with open(ruta, "rb") as f:
+            datos = f.read()
+        self._datos  = datos if es_pdf(ruta) else b""
+        self.semilla = hashlib.sha256(datos).digest()
+        self.dpi     = dpi_fijo(cfg)
+        self.auto    = es_auto(cfg)
+        self.limites = limites(cfg)
+        n = len(re.findall(rb"/Type\s*/Page(?!s)", datos)) if es_pdf(ruta) else 0
+        self.n_paginas = max(1, n)
+
+    def _dpi(self, n: int) -> int:
+        if not self.auto:
+            return self.dpi
+        bajo, alto = self.limites
+        opciones = list(range(bajo, alto + 1, 50)) or [bajo]
+        h = hashlib.sha256(self.semilla + n.to_bytes(4, "big")).digest()
+        return opciones[h[1] % len(opciones)]
+
+    def paginas(self, primera: int = 1, ultima: int = None):
+        for n in range(primera, (ultima or self.n_paginas) + 1):
+            pag = PaginaSintetica(n, self.semilla, self._dpi(n))
+            # Sin pixeles, pero ocupa el presupuesto de memoria como una
+            # pagina real: asi el limite se puede probar sin poppler
+            tam = bytes_imagen(*pag.size)
+            if not memoria.reservar(tam):
+                return
+            try:
+                yield pag
+            finally:
+                memoria.liberar(tam)
+
+    def capa_texto(self, primera: int, ultima: int) -> list:
+        """
+        Cadenas (...) de los flujos sin comprimir, un flujo por pagina y
+        en orden de archivo. No es un lector de PDF: alcanza para el
+        corpus de benchmarks y para probar el salto de paginas con texto.
+        """
+        flujos = re.findall(rb"stream\r?\n(.*?)endstream", self._datos, re.S)
+        textos = []
+        for flujo in flujos[primera - 1:ultima]:
+            cadenas = re.findall(rb"\(((?:[^()\\]|\\.)*)\)", flujo)
+            textos.append("\n".join(c.decode("latin-1") for c in cadenas))
+        return textos
+
+
+class MotorSintetico(MotorOCR):
+    """
+    Motor falso y deterministico: el mismo archivo produce siempre el
+    mismo texto, y cada pagina consume sintetico_ms de CPU a 300 DPI
+    (proporcional a los pixeles, como el OCR real).
+    """
+
+    def abrir(self, ruta: str):
+        return DocumentoSintetico(ruta, self.cfg)
+
+    @property
+    def costo(self) -> float:
+        try:
+            return max(0.0, float(self.cfg.get("sintetico_ms", 50)) / 1000)
+        except (TypeError, ValueError):
+            return 0.05
+
+    def reconocer(self, pagina) -> Reconocimiento:
+        h = hashlib.sha256(pagina.semilla + pagina.numero.to_bytes(4, "big")).digest()
+        # Trabajo de CPU real (no sleep) para que el pool escale como con OCR
+        escala = pagina.size[0] * pagina.size[1] / (2550 * 3300)
+        fin, x = time.perf_counter() + self.costo * escala, h
+        while time.perf_counter() < fin:
+            x = hashlib.sha256(x).digest()
+
+        lineas = [f"[ Pagina {pagina.numero} ]"]
+        for i in range(0, 32, 4):
+            lineas.append(" ".join(_PALABRAS[b % len(_PALABRAS)] for b in h[i:i + 4]))
+        return Reconocimiento("\n".join(lineas), 0.80 + h[0] % 20 / 100)
+
+    @staticmethod
+    def version(cfg: dict) -> str:
+        return "1"
+
+
+MOTORES = {
+    "tesseract": MotorTesseract,
+    "easyocr":   MotorEasyOCR,
+    "sintetico": MotorSintetico,
+}
+
+
+# ── Registro por proceso ─────────────────────────────────────────
+def _clave(cfg: dict) -> tuple:
+    return (cfg.get("motor", "tesseract"),
+            cfg.get("lang", "spa+eng"),
+            cfg.get("tesseract_path", ""))
+
+
+def obtener_motor(cfg: dict) -> MotorOCR:
+    """Devuelve el motor de cfg["motor"], creandolo solo la primera vez."""
+    clave = _clave(cfg)
+    motor = _cargados.get(clave)
+    if motor is None:
+        nombre = clave[0]
+        if nombre not in MOTORES:
+            raise ValueError(f"Motor OCR desconocido: {nombre}")
+        motor = _cargados[clave] = MOTORES[nombre](cfg)
+    # Lo caro (modelo, ejecutable) va en la clave; el resto de ajustes
+    # (dpi, ventana, poppler...) se toma del lote actual
+    motor.cfg = cfg
+    return motor
+
+
+def version_motor(cfg: dict) -> str:
+    """Version del motor configurado; se consulta una vez por proceso."""
+    clave = _clave(cfg)
+    if clave not in _versiones:
+        motor = MOTORES.get(clave[0])
+        _versiones[clave] = motor.version(cfg) if motor else clave[0]
+    return _versiones[clave]
+
+
+def precargar(cfg: dict):
+    """Carga el motor por adelantado (p. ej. al arrancar un proceso del pool)."""
+    if cfg.get("motor", "tesseract") not in MOTORES:
+        return
+    try:
+        obtener_motor(cfg)
+    except Exception:
+        # El error real se reporta por archivo cuando se intente usar
+        pass
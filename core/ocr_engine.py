@@ -1,88 +1,173 @@
 # core/ocr_engine.py
-# Motor OCR — Fase 1: simulacion con worker real de QThread
+# Motor OCR — workers de QThread para la GUI
+#   LoteWorker    — un lote completo en un pool de procesos (core/executor.py)
+#   IngestaWorker — busca archivos en carpetas sin congelar la UI
+#   VistaWorker   — decodifica las vistas previas (core/miniaturas.py)
 # ─────────────────────────────────────────────────────────────────
-# FASE 2: Reemplaza el bloque marcado SIMULACION con:
-#
-# Tesseract:
-#   import pytesseract
-#   from pdf2image import convert_from_path
-#   pytesseract.pytesseract.tesseract_cmd = cfg["tesseract_path"]
-#   imgs = convert_from_path(ruta, dpi=int(cfg["dpi"]),
-#                            poppler_path=cfg["poppler_path"])
-#   texto = "\n\n".join(
-#       pytesseract.image_to_string(img, lang=cfg["lang"])
-#       for img in imgs)
-#
-# EasyOCR:
-#   import easyocr
-#   reader = easyocr.Reader(["es", "en"])
-#   resultado = reader.readtext(ruta, detail=0)
-#   texto = "\n".join(resultado)
+# Motores OCR: core/motores.py (tesseract, easyocr, sintetico), cargados
+# una vez por proceso y reutilizados en todo el lote.
 # ─────────────────────────────────────────────────────────────────
 
-import time
+import threading
 from PyQt6.QtCore import QThread, pyqtSignal
+from PyQt6.QtGui import QImage
 
+from core.executor import BatchExecutor
+from core.ingesta import Busqueda
+from core.miniaturas import miniatura
 
-class OCRWorker(QThread):
+
+class LoteWorker(QThread):
     """
-    Worker que corre en hilo separado para no congelar la UI.
+    Procesa un lote de archivos en paralelo sin congelar la UI.
+    Cada senal lleva la ruta del archivo.
 
     Senales:
-        progreso  (int)   — porcentaje 0-100
-        resultado (str)   — texto extraido (o simulado en Fase 1)
-        error     (str)   — mensaje de error
-        terminado (float) — segundos totales que tomo el proceso
+        progreso  (str, int)   — ruta, porcentaje 0-100
+        paginas   (str, int)   — ruta, paginas del archivo (si se parte)
+        resultado (str, str)   — ruta, texto extraido
+        error     (str, str)   — ruta, mensaje de error
+        registro  (str, dict)  — ruta, tiempos por etapa y por pagina
+        terminado (str, float) — ruta, segundos que tomo el archivo
+
+    Con `agregador` (core/progreso.py) el progreso no se emite: se deja
+    en el agregador y la UI lo lee a su ritmo.
     """
-    progreso  = pyqtSignal(int)
-    resultado = pyqtSignal(str)
-    error     = pyqtSignal(str)
-    terminado = pyqtSignal(float)   # emite duracion en segundos
+    progreso  = pyqtSignal(str, int)
+    paginas   = pyqtSignal(str, int)
+    resultado = pyqtSignal(str, str)
+    error     = pyqtSignal(str, str)
+    registro  = pyqtSignal(str, dict)
+    terminado = pyqtSignal(str, float)
 
-    def __init__(self, ruta_archivo: str, cfg: dict):
+    def __init__(self, rutas: list, cfg: dict, diario=None, agregador=None):
         super().__init__()
-        self.ruta_archivo = ruta_archivo
-        self.cfg          = cfg
-        self._detener     = False
+        self.rutas      = list(rutas)
+        self.cfg        = cfg
+        self._executor  = BatchExecutor(cfg, diario=diario)
+        self._agregador = agregador
+        self._terminados = set()
 
     def detener(self):
-        self._detener = True
+        self._executor.detener()
+
+    def uso_memoria(self):
+        """(en uso, pico, limite) en bytes de las paginas del lote, o None."""
+        return self._executor.uso_memoria()
 
     def run(self):
-        t0 = time.time()
         try:
-            nombre = os.path.basename(self.ruta_archivo)
-
-            # ═══════════════════════════════════════════════════
-            #  SIMULACION — Reemplazar en Fase 2
-            # ═══════════════════════════════════════════════════
-            pasos = 10
-            for i in range(pasos):
-                if self._detener:
-                    self.error.emit("Proceso detenido por el usuario.")
-                    return
-                time.sleep(0.3)
-                self.progreso.emit(int((i + 1) / pasos * 100))
-
-            texto = (
-                f"[ Texto extraido de: {nombre} ]\n\n"
-                "Lorem ipsum dolor sit amet, consectetur adipiscing elit.\n"
-                "Sed do eiusmod tempor incididunt ut labore et dolore magna.\n"
-                "Ut enim ad minim veniam, quis nostrud exercitation.\n\n"
-                "-- Fase 2: aqui aparecera el texto real de Tesseract/EasyOCR --"
-            )
-            # ═══════════════════════════════════════════════════
-            #  FIN SIMULACION
-            # ═══════════════════════════════════════════════════
-
-            self.resultado.emit(texto)
-
+            self._executor.ejecutar(self.rutas, self._emitir)
         except Exception as e:
-            self.error.emit(f"Error inesperado: {e}")
-        finally:
-            duracion = time.time() - t0
-            self.terminado.emit(duracion)
+            # Fallo del lote: reportar solo los archivos que no terminaron
+            for ruta in self.rutas:
+                if ruta not in self._terminados:
+                    self.error.emit(ruta, f"Error inesperado: {e}")
+                    self.terminado.emit(ruta, 0.0)
+
+    def _emitir(self, tipo, ruta, valor):
+        if tipo == "terminado":
+            self._terminados.add(ruta)
+        if tipo == "progreso" and self._agregador is not None:
+            self._agregador.poner(ruta, valor)
+            return
+        getattr(self, tipo).emit(ruta, valor)
+
+
+class IngestaWorker(QThread):
+    """
+    Recorre archivos y carpetas (core/ingesta.py) y entrega las rutas
+    validas de a bloques, a medida que aparecen.
+
+    Senales:
+        bloque    (list)     — rutas encontradas desde el bloque anterior
+        terminado (int, int) — encontrados, descartados por su contenido
+    """
+    bloque    = pyqtSignal(list)
+    terminado = pyqtSignal(int, int)
+
+    def __init__(self, entradas: list, recursivo: bool = True):
+        super().__init__()
+        self._busqueda = Busqueda(entradas, recursivo=recursivo)
+
+    def detener(self):
+        self._busqueda.detener()
 
+    def run(self):
+        encontrados = 0
+        for rutas in self._busqueda.bloques():
+            encontrados += len(rutas)
+            self.bloque.emit(rutas)
+        self.terminado.emit(encontrados, self._busqueda.descartados)
+
+
+class VistaWorker(QThread):
+    """
+    Un solo hilo para todas las vistas previas. pedir() reemplaza lo
+    pendiente: al recorrer la lista con las flechas solo se decodifica
+    el archivo elegido y despues sus vecinos, nunca una fila que ya se
+    dejo atras. Lo que esta en curso termina igual y se entrega (la UI
+    lo guarda en su cache).
+
+    Senales:
+        lista (object, QImage) — clave pedida, imagen reducida
+        fallo (object, str)    — clave pedida, mensaje de error
+    La clave es (ruta, ancho, alto, ...) y se devuelve tal cual.
+    """
+    lista = pyqtSignal(object, QImage)
+    fallo = pyqtSignal(object, str)
+
+    RECIENTES = 256    # vecinos ya entregados que no se vuelven a decodificar
 
-# import faltante dentro del metodo run
-import os
+    def __init__(self, cfg: dict):
+        super().__init__()
+        self.cfg        = cfg
+        self._cond      = threading.Condition()
+        self._cola      = []       # (clave, es_vecino): la elegida primero
+        self._recientes = {}       # clave -> None, en orden de entrega
+        self._detener   = False
+
+    def pedir(self, actual, vecinos=()):
+        """actual (o None si ya esta en cache) y vecinos para adelantar."""
+        with self._cond:
+            self._cola = ([(actual, False)] if actual else []) + [
+                (v, True) for v in vecinos]
+            self._cond.notify()
+
+    def detener(self):
+        with self._cond:
+            self._detener = True
+            self._cola = []
+            self._cond.notify()
+
+    def _siguiente(self):
+        with self._cond:
+            while not self._detener:
+                while self._cola:
+                    clave, vecino = self._cola.pop(0)
+                    if vecino and clave in self._recientes:
+                        continue
+                    return clave
+                self._cond.wait()
+            return None
+
+    def run(self):
+        while True:
+            clave = self._siguiente()
+            if clave is None:
+                return
+            ruta, ancho, alto = clave[:3]
+            try:
+                img = miniatura(ruta, ancho, alto, self.cfg)
+                # QImage (no QPixmap) se puede crear fuera del hilo de la UI
+                qimg = QImage(img.tobytes(), img.width, img.height,
+                              3 * img.width, QImage.Format.Format_RGB888).copy()
+                img.close()
+            except Exception as e:
+                self.fallo.emit(clave, str(e) or type(e).__name__)
+                continue
+            with self._cond:
+                self._recientes[clave] = None
+                while len(self._recientes) > self.RECIENTES:
+                    del self._recientes[next(iter(self._recientes))]
+            self.lista.emit(clave, qimg)
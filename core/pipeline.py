@@ -0,0 +1,208 @@
+# core/pipeline.py
+# Procesamiento OCR de un archivo — sin PyQt6
+# Se ejecuta en los procesos del pool (core/executor.py), por eso solo
+# se comunica mediante callbacks.
+# El motor (Tesseract, EasyOCR, sintetico) lo elige cfg["motor"]; ver
+# core/motores.py.
+
+import time
+
+from core.motores import obtener_motor
+from core.preproceso import preprocesar, pasos
+from core import huellas as hu
+
+
+class ProcesoDetenido(Exception):
+    """El usuario pidio detener el proceso."""
+
+
+def contar_paginas(ruta: str, cfg: dict) -> int:
+    return obtener_motor(cfg).abrir(ruta).n_paginas
+
+
+def sumar_etapa(registro: dict, etapa: str, segundos: float):
+    etapas = registro.setdefault("etapas", {})
+    etapas[etapa] = etapas.get(etapa, 0.0) + segundos
+
+
+def capa_min(cfg: dict) -> int:
+    """Letras o digitos que necesita una capa de texto para usarse."""
+    try:
+        return int(cfg.get("capa_texto_min", 20))
+    except (TypeError, ValueError):
+        return 20
+
+
+def capa_texto(doc, primera: int, ultima: int, cfg: dict) -> dict:
+    """
+    {pagina: texto} de las paginas que ya traen texto incrustado (PDF
+    nacidos digitales o ya pasados por OCR); esas no se rasterizan.
+    Una pagina cuenta si su capa tiene al menos capa_texto_min letras o
+    digitos: un numero de pagina sobre un escaneo no alcanza.
+    """
+    if not cfg.get("usar_capa_texto", True) or not hasattr(doc, "capa_texto"):
+        return {}
+    minimo = capa_min(cfg)
+    capas = {}
+    for n, texto in enumerate(doc.capa_texto(primera, ultima), start=primera):
+        if sum(c.isalnum() for c in texto) >= minimo:
+            capas[n] = texto.strip()
+    return capas
+
+
+def _tramos(numeros: list) -> list:
+    """[3, 4, 5, 8, 9] -> [(3, 5), (8, 9)]"""
+    tramos = []
+    for n in numeros:
+        if tramos and tramos[-1][1] == n - 1:
+            tramos[-1][1] = n
+        else:
+            tramos.append([n, n])
+    return [tuple(t) for t in tramos]
+
+
+def examinar_pagina(pag, cfg: dict, huellas=None):
+    """
+    Chequeos previos al OCR. Devuelve (origen, texto, clave):
+        ("blanca", "", None)       — casi sin tinta y sin trazos, no se reconoce
+        ("duplicada", texto, None) — igual a una pagina ya reconocida
+                                     (solo con detectar_duplicadas)
+        (None, None, clave)        — hay que reconocerla; clave es
+                                     (huella, miniatura) para guardarla
+    Las paginas sin pixeles (motor sintetico) siempre se reconocen.
+    """
+    if not hasattr(pag, "convert"):
+        return None, None, None
+    tope = hu.max_tinta(cfg)
+    if tope and hu.tinta(pag) <= tope and not hu.hay_trazos(pag):
+        return "blanca", "", None
+    if huellas is None or not cfg.get("detectar_duplicadas", False):
+        return None, None, None
+    clave = (hu.huella(pag), hu.miniatura(pag))
+    texto = huellas.buscar(*clave)
+    if texto is not None:
+        return "duplicada", texto, None
+    return None, None, clave
+
+
+def procesar_archivo(ruta: str, cfg: dict, progreso=None, detener=None,
+                     paginas=None, registro=None, huellas=None) -> str:
+    """
+    Extrae el texto de un archivo.
+
+    progreso(int) — callback opcional, porcentaje 0-100
+    detener()     — callback opcional; si devuelve True se lanza ProcesoDetenido
+    paginas       — (primera, ultima) 1-based inclusive; None = todo el archivo
+    huellas       — HuellasLote opcional: paginas repetidas reutilizan texto
+    registro      — dict opcional que se llena con tiempos en segundos:
+                    registro["etapas"]  {"apertura", "capa_texto",
+                                         "rasterizado", "huella",
+                                         "preproceso", "reconocimiento"}
+                    registro["paginas"] [{"pagina", "origen", "dpi",
+                                          "pixeles", "rasterizado",
+                                          "preproceso", "reconocimiento",
+                                          "confianza"}]
+                    origen: "ocr", "capa" (texto incrustado en el PDF),
+                    "blanca" o "duplicada" (ver examinar_pagina)
+    """
+    if registro is None:
+        registro = {}
+    t = time.perf_counter()
+    motor = obtener_motor(cfg)
+    doc   = motor.abrir(ruta)
+    primera, ultima = paginas or (1, doc.n_paginas)
+    sumar_etapa(registro, "apertura", time.perf_counter() - t)
+
+    t = time.perf_counter()
+    capas = capa_texto(doc, primera, ultima, cfg)
+    if capas:
+        sumar_etapa(registro, "capa_texto", time.perf_counter() - t)
+
+    total  = ultima - primera + 1
+    textos = {}
+    preproceso = bool(pasos(cfg))
+    for n, texto in capas.items():
+        textos[n] = texto
+        registro.setdefault("paginas", []).append({
+            "pagina": n, "origen": "capa", "dpi": None, "pixeles": 0,
+            "rasterizado": 0.0,
+            "preproceso": 0.0, "reconocimiento": 0.0, "confianza": 1.0,
+        })
+    if progreso and capas:
+        progreso(int(len(textos) / total * 100))
+
+    # Solo las paginas sin capa de texto pasan por el OCR
+    pendientes = [n for n in range(primera, ultima + 1) if n not in capas]
+    for desde, hasta in _tramos(pendientes):
+        iterador = doc.paginas(desde, hasta)
+        try:
+            for n in range(desde, hasta + 1):
+                if detener and detener():
+                    raise ProcesoDetenido("Proceso detenido por el usuario.")
+                # El rasterizado ocurre dentro del generador: se mide su next()
+                t = time.perf_counter()
+                pag = next(iterador, None)
+                t_rast = time.perf_counter() - t
+                # Rasterizar (o esperar memoria) puede tardar: se vuelve a
+                # mirar antes del OCR
+                if detener and detener():
+                    if pag is not None:
+                        pag.close()
+                    raise ProcesoDetenido("Proceso detenido por el usuario.")
+                if pag is None:
+                    break
+                dpi = getattr(pag, "info", {}).get("dpi")
+                ancho, alto = getattr(pag, "size", (0, 0))
+                t = time.perf_counter()
+                origen, texto, clave = examinar_pagina(pag, cfg, huellas)
+                t_hu = time.perf_counter() - t
+                sumar_etapa(registro, "rasterizado", t_rast)
+                if hasattr(pag, "convert"):
+                    sumar_etapa(registro, "huella", t_hu)
+                if origen:
+                    pag.close()
+                    textos[n] = texto
+                    registro.setdefault("paginas", []).append({
+                        "pagina": n, "origen": origen,
+                        "dpi": int(round(dpi[0])) if dpi else None,
+                        "pixeles": ancho * alto,
+                        "rasterizado": round(t_rast, 4), "preproceso": 0.0,
+                        "reconocimiento": 0.0, "confianza": None,
+                    })
+                    if progreso:
+                        progreso(int(len(textos) / total * 100))
+                    continue
+
+                t = time.perf_counter()
+                entrada = preprocesar(pag, cfg)
+                t_pre = time.perf_counter() - t
+                if entrada is not pag:
+                    pag.close()
+                t = time.perf_counter()
+                rec = motor.reconocer(entrada)
+                t_rec = time.perf_counter() - t
+                entrada.close()
+
+                textos[n] = rec.texto
+                if clave:
+                    huellas.guardar(*clave, rec.texto)
+                if preproceso:
+                    sumar_etapa(registro, "preproceso", t_pre)
+                sumar_etapa(registro, "reconocimiento", t_rec)
+                registro.setdefault("paginas", []).append({
+                    "pagina":         n,
+                    "origen":         "ocr",
+                    "dpi":            int(round(dpi[0])) if dpi else None,
+                    "pixeles":        ancho * alto,
+                    "rasterizado":    round(t_rast, 4),
+                    "preproceso":     round(t_pre, 4),
+                    "reconocimiento": round(t_rec, 4),
+                    "confianza":      round(rec.confianza, 3),
+                })
+                if progreso:
+                    progreso(int(len(textos) / total * 100))
+        finally:
+            # Suelta lo que el generador tenga rasterizado (y su memoria
+            # reservada) tambien al detener o ante un error
+            iterador.close()
+    return "\n\n".join(textos[n] for n in sorted(textos))
@@ -0,0 +1,130 @@
+# core/planificador.py
+# Orden de un lote por costo estimado — sin PyQt6
+# En orden de lista, un PDF de 800 paginas al final del lote deja a un
+# solo proceso trabajando mientras el resto del pool ya termino. Antes
+# de enviar nada se estima el costo de cada archivo y se ordena segun
+# cfg["orden_lote"]:
+#   largos — el mas costoso primero (LPT): el lote entero termina antes
+#   cortos — el mas barato primero (SJF): cada archivo, en promedio,
+#            tiene su resultado antes
+#   lista  — el orden en que llegaron
+#
+# El costo es paginas x area de pagina en pixeles (lo que cuesta el OCR),
+# en "paginas carta a 300 DPI", mas un fijo por archivo (abrirlo, la
+# cache, escribir la salida). Se estima sin rasterizar ni lanzar pdfinfo,
+# leyendo solo la cabecera y la cola de cada archivo (BLOQUE bytes de
+# cada punta: el orden no puede costar una pasada por todo el lote):
+#   PDF      — /N del diccionario de linealizacion o el /Count del arbol
+#              de paginas (/Type /Pages), y el primer /MediaBox, al DPI
+#              configurado; si no aparecen (objetos comprimidos, o fuera
+#              de las puntas) se cuenta por tamano, como en core/eta.py
+#   imagenes — ancho x alto y frames de la cabecera (PIL)
+
+import os
+import re
+
+from core.eta import BYTES_POR_PAGINA
+from core.resolucion import es_auto, dpi_fijo, limites
+
+ORDENES = ("largos", "cortos", "lista")
+
+PIXELES_CARTA = 2550 * 3300      # carta a 300 DPI, la unidad de costo
+COSTO_FIJO    = 0.25             # por archivo, en paginas carta
+BLOQUE        = 64 * 1024        # bytes leidos de cada punta del PDF
+
+_RE_LINEAL   = re.compile(rb"/Linearized\b[^>]{0,200}?/N\s+(\d+)")
+_RE_ARBOL    = re.compile(
+    rb"/Type\s*/Pages\b[^<>]{0,200}?/Count\s+(\d+)"
+    rb"|/Count\s+(\d+)[^<>]{0,200}?/Type\s*/Pages\b")
+_RE_PAGINA   = re.compile(rb"/Type\s*/Page(?!s)")
+_RE_MEDIABOX = re.compile(
+    rb"/MediaBox\s*\[\s*(-?[\d.]+)\s+(-?[\d.]+)\s+(-?[\d.]+)\s+(-?[\d.]+)")
+
+
+def orden_lote(cfg: dict) -> str:
+    orden = str(cfg.get("orden_lote", "largos")).strip().lower()
+    return orden if orden in ORDENES else "largos"
+
+
+def _dpi(cfg: dict) -> float:
+    if es_auto(cfg):
+        bajo, alto = limites(cfg)
+        return (bajo + alto) / 2
+    return dpi_fijo(cfg)
+
+
+def _puntas(ruta: str, tam: int) -> bytes:
+    """Cabecera y cola del archivo (el archivo entero si es chico)."""
+    with open(ruta, "rb") as f:
+        if tam <= 2 * BLOQUE:
+            return f.read()
+        cabeza = f.read(BLOQUE)
+        f.seek(tam - BLOQUE)
+        return cabeza + b"\n" + f.read(BLOQUE)
+
+
+def _medir_pdf(ruta: str, tam: int):
+    """(paginas, (ancho, alto) en puntos) o (None, None)."""
+    if not tam:
+        return None, None
+    datos = _puntas(ruta, tam)
+    m = _RE_LINEAL.search(datos)
+    if m:
+        paginas = int(m.group(1))
+    else:
+        # La raiz del arbol es el nodo /Pages con el /Count mayor
+        cuentas = [int(a or b) for a, b in _RE_ARBOL.findall(datos)]
+        paginas = max(cuentas, default=0)
+        if not paginas and tam <= 2 * BLOQUE:
+            paginas = sum(1 for _ in _RE_PAGINA.finditer(datos))
+    caja = _RE_MEDIABOX.search(datos)
+    medida = None
+    if caja:
+        x0, y0, x1, y1 = (float(v) for v in caja.groups())
+        if x1 > x0 and y1 > y0:
+            medida = (x1 - x0, y1 - y0)
+    return paginas or None, medida
+
+
+def _medir_imagen(ruta: str):
+    """(frames, pixeles por frame) de la cabecera, o (1, None) sin PIL."""
+    try:
+        from PIL import Image
+    except ImportError:
+        return 1, None
+    with Image.open(ruta) as img:
+        return getattr(img, "n_frames", 1), img.size[0] * img.size[1]
+
+
+def estimar_costo(ruta: str, cfg: dict) -> float:
+    """Costo relativo del archivo, en paginas carta a 300 DPI."""
+    try:
+        tam = os.path.getsize(ruta)
+    except OSError:
+        return COSTO_FIJO
+    dpi = _dpi(cfg)
+    pixeles = 8.5 * dpi * 11 * dpi
+    try:
+        if os.path.splitext(ruta)[1].lower() == ".pdf":
+            paginas, medida = _medir_pdf(ruta, tam)
+            if paginas is None:
+                paginas = max(1.0, tam / BYTES_POR_PAGINA)
+            if medida:
+                pixeles = medida[0] / 72 * dpi * medida[1] / 72 * dpi
+        else:
+            paginas, area = _medir_imagen(ruta)
+            pixeles = area or pixeles
+    except Exception:
+        # Ilegible o truncado: el error real lo reporta el pipeline
+        paginas = 1
+    return COSTO_FIJO + paginas * pixeles / PIXELES_CARTA
+
+
+def ordenar(rutas, cfg: dict, orden: str = None) -> list:
+    """Las rutas en el orden de cfg["orden_lote"] (estable ante empates)."""
+    rutas = list(rutas)
+    orden = orden or orden_lote(cfg)
+    if orden == "lista" or len(rutas) < 2:
+        return rutas
+    costos = {ruta: estimar_costo(ruta, cfg) for ruta in rutas}
+    return sorted(rutas, key=costos.__getitem__, reverse=(orden == "largos"))
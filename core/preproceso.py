@@ -0,0 +1,148 @@
+# core/preproceso.py
+# Preprocesado de paginas antes del OCR — sin PyQt6
+# cfg["preproceso"] es una lista de pasos separados por comas; "" lo
+# desactiva. Los pasos se aplican siempre en este orden:
+#   gris       — escala de grises (8 bits)
+#   recortar   — quita bordes negros del escaner y margenes vacios
+#   enderezar  — corrige la inclinacion (perfil de proyeccion, +-5 grados)
+#   umbral     — binarizacion adaptativa (media local via imagen integral)
+#
+# Todo se hace con operaciones vectorizadas de NumPy sobre la pagina
+# entera; no hay bucles por pixel. Las paginas que no son imagenes PIL
+# (motor sintetico) se devuelven sin tocar.
+
+PASOS = ("gris", "recortar", "enderezar", "umbral")
+
+ANGULO_MAX     = 5.0    # grados
+ANCHO_ANALISIS = 1000   # px: la inclinacion se mide sobre una copia reducida
+PUNTOS_MAX     = 30000  # pixeles de tinta que se proyectan, como maximo
+
+
+def pasos(cfg: dict) -> tuple:
+    """Pasos activos de cfg["preproceso"], en el orden de PASOS."""
+    valor = cfg.get("preproceso", "")
+    if isinstance(valor, str):
+        valor = valor.split(",")
+    pedidos = {p.strip().lower() for p in valor if p and p.strip()}
+    return tuple(p for p in PASOS if p in pedidos)
+
+
+def preprocesar(img, cfg: dict):
+    """Devuelve la pagina preprocesada (una imagen nueva) o la misma."""
+    activos = pasos(cfg)
+    if not activos or not hasattr(img, "convert"):
+        return img
+    import numpy as np
+    from PIL import Image
+
+    dpi = img.info.get("dpi")
+    gris = np.asarray(img.convert("L"), dtype=np.uint8)
+    if "recortar" in activos:
+        gris = recortar(gris)
+    if "enderezar" in activos:
+        angulo = medir_inclinacion(gris)
+        if abs(angulo) >= 0.1:
+            rotada = Image.fromarray(gris).rotate(
+                angulo, resample=Image.BILINEAR, expand=True, fillcolor=255)
+            gris = np.asarray(rotada, dtype=np.uint8)
+    if "umbral" in activos:
+        gris = umbral_adaptativo(gris)
+
+    salida = Image.fromarray(gris)
+    if dpi:
+        salida.info["dpi"] = dpi
+    return salida
+
+
+# ── Pasos ────────────────────────────────────────────────────────
+def recortar(gris, tinta: int = 128, borde: float = 0.6, margen: float = 0.02):
+    """
+    Quita las filas y columnas de los bordes que son casi todo negro
+    (sombra del escaner) y despues recorta al contenido, dejando un
+    margen del `margen` del lado mayor.
+    """
+    import numpy as np
+    oscuro = gris < tinta
+    filas, cols = oscuro.mean(axis=1), oscuro.mean(axis=0)
+
+    def interior(frac):
+        limpio = np.flatnonzero(frac < borde)
+        return (limpio[0], limpio[-1] + 1) if limpio.size else (0, frac.size)
+
+    y0, y1 = interior(filas)
+    x0, x1 = interior(cols)
+    gris, oscuro = gris[y0:y1, x0:x1], oscuro[y0:y1, x0:x1]
+
+    ys = np.flatnonzero(oscuro.any(axis=1))
+    xs = np.flatnonzero(oscuro.any(axis=0))
+    if not ys.size:
+        return gris
+    pad = int(max(gris.shape) * margen)
+    return gris[max(0, ys[0] - pad):ys[-1] + 1 + pad,
+                max(0, xs[0] - pad):xs[-1] + 1 + pad]
+
+
+def medir_inclinacion(gris, tinta: int = 128) -> float:
+    """
+    Angulo (grados) que endereza los renglones. Para cada angulo
+    candidato se proyectan los pixeles de tinta sobre el eje vertical
+    con np.bincount; los renglones alineados dan el histograma mas
+    concentrado (mayor suma de cuadrados).
+    """
+    import numpy as np
+    paso = max(1, -(-gris.shape[1] // ANCHO_ANALISIS))
+    chica = gris[::paso, ::paso]
+    ys, xs = np.nonzero(chica < tinta)
+    if ys.size < 50:
+        return 0.0
+    salto = max(1, ys.size // PUNTOS_MAX)
+    ys, xs = ys[::salto], xs[::salto]
+    ys = ys.astype(np.float64)
+    xs = xs.astype(np.float64) - chica.shape[1] / 2
+
+    def puntaje(angulos):
+        rad = np.radians(angulos)[:, None]
+        proy = np.rint(ys[None, :] * np.cos(rad) + xs[None, :] * np.sin(rad)).astype(np.int64)
+        proy -= proy.min(axis=1, keepdims=True)
+        largo = int(proy.max()) + 1
+        # Un histograma por angulo de una sola vez: desplazar cada fila
+        desplazado = proy + np.arange(len(angulos))[:, None] * largo
+        hist = np.bincount(desplazado.ravel(), minlength=largo * len(angulos))
+        return (hist.reshape(len(angulos), largo).astype(np.float64) ** 2).sum(axis=1)
+
+    gruesos = np.arange(-ANGULO_MAX, ANGULO_MAX + 0.01, 0.5)
+    mejor = gruesos[np.argmax(puntaje(gruesos))]
+    finos = np.arange(mejor - 0.5, mejor + 0.51, 0.1)
+    # PIL rota en sentido antihorario: se devuelve el angulo a aplicar
+    return float(-finos[np.argmax(puntaje(finos))])
+
+
+def umbral_adaptativo(gris, ventana: int = None, k: float = 0.15):
+    """
+    Binarizacion de Bradley: un pixel es tinta si es mas oscuro que la
+    media de su vecindario menos k. La suma de la ventana sale de sumas
+    acumuladas (primero por columnas, despues por filas), asi el costo
+    no depende del tamano de la ventana.
+    """
+    import numpy as np
+    alto, ancho = gris.shape
+    ventana = ventana or max(15, (ancho // 40) | 1)
+    r = ventana // 2
+
+    def caja(acum, n, eje):
+        # acum lleva un cero adelante: suma de [i-r, i+r] = acum[i+r+1] - acum[i-r]
+        i = np.arange(n)
+        hi, lo = np.clip(i + r + 1, 0, n), np.clip(i - r, 0, n)
+        return np.take(acum, hi, axis=eje) - np.take(acum, lo, axis=eje), hi - lo
+
+    # int32 alcanza: 255 * alto * ventana < 2**31 para cualquier pagina real
+    acum = np.zeros((alto + 1, ancho), dtype=np.int32)
+    np.cumsum(gris, axis=0, dtype=np.int32, out=acum[1:])
+    cols, n_y = caja(acum, alto, 0)
+    acum = np.zeros((alto, ancho + 1), dtype=np.int32)
+    np.cumsum(cols, axis=1, dtype=np.int32, out=acum[:, 1:])
+    suma, n_x = caja(acum, ancho, 1)
+
+    area = n_y[:, None] * n_x[None, :]
+    tinta = gris * area.astype(np.float32) < suma * np.float32(1.0 - k)
+    return np.where(tinta, np.uint8(0), np.uint8(255))
@@ -0,0 +1,33 @@
+# core/progreso.py
+# Progreso agregado entre hilos — sin PyQt6
+# Con muchos procesos reportando por pagina, una senal encolada por
+# evento inunda el hilo de la UI. En su lugar el hilo del lote deja el
+# ultimo porcentaje de cada archivo en ProgresoAcumulado (pisando el
+# anterior) y la ventana lo recoge con un temporizador a ritmo fijo:
+# por cuadro se repintan solo los archivos que cambiaron, sin importar
+# cuantos eventos llegaron en el medio.
+
+import threading
+
+
+class ProgresoAcumulado:
+    """Ultimo porcentaje por archivo; se escribe desde cualquier hilo."""
+
+    def __init__(self):
+        self._lock       = threading.Lock()
+        self._pendientes = {}    # ruta -> % aun no leido por la UI
+
+    def poner(self, ruta: str, pct: int):
+        with self._lock:
+            self._pendientes[ruta] = pct
+
+    def tomar(self) -> dict:
+        """Los cambios desde la ultima lectura (y los olvida)."""
+        with self._lock:
+            pendientes, self._pendientes = self._pendientes, {}
+        return pendientes
+
+    def descartar(self, ruta: str):
+        """Olvida un porcentaje atrasado (el archivo ya termino)."""
+        with self._lock:
+            self._pendientes.pop(ruta, None)
@@ -0,0 +1,115 @@
+# core/resolucion.py
+# DPI adaptativo por pagina — sin PyQt6
+# cfg["dpi"] puede ser un numero ("300") o "auto". En modo auto cada
+# pagina de PDF se rasteriza primero a DPI_SONDA (barato: ~1/9 de los
+# pixeles de 300 DPI), se mide la altura de los renglones y el
+# contraste, y se elige el DPI mas bajo que deja la altura x de la
+# letra en ALTURA_OBJETIVO pixeles, dentro de [dpi_min, dpi_max]:
+#   letra grande   -> 150 DPI
+#   texto normal   -> 300 DPI
+#   letra chica    -> 400 DPI
+# El costo de rasterizar y de reconocer crece con el cuadrado del DPI.
+#
+# Solo usa PIL: el perfil de filas sale de reducir la imagen a una
+# columna (cada pixel queda con el promedio de su fila).
+
+DPI_SONDA        = 100
+ALTURA_OBJETIVO  = 22     # px de altura x; Tesseract pierde precision bajo ~10
+PASO_DPI         = 50
+CONTRASTE_MINIMO = 120    # fondo - tinta en pixeles; por debajo se sube un paso
+
+
+def es_auto(cfg: dict) -> bool:
+    return str(cfg.get("dpi", "300")).strip().lower() == "auto"
+
+
+def dpi_fijo(cfg: dict) -> int:
+    """DPI de cfg["dpi"]; en modo auto, el que se usa si no hay renglones."""
+    try:
+        return int(cfg.get("dpi", 300))
+    except (TypeError, ValueError):
+        return 300
+
+
+def limites(cfg: dict) -> tuple:
+    try:
+        bajo, alto = int(cfg.get("dpi_min", 150)), int(cfg.get("dpi_max", 400))
+    except (TypeError, ValueError):
+        bajo, alto = 150, 400
+    return (min(bajo, alto), max(bajo, alto))
+
+
+def firma_dpi(cfg: dict) -> str:
+    """DPI como parte de la clave de cache ("300" o "auto:150-400")."""
+    if es_auto(cfg):
+        return "auto:%d-%d" % limites(cfg)
+    return str(cfg.get("dpi", "300"))
+
+
+def perfil_filas(img) -> list:
+    """Gris promedio (0-255) de cada fila de la imagen."""
+    from PIL import Image
+    gris = img.convert("L")
+    columna = gris.resize((1, gris.height), Image.BOX)
+    return list(columna.getdata())
+
+
+def contraste_pixeles(img) -> int:
+    """Fondo (percentil 50) menos tinta (percentil 0.5) del histograma."""
+    hist = img.convert("L").histogram()
+    total = sum(hist)
+
+    def percentil(p):
+        acum = 0
+        for valor, n in enumerate(hist):
+            acum += n
+            if acum >= total * p:
+                return valor
+        return 255
+
+    return percentil(0.5) - percentil(0.005)
+
+
+def medir_renglones(perfil: list):
+    """
+    Altura mediana de los renglones en px y contraste (fondo - tinta),
+    o (None, contraste) si la pagina no tiene renglones reconocibles.
+    Con el promedio por fila solo cuenta la franja densa del renglon:
+    la altura medida es practicamente la altura x, no la del cuerpo.
+    """
+    if not perfil:
+        return None, 0
+    orden  = sorted(perfil)
+    fondo  = orden[int(len(orden) * 0.9)]
+    tinta  = orden[0]
+    contraste = fondo - tinta
+    if contraste < 8:
+        return None, contraste
+    umbral = fondo - max(4, contraste * 0.15)
+
+    alturas, corrida = [], 0
+    for valor in perfil + [255]:
+        if valor < umbral:
+            corrida += 1
+        elif corrida:
+            if corrida >= 2:
+                alturas.append(corrida)
+            corrida = 0
+    if not alturas:
+        return None, contraste
+    alturas.sort()
+    return alturas[len(alturas) // 2], contraste
+
+
+def elegir_dpi(sonda, cfg: dict, dpi_sonda: int = DPI_SONDA) -> int:
+    """DPI para la pagina a partir de su imagen de sonda."""
+    bajo, alto = limites(cfg)
+    altura, _ = medir_renglones(perfil_filas(sonda))
+    if altura is None:
+        return max(bajo, min(alto, dpi_fijo(cfg)))
+    dpi = ALTURA_OBJETIVO * dpi_sonda / altura
+    dpi = -(-dpi // PASO_DPI) * PASO_DPI          # redondeo hacia arriba
+    # Tinta desteñida o fondo sucio: un poco mas de resolucion ayuda
+    if contraste_pixeles(sonda) < CONTRASTE_MINIMO:
+        dpi += PASO_DPI
+    return int(max(bajo, min(alto, dpi)))
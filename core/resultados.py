@@ -0,0 +1,90 @@
+# core/resultados.py
+# Resultados de la sesion en disco — sin PyQt6
+# La ventana no acumula el texto de cada archivo en un QTextEdit que
+# crece sin limite: cada resultado (o error) se guarda comprimido en un
+# SQLite temporal y el visor carga solo el documento que se mira. En
+# memoria queda una fila chica por archivo (ruta, nombre, error), asi
+# guardar el resultado 10 000 cuesta lo mismo que guardar el primero.
+# El archivo se borra al cerrar la sesion.
+
+import os
+import zlib
+import sqlite3
+import tempfile
+
+
+class ResultadosSesion:
+    """Texto extraido por archivo, en el orden en que fue llegando."""
+
+    def __init__(self, ruta: str = None):
+        if ruta is None:
+            fd, ruta = tempfile.mkstemp(prefix="localocr_resultados_",
+                                        suffix=".sqlite")
+            os.close(fd)
+        self.ruta = ruta
+        self._con = sqlite3.connect(ruta)
+        # Es un archivo de la sesion: si se corta la luz no hay que cuidarlo
+        self._con.execute("PRAGMA journal_mode=MEMORY")
+        self._con.execute("PRAGMA synchronous=OFF")
+        self._con.execute(
+            "CREATE TABLE IF NOT EXISTS resultados ("
+            " ruta TEXT PRIMARY KEY, nombre TEXT NOT NULL,"
+            " error INTEGER NOT NULL, texto BLOB NOT NULL)")
+        self._con.commit()
+
+    def guardar(self, ruta: str, nombre: str, texto: str, error: bool = False):
+        """Guarda (o reemplaza) el resultado de un archivo."""
+        comprimido = zlib.compress(texto.encode("utf-8"), 1)
+        with self._con:
+            # Un archivo reprocesado conserva su lugar en la lista
+            self._con.execute(
+                "INSERT INTO resultados VALUES (?, ?, ?, ?)"
+                " ON CONFLICT(ruta) DO UPDATE SET nombre = excluded.nombre,"
+                " error = excluded.error, texto = excluded.texto",
+                (ruta, nombre, int(error), comprimido))
+
+    def texto(self, ruta: str):
+        """(texto, error) del archivo, o None si todavia no hay resultado."""
+        fila = self._con.execute(
+            "SELECT texto, error FROM resultados WHERE ruta = ?",
+            (ruta,)).fetchone()
+        if fila is None:
+            return None
+        return zlib.decompress(fila[0]).decode("utf-8"), bool(fila[1])
+
+    def filas(self) -> list:
+        """[(ruta, nombre, error)] en orden de llegada, sin el texto."""
+        return [(r, n, bool(e)) for r, n, e in self._con.execute(
+            "SELECT ruta, nombre, error FROM resultados ORDER BY rowid")]
+
+    def iterar(self):
+        """(nombre, texto, error) de cada resultado, de a uno."""
+        for nombre, texto, error in self._con.execute(
+                "SELECT nombre, texto, error FROM resultados ORDER BY rowid"):
+            yield nombre, zlib.decompress(texto).decode("utf-8"), bool(error)
+
+    def quitar(self, ruta: str):
+        with self._con:
+            self._con.execute("DELETE FROM resultados WHERE ruta = ?", (ruta,))
+
+    def limpiar(self):
+        with self._con:
+            self._con.execute("DELETE FROM resultados")
+        self._con.execute("VACUUM")
+
+    def cerrar(self):
+        if self._con is None:
+            return
+        self._con.close()
+        self._con = None
+        try:
+            os.remove(self.ruta)
+        except OSError:
+            pass
+
+
+def formatear(nombre: str, texto: str, error: bool = False) -> str:
+    """Bloque de texto de un resultado, como se copia al portapapeles."""
+    if error:
+        return f"[ERROR] {nombre}:\n{texto}\n"
+    return f"{'─'*46}\n  {nombre}\n{'─'*46}\n{texto}\n"
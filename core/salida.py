@@ -0,0 +1,89 @@
+# core/salida.py
+# Escritura de resultados en output_dir — sin PyQt6
+# cfg["modo_salida"]:
+#   texto — <nombre>_001.txt
+#   pdf   — <nombre>_001.pdf (texto plano paginado con reportlab)
+#   ambos — los dos, con el mismo numero
+# Si una de las salidas no se puede escribir (p. ej. falta reportlab) las
+# demas se conservan y el problema vuelve como aviso; solo es error si no
+# se pudo escribir ninguna.
+
+import os
+
+from core.utils import nombre_salida
+
+
+def _extensiones(cfg: dict) -> tuple:
+    modo = cfg.get("modo_salida", "ambos")
+    if modo == "texto":
+        return (".txt",)
+    if modo == "pdf":
+        return (".pdf",)
+    return (".pdf", ".txt")
+
+
+def guardar_resultado(ruta: str, texto: str, cfg: dict) -> tuple:
+    """
+    Escribe el texto de `ruta` en output_dir.
+    Devuelve (rutas creadas, avisos de las salidas que fallaron).
+    """
+    outdir = cfg.get("output_dir", "")
+    if not outdir:
+        return [], []
+    os.makedirs(outdir, exist_ok=True)
+    exts = _extensiones(cfg)
+    base = os.path.splitext(os.path.basename(ruta))[0]
+    # nombre_salida deja los archivos creados (vacios) para reservarlos
+    stem = os.path.splitext(nombre_salida(outdir, base, exts))[0]
+
+    creadas, avisos, primer_error = [], [], None
+    # El texto primero: no depende de nada fuera de la biblioteca estandar
+    for ext in sorted(exts, key=lambda e: e != ".txt"):
+        destino = stem + ext
+        try:
+            if ext == ".txt":
+                with open(destino, "w", encoding="utf-8") as f:
+                    f.write(texto)
+            else:
+                _escribir_pdf(destino, texto)
+            creadas.append(destino)
+        except Exception as e:
+            primer_error = primer_error or e
+            avisos.append(_aviso(ext, e))
+            # No dejar la reserva vacia (o a medias) como si fuera un resultado
+            try:
+                os.remove(destino)
+            except OSError:
+                pass
+    if not creadas and primer_error is not None:
+        raise RuntimeError("; ".join(avisos)) from primer_error
+    return creadas, avisos
+
+
+def _aviso(ext: str, e: Exception) -> str:
+    if isinstance(e, ImportError) and ext == ".pdf":
+        return "PDF omitido: falta reportlab (pip install reportlab)"
+    return f"No se pudo escribir {ext}: {e}"
+
+
+def _escribir_pdf(destino: str, texto: str):
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+
+    ancho, alto = letter
+    margen, interlinea, max_chars = 54, 12, 95
+    c = canvas.Canvas(destino, pagesize=letter)
+    c.setFont("Helvetica", 10)
+    y = alto - margen
+    for linea in texto.splitlines() or [""]:
+        # Cortar lineas largas; reportlab no ajusta el texto solo
+        trozos = [linea[i:i + max_chars]
+                  for i in range(0, len(linea), max_chars)] or [""]
+        for trozo in trozos:
+            if y < margen:
+                c.showPage()
+                c.setFont("Helvetica", 10)
+                y = alto - margen
+            c.drawString(margen, y, trozo)
+            y -= interlinea
+    c.save()
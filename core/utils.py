@@ -3,14 +3,18 @@
 # Separacion estricta: este modulo no sabe nada de PyQt6
 
 import os
+import re
 import json
 import shutil
+import threading
 
 # ── Rutas base ────────────────────────────────────────────────────
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 CONFIG_PATH  = os.path.join(os.path.expanduser("~"), ".localocr_config.json")
 DEFAULT_PATH = os.path.join(BASE_DIR, "assets", "config_default.json")
+TIEMPOS_PATH = os.path.join(os.path.expanduser("~"), ".localocr_tiempos.jsonl")
+TIEMPOS_MAX  = 8 * 1024 * 1024   # al pasarlo el log se rota a TIEMPOS_PATH.1
 
 # ── Carpeta Descargas real ────────────────────────────────────────
 def get_downloads_dir() -> str:
@@ -72,8 +76,31 @@ def load_defaults() -> dict:
             "poppler_path":   r"C:\Program Files\ChuyOCR\poppler-25.12.0\Library\bin",
             "lang":           "spa+eng",
             "dpi":            "300",
+            "dpi_min":        150,
+            "dpi_max":        400,
             "modo_salida":    "ambos", # Cambiado a minúscula para coincidir con el combo
             "abrir_carpeta":  True,
+            "workers":        "auto",
+            "motor":          "tesseract",
+            "paginas_por_bloque": 10,
+            "orden_lote":     "largos",
+            "ventana_paginas": 2,
+            "memoria_max_mb": 2048,
+            "cache_activa":   True,
+            "cache_max_mb":   512,
+            "vista_cache_mb": 64,
+            "sintetico_ms":   50,
+            "log_tiempos":    True,
+            "plazo_detener_s": 3,
+            "usar_capa_texto": True,
+            "capa_texto_min": 20,
+            "preproceso":     "",
+            "detectar_blancas":    True,
+            "blanco_max_tinta":    0.0001,
+            "detectar_duplicadas": False,
+            "duplicado_max_dif":   0.0,
+            "vigilar_quieto_s":    2,
+            "vigilar_intervalo_s": 1,
         }   
 
 
@@ -87,18 +114,116 @@ def reset_to_defaults() -> dict:
     return defaults
 
 
+# ── Log de tiempos ───────────────────────────────────────────────
+def abrir_log_tiempos():
+    """
+    Abre TIEMPOS_PATH para agregar lineas. Si ya paso TIEMPOS_MAX se
+    renombra a .1 (pisando el anterior): el log nunca ocupa mas de dos
+    veces el tope.
+    """
+    try:
+        if os.path.getsize(TIEMPOS_PATH) >= TIEMPOS_MAX:
+            os.replace(TIEMPOS_PATH, TIEMPOS_PATH + ".1")
+    except OSError:
+        pass
+    return open(TIEMPOS_PATH, "a", encoding="utf-8")
+
+
 # ── Helpers ──────────────────────────────────────────────────────
-EXTENSIONES_VALIDAS = {".pdf", ".png", ".jpg", ".jpeg", ".tiff", ".bmp"}
+EXTENSIONES_VALIDAS = {".pdf", ".png", ".jpg", ".jpeg", ".tiff", ".tif", ".bmp"}
 
-def es_archivo_valido(ruta: str) -> bool:
-    return os.path.splitext(ruta)[1].lower() in EXTENSIONES_VALIDAS
+# Firmas de los primeros bytes: una extension valida no alcanza si el
+# contenido es otra cosa (descargas cortadas, archivos renombrados)
+_FIRMAS_IMAGEN = (b"\x89PNG\r\n\x1a\n", b"\xff\xd8\xff", b"II*\x00", b"MM\x00*", b"BM")
 
 
-def nombre_salida(outdir: str, base: str) -> str:
-    """Genera ruta _001, _002... sin sobreescribir."""
-    n = 1
-    while True:
-        path = os.path.join(outdir, f"{base}_{n:03d}.pdf")
-        if not os.path.exists(path):
-            return path
-        n += 1
+def tipo_contenido(ruta: str):
+    """"pdf", "imagen" o None segun los primeros bytes del archivo."""
+    try:
+        with open(ruta, "rb") as f:
+            cabecera = f.read(1024)
+    except OSError:
+        return None
+    # El estandar admite basura antes de %PDF- dentro del primer KB
+    if b"%PDF-" in cabecera:
+        return "pdf"
+    if cabecera.startswith(_FIRMAS_IMAGEN):
+        return "imagen"
+    return None
+
+
+def es_archivo_valido(ruta: str, revisar_contenido: bool = False) -> bool:
+    """
+    Extension admitida y, con revisar_contenido, contenido que coincide
+    con ella (un PDF para .pdf, alguna imagen para las demas).
+    """
+    ext = os.path.splitext(ruta)[1].lower()
+    if ext not in EXTENSIONES_VALIDAS:
+        return False
+    if not revisar_contenido:
+        return True
+    return tipo_contenido(ruta) == ("pdf" if ext == ".pdf" else "imagen")
+
+
+# Indice de sufijos ya usados por carpeta de salida: se arma con un solo
+# recorrido de la carpeta y despues cada nombre nuevo es O(1). La reserva
+# con O_EXCL cubre lo que el indice no ve (otros procesos o instancias).
+_sufijos       = {}    # carpeta -> {base: mayor sufijo visto}
+_sufijos_lock  = threading.Lock()
+_RE_SUFIJO     = re.compile(r"^(.*)_(\d{3,})$")
+
+
+def _indice_sufijos(outdir: str) -> dict:
+    clave = os.path.normcase(os.path.abspath(outdir))
+    indice = _sufijos.get(clave)
+    if indice is None:
+        indice = _sufijos[clave] = {}
+        try:
+            with os.scandir(outdir) as it:
+                for entrada in it:
+                    m = _RE_SUFIJO.match(os.path.splitext(entrada.name)[0])
+                    if m:
+                        b = os.path.normcase(m.group(1))
+                        indice[b] = max(indice.get(b, 0), int(m.group(2)))
+        except OSError:
+            pass
+    return indice
+
+
+def _reservar(ruta: str) -> bool:
+    try:
+        os.close(os.open(ruta, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666))
+        return True
+    except FileExistsError:
+        return False
+
+
+def nombre_salida(outdir: str, base: str, exts=(".pdf",)) -> str:
+    """
+    Genera ruta _001, _002... sin sobreescribir.
+    Devuelve la ruta con exts[0]; el mismo nombre queda reservado para
+    todas las extensiones de exts (p. ej. PDF + TXT del mismo archivo):
+    se crean vacios y de forma atomica, asi dos escritores en paralelo
+    nunca reciben el mismo nombre. Quien lo pide debe escribirlos.
+    """
+    with _sufijos_lock:
+        indice = _indice_sufijos(outdir)
+        clave  = os.path.normcase(base)
+        n = indice.get(clave, 0) + 1
+        while True:
+            stem = os.path.join(outdir, f"{base}_{n:03d}")
+            hechos = []
+            for e in exts:
+                if not _reservar(stem + e):
+                    break
+                hechos.append(stem + e)
+            else:
+                indice[clave] = n
+                return stem + exts[0]
+            # Alguien mas lo tomo: soltar lo reservado y seguir
+            for ruta in hechos:
+                try:
+                    os.remove(ruta)
+                except OSError:
+                    pass
+            n += 1
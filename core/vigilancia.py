@@ -0,0 +1,246 @@
+# core/vigilancia.py
+# Carpeta vigilada — sin PyQt6
+# Para correr desatendido: los archivos que caen en la carpeta se pasan
+# al BatchExecutor (lote abierto, pool siempre caliente) y, ya
+# procesados, se mueven a procesados/ o errores/ dentro de la misma
+# carpeta, asi nunca se vuelven a ver.
+#
+# Como se entera de los archivos nuevos:
+#   inotify   — Linux, via ctypes (IN_CLOSE_WRITE, IN_MOVED_TO); el
+#               kernel avisa al instante y no se lista nada
+#   sondeo    — el resto: cada vigilar_intervalo_s se mira el mtime de
+#               la carpeta y solo si cambio se lista de nuevo
+# Un archivo se entrega cuando su tamano y mtime no cambian durante
+# vigilar_quieto_s (un escaner o una copia por red pueden escribir en
+# varias tandas) y su contenido coincide con la extension. Solo se
+# vigila la carpeta, no sus subcarpetas.
+#
+# Si un archivo no se puede mover (permisos, carpeta de solo lectura)
+# se avisa y queda anotado como ya manejado: el sondeo lo seguiria
+# viendo y lo procesaria sin fin. Si vuelve a llegar con otro
+# contenido se procesa de nuevo.
+
+import os
+import queue
+import select
+import shutil
+import struct
+import threading
+import time
+
+from core.utils import es_archivo_valido, nombre_salida
+
+PROCESADOS = "procesados"
+ERRORES    = "errores"
+
+# inotify(7)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO    = 0x00000080
+IN_Q_OVERFLOW  = 0x00004000
+_EVENTO        = struct.Struct("iIII")
+
+
+def _segundos(cfg: dict, clave: str, defecto: float) -> float:
+    try:
+        return max(0.0, float(cfg.get(clave, defecto)))
+    except (TypeError, ValueError):
+        return defecto
+
+
+def _abrir_inotify(carpeta: str):
+    """Descriptor de inotify sobre la carpeta, o None si no hay inotify."""
+    try:
+        import ctypes
+        import ctypes.util
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6",
+                           use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            return None
+        if libc.inotify_add_watch(fd, os.fsencode(carpeta),
+                                  IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+            os.close(fd)
+            return None
+        return fd
+    except (OSError, AttributeError):
+        return None
+
+
+class Vigilante:
+    """
+    Vigila `carpeta` en un hilo y deja en `cola` (queue.Queue) cada
+    archivo nuevo ya completo. retirar() lo mueve al terminar.
+    avisar(str), opcional, recibe los archivos que no se pudieron mover.
+    """
+
+    def __init__(self, carpeta: str, cfg: dict, cola=None, avisar=None):
+        self.carpeta   = os.path.abspath(carpeta)
+        self.cola      = cola if cola is not None else queue.Queue()
+        self.quieto    = _segundos(cfg, "vigilar_quieto_s", 2.0)
+        self.intervalo = max(0.1, _segundos(cfg, "vigilar_intervalo_s", 1.0))
+        self.modo      = None          # "inotify" o "sondeo", al arrancar
+        self.avisar    = avisar
+        self._candidatos = {}          # ruta -> (tamano, mtime, desde)
+        self._entregadas = set()       # rutas en la cola o en proceso
+        self._fallidas   = {}          # sin poder mover -> (tamano, mtime)
+        self._listado    = set()       # nombres vistos en el ultimo listado
+        self._mtime_dir  = None
+        self._lock       = threading.Lock()
+        self._parar      = threading.Event()
+        self._hilo       = None
+        self._fd         = None
+
+    # ── Ciclo ────────────────────────────────────────────────────
+    def iniciar(self):
+        self._fd = _abrir_inotify(self.carpeta)
+        self.modo = "inotify" if self._fd is not None else "sondeo"
+        self._hilo = threading.Thread(target=self._correr, daemon=True,
+                                      name="vigilante")
+        self._hilo.start()
+
+    def detener(self):
+        self._parar.set()
+        if self._hilo is not None:
+            self._hilo.join(timeout=5)
+
+    def _correr(self):
+        fd = self._fd
+        # Lo que ya estaba al arrancar tambien se procesa
+        self._listar()
+        try:
+            while not self._parar.is_set():
+                espera = min(self.intervalo, 0.25) if self._candidatos else self.intervalo
+                if fd is not None:
+                    self._leer_inotify(fd, espera)
+                else:
+                    self._parar.wait(espera)
+                    self._sondear()
+                self._revisar_candidatos()
+        finally:
+            if fd is not None:
+                os.close(fd)
+
+    # ── Descubrir ────────────────────────────────────────────────
+    def _leer_inotify(self, fd: int, espera: float):
+        listos, _, _ = select.select([fd], [], [], espera)
+        if not listos:
+            return
+        try:
+            datos = os.read(fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        pos = 0
+        while pos + _EVENTO.size <= len(datos):
+            _wd, mascara, _cookie, largo = _EVENTO.unpack_from(datos, pos)
+            nombre = datos[pos + _EVENTO.size:pos + _EVENTO.size + largo]
+            pos += _EVENTO.size + largo
+            if mascara & IN_Q_OVERFLOW:
+                # Se perdieron eventos: un listado pone todo al dia
+                self._listar()
+            elif nombre:
+                self._anotar(os.path.join(self.carpeta,
+                                          os.fsdecode(nombre.rstrip(b"\0"))))
+
+    def _sondear(self):
+        try:
+            mtime = os.stat(self.carpeta).st_mtime_ns
+        except OSError:
+            return
+        if mtime != self._mtime_dir:
+            self._listar()
+
+    def _listar(self):
+        try:
+            self._mtime_dir = os.stat(self.carpeta).st_mtime_ns
+            with os.scandir(self.carpeta) as it:
+                nombres = {e.name for e in it if e.is_file()}
+        except OSError:
+            return
+        with self._lock:
+            nuevos = sorted(nombres - self._listado)
+            self._listado = nombres
+        for nombre in nuevos:
+            self._anotar(os.path.join(self.carpeta, nombre))
+
+    def _anotar(self, ruta: str):
+        if not es_archivo_valido(ruta):
+            return
+        with self._lock:
+            if ruta in self._entregadas or self._sin_cambios(ruta):
+                return
+        # Desde ya cuenta el tiempo quieto; un cambio lo reinicia
+        self._candidatos.setdefault(ruta, (-1, -1, time.monotonic()))
+
+    # ── Entregar ─────────────────────────────────────────────────
+    def _revisar_candidatos(self):
+        ahora = time.monotonic()
+        for ruta, (tam, mtime, desde) in list(self._candidatos.items()):
+            try:
+                st = os.stat(ruta)
+            except OSError:
+                del self._candidatos[ruta]       # ya no esta
+                continue
+            if (st.st_size, st.st_mtime_ns) != (tam, mtime):
+                self._candidatos[ruta] = (st.st_size, st.st_mtime_ns, ahora)
+                continue
+            if ahora - desde < self.quieto:
+                continue
+            del self._candidatos[ruta]
+            if not es_archivo_valido(ruta, revisar_contenido=True):
+                self._apartar(ruta, ERRORES)
+                continue
+            with self._lock:
+                self._entregadas.add(ruta)
+            self.cola.put(ruta)
+
+    def retirar(self, ruta: str, ok: bool = True):
+        """Mueve un archivo ya procesado a procesados/ (o errores/)."""
+        self._apartar(ruta, PROCESADOS if ok else ERRORES)
+        with self._lock:
+            self._entregadas.discard(ruta)
+            # Otro archivo con el mismo nombre es nuevo aunque el sondeo
+            # no haya listado la carpeta entre medio
+            self._listado.discard(os.path.basename(ruta))
+
+    def _sin_cambios(self, ruta: str) -> bool:
+        """True si `ruta` no se pudo mover y sigue igual (con el lock tomado)."""
+        firma = self._fallidas.get(ruta)
+        if firma is None:
+            return False
+        try:
+            st = os.stat(ruta)
+        except OSError:
+            del self._fallidas[ruta]
+            return False
+        if (st.st_size, st.st_mtime_ns) == firma:
+            return True
+        del self._fallidas[ruta]
+        return False
+
+    def _apartar(self, ruta: str, subcarpeta: str):
+        destino = os.path.join(self.carpeta, subcarpeta)
+        final = None
+        try:
+            os.makedirs(destino, exist_ok=True)
+            base, ext = os.path.splitext(os.path.basename(ruta))
+            # Reserva un nombre libre (base_001.ext, ...) y lo ocupa
+            final = nombre_salida(destino, base, (ext,))
+            try:
+                os.replace(ruta, final)
+            except OSError:
+                shutil.move(ruta, final)     # otra unidad
+        except OSError as e:
+            try:
+                st = os.stat(ruta)
+            except OSError:
+                return                       # ya no esta: nada que recordar
+            if final:
+                try:
+                    os.remove(final)         # la reserva (el original sigue)
+                except OSError:
+                    pass
+            with self._lock:
+                self._fallidas[ruta] = (st.st_size, st.st_mtime_ns)
+            if self.avisar:
+                self.avisar(f"no se pudo mover a {subcarpeta}/ ({e}); "
+                            f"no se vuelve a procesar mientras no cambie: {ruta}")
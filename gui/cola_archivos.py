@@ -0,0 +1,280 @@
+# gui/cola_archivos.py
+# Cola de archivos como modelo de Qt
+# Los datos van en columnas paralelas (una lista por campo y un
+# bytearray para las marcas) en lugar de un QTreeWidgetItem por archivo:
+# la vista solo pide las filas que pinta, y agregar, marcar todos,
+# quitar marcados y filtrar recorren las columnas una sola vez.
+#   columna 0 — nombre del archivo, con casilla; la ruta va en UserRole
+#   columna 1 — estado, con color de fondo
+
+import os
+
+from PyQt6.QtGui import QBrush, QColor
+from PyQt6.QtCore import (
+    Qt, QAbstractTableModel, QAbstractProxyModel, QModelIndex
+)
+
+ROL_RUTA = Qt.ItemDataRole.UserRole
+
+_BROCHAS = {}    # color -> QBrush, compartidas por todas las filas
+
+
+def _brocha(color: str) -> QBrush:
+    brocha = _BROCHAS.get(color)
+    if brocha is None:
+        brocha = _BROCHAS[color] = QBrush(QColor(color))
+    return brocha
+
+
+class ModeloCola(QAbstractTableModel):
+    """Archivos de la cola: ruta, estado, color del estado y marca."""
+
+    CABECERAS = ("Archivo", "Estado")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rutas    = []
+        self._nombres  = []
+        self._estados  = []
+        self._colores  = []          # color del estado o None
+        self._marcas   = bytearray() # 1 = marcado
+        self._tooltips = {}          # ruta -> desglose de tiempos
+        self._indice   = {}          # ruta -> fila
+
+    # ── Interfaz de Qt ───────────────────────────────────────────
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rutas)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.CABECERAS)
+
+    def headerData(self, seccion, orientacion, role=Qt.ItemDataRole.DisplayRole):
+        if (orientacion == Qt.Orientation.Horizontal
+                and role == Qt.ItemDataRole.DisplayRole):
+            return self.CABECERAS[seccion]
+        return None
+
+    def flags(self, index):
+        base = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+        if index.column() == 0:
+            base |= Qt.ItemFlag.ItemIsUserCheckable
+        return base
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        fila, col = index.row(), index.column()
+        if role == ROL_RUTA:
+            return self._rutas[fila]
+        if col == 0:
+            if role == Qt.ItemDataRole.DisplayRole:
+                return self._nombres[fila]
+            if role == Qt.ItemDataRole.CheckStateRole:
+                return (Qt.CheckState.Checked if self._marcas[fila]
+                        else Qt.CheckState.Unchecked)
+            if role == Qt.ItemDataRole.ToolTipRole:
+                return self._rutas[fila]
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._estados[fila]
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return self._tooltips.get(self._rutas[fila])
+        color = self._colores[fila]
+        if color is not None:
+            if role == Qt.ItemDataRole.BackgroundRole:
+                return _brocha(color)
+            if role == Qt.ItemDataRole.ForegroundRole:
+                return _brocha("white")
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if index.column() != 0 or role != Qt.ItemDataRole.CheckStateRole:
+            return False
+        self._marcas[index.row()] = (
+            Qt.CheckState(value) == Qt.CheckState.Checked)
+        self.dataChanged.emit(index, index, [role])
+        return True
+
+    # ── Cola ─────────────────────────────────────────────────────
+    def __len__(self):
+        return len(self._rutas)
+
+    def contiene(self, ruta) -> bool:
+        return ruta in self._indice
+
+    def agregar(self, rutas, marcado: bool = True) -> list:
+        """Agrega al final las rutas que no estan; devuelve las agregadas."""
+        nuevas, vistas = [], set()
+        for ruta in rutas:
+            if ruta not in self._indice and ruta not in vistas:
+                vistas.add(ruta)
+                nuevas.append(ruta)
+        if not nuevas:
+            return nuevas
+        inicio = len(self._rutas)
+        self.beginInsertRows(QModelIndex(), inicio, inicio + len(nuevas) - 1)
+        self._rutas.extend(nuevas)
+        self._nombres.extend(os.path.basename(r) for r in nuevas)
+        self._estados.extend(["Pendiente"] * len(nuevas))
+        self._colores.extend([None] * len(nuevas))
+        self._marcas.extend(bytes([int(marcado)]) * len(nuevas))
+        for i, ruta in enumerate(nuevas, start=inicio):
+            self._indice[ruta] = i
+        self.endInsertRows()
+        return nuevas
+
+    def marcar_todos(self, marcado: bool):
+        if not self._rutas:
+            return
+        self._marcas[:] = bytes([int(marcado)]) * len(self._marcas)
+        self.dataChanged.emit(self.index(0, 0), self.index(len(self._rutas) - 1, 0),
+                              [Qt.ItemDataRole.CheckStateRole])
+
+    def marcar(self, ruta, marcado: bool):
+        fila = self._indice.get(ruta)
+        if fila is not None:
+            self.setData(self.index(fila, 0),
+                         Qt.CheckState.Checked if marcado else Qt.CheckState.Unchecked,
+                         Qt.ItemDataRole.CheckStateRole)
+
+    def marcadas(self) -> list:
+        return [r for r, m in zip(self._rutas, self._marcas) if m]
+
+    def quitar_marcadas(self) -> int:
+        """Quita las filas marcadas de una vez; devuelve cuantas."""
+        quedan = [i for i, m in enumerate(self._marcas) if not m]
+        quitadas = len(self._rutas) - len(quedan)
+        if not quitadas:
+            return 0
+        self.beginResetModel()
+        for ruta, m in zip(self._rutas, self._marcas):
+            if m:
+                self._tooltips.pop(ruta, None)
+        self._rutas   = [self._rutas[i] for i in quedan]
+        self._nombres = [self._nombres[i] for i in quedan]
+        self._estados = [self._estados[i] for i in quedan]
+        self._colores = [self._colores[i] for i in quedan]
+        self._marcas  = bytearray(len(quedan))
+        self._indice  = {r: i for i, r in enumerate(self._rutas)}
+        self.endResetModel()
+        return quitadas
+
+    def vaciar(self):
+        self.beginResetModel()
+        self._rutas, self._nombres, self._estados, self._colores = [], [], [], []
+        self._marcas = bytearray()
+        self._tooltips.clear()
+        self._indice.clear()
+        self.endResetModel()
+
+    # ── Estado por archivo ───────────────────────────────────────
+    def estado(self, ruta) -> str:
+        fila = self._indice.get(ruta)
+        return self._estados[fila] if fila is not None else ""
+
+    def poner_estado(self, ruta, texto: str, color: str = None):
+        fila = self._indice.get(ruta)
+        if fila is None or (self._estados[fila] == texto
+                            and self._colores[fila] == color):
+            return
+        self._estados[fila] = texto
+        self._colores[fila] = color
+        idx = self.index(fila, 1)
+        self.dataChanged.emit(idx, idx)
+
+    def poner_tooltip(self, ruta, texto: str):
+        if ruta in self._indice:
+            self._tooltips[ruta] = texto
+
+
+class FiltroCola(QAbstractProxyModel):
+    """
+    Filtra la cola por nombre (sin distinguir mayusculas). Las filas que
+    pasan se calculan de una vez sobre la columna de nombres; sin filtro
+    el mapeo es la identidad y no se guarda nada.
+    """
+
+    def __init__(self, modelo, parent=None):
+        super().__init__(parent)
+        self._texto   = ""
+        self._filas   = None    # fila del filtro -> fila de la cola
+        self._inverso = None    # fila de la cola -> fila del filtro
+        self.setSourceModel(modelo)
+        modelo.modelReset.connect(self._recalcular)
+        modelo.rowsInserted.connect(self._on_insertadas)
+        modelo.dataChanged.connect(self._on_cambio)
+
+    def setFilterFixedString(self, texto: str):
+        self._texto = texto.strip().lower()
+        self._recalcular()
+
+    def _acepta(self, nombre: str) -> bool:
+        return self._texto in nombre.lower()
+
+    def _recalcular(self):
+        self.beginResetModel()
+        if self._texto:
+            nombres = self.sourceModel()._nombres
+            self._filas = [i for i, n in enumerate(nombres) if self._acepta(n)]
+            self._inverso = {f: i for i, f in enumerate(self._filas)}
+        else:
+            self._filas = self._inverso = None
+        self.endResetModel()
+
+    def _on_insertadas(self, _parent, primera, ultima):
+        if self._filas is None:
+            self.beginInsertRows(QModelIndex(), primera, ultima)
+            self.endInsertRows()
+            return
+        nombres = self.sourceModel()._nombres
+        nuevas = [f for f in range(primera, ultima + 1) if self._acepta(nombres[f])]
+        if not nuevas:
+            return
+        inicio = len(self._filas)
+        self.beginInsertRows(QModelIndex(), inicio, inicio + len(nuevas) - 1)
+        for i, f in enumerate(nuevas, start=inicio):
+            self._filas.append(f)
+            self._inverso[f] = i
+        self.endInsertRows()
+
+    def _on_cambio(self, arriba, abajo, roles=()):
+        if arriba.row() == abajo.row():
+            idx = self.mapFromSource(arriba)
+            if idx.isValid():
+                self.dataChanged.emit(idx, self.index(idx.row(), abajo.column()), roles)
+        elif self.rowCount():
+            # Cambio masivo (marcar todos): se avisa por todo el filtro
+            self.dataChanged.emit(self.index(0, arriba.column()),
+                                  self.index(self.rowCount() - 1, abajo.column()),
+                                  roles)
+
+    # ── Interfaz de Qt ───────────────────────────────────────────
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._filas) if self._filas is not None else len(self.sourceModel())
+
+    def columnCount(self, parent=QModelIndex()):
+        return self.sourceModel().columnCount()
+
+    def index(self, fila, col, parent=QModelIndex()):
+        if parent.isValid() or not (0 <= fila < self.rowCount()):
+            return QModelIndex()
+        return self.createIndex(fila, col)
+
+    def parent(self, _index=None):
+        return QModelIndex()
+
+    def mapToSource(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        fila = self._filas[index.row()] if self._filas is not None else index.row()
+        return self.sourceModel().index(fila, index.column())
+
+    def mapFromSource(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        if self._filas is None:
+            return self.index(index.row(), index.column())
+        fila = self._inverso.get(index.row())
+        return self.index(fila, index.column()) if fila is not None else QModelIndex()
@@ -74,6 +74,12 @@ class ConfigDialog(QDialog):
         self._combo_salida.setCurrentText(self._cfg.get("modo_salida", "ambos"))
         form.addRow("Modo de Salida:", self._combo_salida)
 
+        # ── Motor OCR ──
+        self._combo_motor = QComboBox()
+        self._combo_motor.addItems(["tesseract", "easyocr", "sintetico"])
+        self._combo_motor.setCurrentText(self._cfg.get("motor", "tesseract"))
+        form.addRow("Motor OCR:", self._combo_motor)
+
         # ── Idioma OCR ──
         self._combo_lang = QComboBox()
         self._combo_lang.addItems(["spa+eng", "spa", "eng"])
@@ -82,10 +88,32 @@ class ConfigDialog(QDialog):
 
         # ── DPI ──
         self._combo_dpi = QComboBox()
-        self._combo_dpi.addItems(["150", "200", "300", "400", "600"])
+        self._combo_dpi.addItems(["auto", "150", "200", "300", "400", "600"])
         self._combo_dpi.setCurrentText(self._cfg.get("dpi", "300"))
+        self._combo_dpi.setToolTip(
+            "auto: cada página se sondea a baja resolución y se usa\n"
+            "el DPI más bajo que conserva la precisión (150–400).")
         form.addRow("DPI (PDF→imagen):", self._combo_dpi)
 
+        # ── Procesos en paralelo ──
+        self._combo_workers = QComboBox()
+        self._combo_workers.addItems(["auto", "1", "2", "4", "8", "16", "32"])
+        self._combo_workers.setEditable(True)
+        self._combo_workers.setCurrentText(str(self._cfg.get("workers", "auto")))
+        self._combo_workers.setToolTip(
+            "Archivos procesados a la vez (auto = uno por núcleo)")
+        form.addRow("Procesos paralelos:", self._combo_workers)
+
+        # ── Orden del lote ──
+        self._combo_orden = QComboBox()
+        self._combo_orden.addItems(["largos", "cortos", "lista"])
+        self._combo_orden.setCurrentText(self._cfg.get("orden_lote", "largos"))
+        self._combo_orden.setToolTip(
+            "largos: los archivos más costosos primero; el lote termina antes.\n"
+            "cortos: los más baratos primero; cada resultado llega antes.\n"
+            "lista: en el orden de la lista.")
+        form.addRow("Orden del lote:", self._combo_orden)
+
         # ── CORRECCIÓN 5: Switch Verde/Rojo visualmente claro ────
         self._btn_switch = QPushButton()
         self._btn_switch.setFixedWidth(90)
@@ -178,9 +206,12 @@ class ConfigDialog(QDialog):
             "output_dir":     self._inp_out.text(),
             "tema":           self._combo_tema.currentText(),
             "modo_salida":    self._combo_salida.currentText(),
+            "motor":          self._combo_motor.currentText(),
             "lang":           self._combo_lang.currentText(),
             "dpi":            self._combo_dpi.currentText(),
             "abrir_carpeta":  self._abrir_estado,
+            "workers":        self._combo_workers.currentText(),
+            "orden_lote":     self._combo_orden.currentText(),
         }
 
     def _aplicar_a_campos(self, d: dict):
@@ -191,15 +222,19 @@ class ConfigDialog(QDialog):
         if idx >= 0:
             self._combo_tema.setCurrentIndex(idx)
         self._combo_salida.setCurrentText(d.get("modo_salida", "ambos"))
+        self._combo_motor.setCurrentText(d.get("motor", "tesseract"))
         self._combo_lang.setCurrentText(d.get("lang", "spa+eng"))
         self._combo_dpi.setCurrentText(d.get("dpi", "300"))
+        self._combo_workers.setCurrentText(str(d.get("workers", "auto")))
+        self._combo_orden.setCurrentText(d.get("orden_lote", "largos"))
         self._abrir_estado = bool(d.get("abrir_carpeta", True))
         self._actualizar_switch()
 
     # ── Guardar ──────────────────────────────────────────────────
     def _guardar(self):
         tema_ant      = self._cfg.get("tema", "Oscuro")
-        nueva_cfg     = self._leer_campos()
+        # Conservar claves que este diálogo no edita
+        nueva_cfg     = {**self._cfg, **self._leer_campos()}
         self._cfg     = nueva_cfg
         save_config(nueva_cfg)
         self.config_guardada.emit(nueva_cfg)
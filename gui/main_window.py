@@ -1,6 +1,6 @@
 # gui/main_window.py  — Fase 1 finalizada
 # Correcciones aplicadas:
-#   1. QTreeWidget/QHeaderView forzados con colores del tema (sin fondo blanco)
+#   1. Vista de la cola/QHeaderView forzados con colores del tema (sin fondo blanco)
 #   2. Botones Marcar/Desmarcar/Quitar en Toolbar Y menú Editar
 #   3. Checkboxes: solo procesa marcados, todos marcados al añadir
 #   4. Estado "Detenido" en naranja; "Cancelado" en gris para los que no llegaron
@@ -9,24 +9,32 @@
 import os, time
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QSplitter, QLabel,
-    QTextEdit, QProgressBar, QFileDialog, QMessageBox,
-    QToolBar, QTreeWidget, QTreeWidgetItem, QHeaderView, QPushButton
+    QProgressBar, QFileDialog, QMessageBox, QLineEdit,
+    QToolBar, QTableView, QHeaderView, QPushButton, QAbstractItemView
 )
 from PyQt6.QtGui import (
-    QAction, QFont, QIcon, QPainter, QColor, QPen, QBrush,
+    QAction, QFont, QIcon,
     QDragEnterEvent, QDropEvent
 )
 from PyQt6.QtCore import Qt, QSize, QTimer, QSettings
 
-from core.ocr_engine import OCRWorker
+from core.ocr_engine import LoteWorker, IngestaWorker
+from core.diario import DiarioLote, lote_interrumpido, descartar, HECHO
+from core.progreso import ProgresoAcumulado
+from core.eta import EstimadorLote
 from core.utils import load_config
 from assets.themes.themes import get_theme
 from gui.config_dialog import ConfigDialog
 from gui.theme_editor import ThemeEditor, cargar_custom_themes
 from gui.icons import icono
+from gui.visor_resultados import VisorResultados
+from gui.cola_archivos import ModeloCola, FiltroCola, ROL_RUTA
+from gui.vista_previa import VistaPrevia
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
+CUADROS_POR_S = 20    # refrescos de progreso por segundo durante un lote
+
 
 def cargar_icono():
     for nombre in ("LocalOCR.ico", "LocalOCR.png", "icon.ico", "icon.png"):
@@ -68,85 +76,30 @@ PALETAS = {
 }
 
 
-class PreviewPlaceholder(QWidget):
-    """
-    Visor de documentos.
-    Fase 1: placeholder con flecha upload dibujada con QPainter.
-    Fase 2: reemplazar paintEvent por carga real de PDF/imagen.
-    """
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setMinimumHeight(220)
-        self._acento = "#3c7bd4"
-        self._archivo = None  # ruta del archivo seleccionado
-
-    def set_acento(self, color: str):
-        self._acento = color
-        self.update()
-
-    def set_archivo(self, ruta):
-        self._archivo = ruta
-        self.update()
-
-    def paintEvent(self, event):
-        p = QPainter(self)
-        p.setRenderHint(QPainter.RenderHint.Antialiasing)
-        w, h = self.width(), self.height()
-
-        # Marco punteado
-        p.setPen(QPen(QColor(self._acento), 1.5, Qt.PenStyle.DashLine))
-        p.drawRoundedRect(6, 6, w - 12, h - 12, 10, 10)
-
-        if self._archivo:
-            # Fase 1: solo muestra nombre del archivo seleccionado
-            p.setFont(QFont("Segoe UI", 9))
-            p.setPen(QColor(self._acento))
-            nombre = os.path.basename(self._archivo)
-            p.drawText(10, 0, w - 20, h,
-                       Qt.AlignmentFlag.AlignCenter,
-                       f"Vista previa:\n{nombre}\n\n[ Disponible en Fase 2 ]")
-        else:
-            # Flecha upload
-            cx, cy = w // 2, h // 2 - 16
-            ah, aw, sw = 52, 40, 14
-            tip_y  = cy - ah // 2
-            base_y = cy + ah // 4
-
-            p.setPen(QPen(QColor(self._acento), 2.5))
-            p.drawLine(cx,         tip_y,  cx - aw//2, base_y)
-            p.drawLine(cx,         tip_y,  cx + aw//2, base_y)
-            p.drawLine(cx - aw//2, base_y, cx - sw//2, base_y)
-            p.drawLine(cx + aw//2, base_y, cx + sw//2, base_y)
-            p.drawLine(cx - sw//2, base_y, cx - sw//2, cy + ah//2)
-            p.drawLine(cx + sw//2, base_y, cx + sw//2, cy + ah//2)
-            p.drawLine(cx - sw//2, cy + ah//2, cx + sw//2, cy + ah//2)
-
-            p.setFont(QFont("Segoe UI", 9))
-            p.setPen(QColor(self._acento))
-            by = cy + ah // 2
-            p.drawText(0, by + 14, w, 22,
-                       Qt.AlignmentFlag.AlignCenter,
-                       "Selecciona un archivo en la lista")
-            p.drawText(0, by + 34, w, 20,
-                       Qt.AlignmentFlag.AlignCenter,
-                       "o arrastra archivos aquí")
-        p.end()
-
-
 class MainWindow(QMainWindow):
     def __init__(self, app):
         super().__init__()
         self._app          = app
         self._cfg          = load_config()
         self._worker       = None
+        self._workers_fin  = []    # lotes detenidos que aun no terminan
         self._is_stopping  = False
-        self._items_map    = {}
-        self._active_items = []
-        self._current_idx  = 0
+        self._activas      = []    # rutas del lote en curso
+        self._ingestas     = []    # busquedas de archivos en curso
+        self._retiradas    = []    # busquedas ya desconectadas, terminando
+        self._progreso_map = {}    # ruta -> % del archivo en el lote activo
+        self._progreso_suma = 0    # sum(self._progreso_map.values())
+        self._agregador    = None  # ProgresoAcumulado del lote activo
+        self._eta          = None  # EstimadorLote del lote activo
+        self._hechos       = 0
         self._t0           = 0.0
+        self._diario       = None    # DiarioLote del lote en curso
 
         self._timer = QTimer(self)
         self._timer.timeout.connect(self._tick_timer)
+        self._timer_progreso = QTimer(self)
+        self._timer_progreso.setInterval(1000 // CUADROS_POR_S)
+        self._timer_progreso.timeout.connect(self._volcar_progreso)
 
         self.setWindowTitle("Local OCR Pro")
         self.setMinimumSize(350, 500)
@@ -154,19 +107,31 @@ class MainWindow(QMainWindow):
         self._settings = QSettings("Emmanuel", "ProyectoOCR")
 
         # Construir widgets antes de _build_ui
-        self._texto   = QTextEdit()
-        self._preview = PreviewPlaceholder()
-
-        self._tree = QTreeWidget()
-        self._tree.setColumnCount(3)
-        self._tree.setHeaderLabels(["Archivo", "Estado", "Ruta Completa"])
-        self._tree.setSelectionMode(QTreeWidget.SelectionMode.ExtendedSelection)
+        self._visor   = VisorResultados()
+        self._visor.documento_cambiado.connect(self._on_documento_visor)
+        self._preview = VistaPrevia(self._cfg)
+
+        self._cola   = ModeloCola(self)
+        self._filtro = FiltroCola(self._cola, self)
+        # QTableView y no QTreeView: el arbol recalcula su disposicion
+        # fila por fila (llamando al modelo) con cada insercion
+        self._tree = QTableView()
+        self._tree.setModel(self._filtro)
+        self._tree.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self._tree.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self._tree.setAlternatingRowColors(True)
-        self._tree.setRootIsDecorated(False)
-        self._tree.header().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
-        self._tree.header().resizeSection(1, 110)
-        self._tree.setColumnHidden(2, True)
-        self._tree.currentItemChanged.connect(self._on_item_seleccionado)
+        self._tree.setShowGrid(False)
+        self._tree.setWordWrap(False)
+        self._tree.verticalHeader().hide()
+        self._tree.verticalHeader().setDefaultSectionSize(24)
+        self._tree.horizontalHeader().setHighlightSections(False)
+        self._tree.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self._tree.horizontalHeader().resizeSection(1, 110)
+        self._tree.selectionModel().currentChanged.connect(self._on_item_seleccionado)
+        self._buscar = QLineEdit()
+        self._buscar.setPlaceholderText("Filtrar por nombre...")
+        self._buscar.setClearButtonEnabled(True)
+        self._buscar.textChanged.connect(self._filtro.setFilterFixedString)
         self._tree.setAcceptDrops(True)
         self._tree.dragEnterEvent = self._drag_enter
         self._tree.dragMoveEvent  = lambda e: e.accept()
@@ -175,10 +140,17 @@ class MainWindow(QMainWindow):
         self._build_ui()
         self._aplicar_estilos_tema()
         self._actualizar_iconos_tema()
+        # Con la ventana ya visible: ofrecer retomar un lote cortado
+        QTimer.singleShot(0, self._ofrecer_reanudar)
 
     def closeEvent(self, event):
         self._settings.setValue("splitter_state", self._splitter.saveState())
         self._settings.setValue("window_geometry", self.saveGeometry())
+        for w in self._ingestas + self._retiradas:
+            w.detener()
+            w.wait(2000)
+        self._visor.cerrar()
+        self._preview.cerrar()
         super().closeEvent(event)
 
     # ── Estilos de tema ──────────────────────────────────────────
@@ -247,7 +219,7 @@ class MainWindow(QMainWindow):
             }}
             QPushButton:hover  {{ background-color: {p['hover']}; color: white; }}
             QPushButton:disabled {{ background-color: {p['brd']}; color: #777; }}
-            QTreeWidget {{
+            QTableView, QListView {{
                 background-color: {p['bg']};
                 alternate-background-color: {p['alt']};
                 color: {p['fg']};
@@ -255,15 +227,15 @@ class MainWindow(QMainWindow):
                 outline: 0;
                 show-decoration-selected: 1;
             }}
-            QTreeWidget::item {{
+            QTableView::item, QListView::item {{
                 padding: 3px 0;
                 color: {p['fg']};
             }}
-            QTreeWidget::item:selected {{
+            QTableView::item:selected, QListView::item:selected {{
                 background-color: {p['acento']};
                 color: white;
             }}
-            QTreeWidget::item:hover:!selected {{
+            QTableView::item:hover:!selected, QListView::item:hover:!selected {{
                 background-color: {p['alt']};
             }}
             QHeaderView {{
@@ -368,6 +340,12 @@ class MainWindow(QMainWindow):
         self.a_add.setToolTip("Añadir archivos a la lista (Ctrl+O)")
         self.a_add.triggered.connect(self._abrir)
 
+        self.a_add_dir = QAction(icono("add"), "Añadir Carpeta...", self)
+        self.a_add_dir.setShortcut("Ctrl+Shift+O")
+        self.a_add_dir.setToolTip(
+            "Añadir todos los documentos de una carpeta y sus subcarpetas")
+        self.a_add_dir.triggered.connect(self._abrir_carpeta)
+
         self.a_open_dir = QAction(icono("folder"), "Carpeta de Salida", self)
         self.a_open_dir.setToolTip("Abrir carpeta de resultados")
         self.a_open_dir.triggered.connect(self._abrir_carpeta_salida)
@@ -403,14 +381,15 @@ class MainWindow(QMainWindow):
 
         self.a_copy_all = QAction("Copiar Todo", self)
         self.a_copy_all.triggered.connect(
-            lambda: self._app.clipboard().setText(self._texto.toPlainText()))
+            lambda: self._app.clipboard().setText(self._visor.texto_todo()))
         self.a_clear_txt = QAction("Limpiar Pantalla", self)
-        self.a_clear_txt.triggered.connect(self._texto.clear)
+        self.a_clear_txt.triggered.connect(self._visor.limpiar)
 
         # Menús
         mb = self.menuBar()
         m_arch = mb.addMenu("&Archivo")
-        m_arch.addActions([self.a_add, self.a_open_dir, self.a_limpiar_todo])
+        m_arch.addActions([self.a_add, self.a_add_dir, self.a_open_dir,
+                           self.a_limpiar_todo])
         m_arch.addSeparator()
         m_arch.addAction("Salir", self.close)
 
@@ -451,6 +430,7 @@ class MainWindow(QMainWindow):
         left_lay.setContentsMargins(0, 0, 0, 0)
         left_lay.setSpacing(4)
         self._tree.setMinimumHeight(160)
+        left_lay.addWidget(self._buscar)
         left_lay.addWidget(self._tree, 2)
         left_lay.addWidget(self._preview, 3)
         self._splitter.addWidget(left)
@@ -462,13 +442,18 @@ class MainWindow(QMainWindow):
         self._lbl_texto = QLabel("  Texto extraído")
         self._lbl_texto.setFont(QFont("Segoe UI", 9, QFont.Weight.Bold))
         right_lay.addWidget(self._lbl_texto)
-        right_lay.addWidget(self._texto)
+        right_lay.addWidget(self._visor)
         btn_row = QHBoxLayout()
+        btn_doc = QPushButton("Copiar")
+        btn_doc.setToolTip("Copiar el texto del documento a la vista")
+        btn_doc.clicked.connect(
+            lambda: self._app.clipboard().setText(self._visor.texto_actual()))
         btn_cop = QPushButton("Copiar todo")
         btn_cop.clicked.connect(
-            lambda: self._app.clipboard().setText(self._texto.toPlainText()))
+            lambda: self._app.clipboard().setText(self._visor.texto_todo()))
         btn_lim = QPushButton("Limpiar texto")
-        btn_lim.clicked.connect(self._texto.clear)
+        btn_lim.clicked.connect(self._visor.limpiar)
+        btn_row.addWidget(btn_doc)
         btn_row.addWidget(btn_cop)
         btn_row.addWidget(btn_lim)
         btn_row.addStretch()
@@ -490,13 +475,18 @@ class MainWindow(QMainWindow):
         # Status bar
         self._status_lbl = QLabel("Listo.")
         self._time_lbl   = QLabel("")
-        self._time_lbl.setFixedWidth(310)
+        self._time_lbl.setFixedWidth(360)
+        self._mem_lbl    = QLabel("")
+        self._mem_lbl.setToolTip(
+            "Memoria de las páginas rasterizadas, todos los procesos juntos:\n"
+            "en uso / tope (pico del lote). Sin lugar, los procesos esperan.")
         self._progress = QProgressBar()
         self._progress.setFixedWidth(190)
         self._progress.hide()
 
         sb = self.statusBar()
         sb.addWidget(self._status_lbl, 1)
+        sb.addPermanentWidget(self._mem_lbl)
         sb.addPermanentWidget(self._time_lbl)
         sb.addPermanentWidget(self._progress)
 
@@ -508,159 +498,267 @@ class MainWindow(QMainWindow):
             event.ignore()
 
     def _drop_archivos(self, event):
-        exts = {".pdf", ".png", ".jpg", ".jpeg", ".tiff", ".bmp"}
-        n = 0
-        for url in event.mimeData().urls():
-            path = url.toLocalFile()
-            if os.path.splitext(path)[1].lower() in exts:
-                if path not in self._items_map:
-                    item = QTreeWidgetItem(
-                        [os.path.basename(path), "Pendiente", path])
-                    item.setCheckState(0, Qt.CheckState.Checked)
-                    self._tree.addTopLevelItem(item)
-                    self._items_map[path] = item
-                    n += 1
-        if n:
-            self.a_run.setEnabled(True)
-            self._status(f"{n} archivo(s) añadido(s) por arrastre.")
+        # Archivos y carpetas: la busqueda corre fuera del hilo de la UI
+        rutas = [url.toLocalFile() for url in event.mimeData().urls()]
+        rutas = [r for r in rutas if r]
+        if rutas:
+            self._ingestar(rutas)
         event.acceptProposedAction()
 
-    # ── Árbol ────────────────────────────────────────────────────
+    # ── Búsqueda de archivos ─────────────────────────────────────
+    def _ingestar(self, entradas):
+        """Busca documentos en segundo plano y los va sumando a la cola."""
+        w = IngestaWorker(entradas)
+        w.bloque.connect(self._on_bloque_ingesta)
+        w.terminado.connect(self._on_ingesta_terminada)
+        w.finished.connect(lambda w=w: self._soltar_ingesta(w))
+        self._ingestas.append(w)
+        self._status("Buscando archivos...")
+        w.start()
+
+    def _soltar_ingesta(self, w):
+        for lista in (self._ingestas, self._retiradas):
+            if w in lista:
+                lista.remove(w)
+
+    def _on_bloque_ingesta(self, rutas):
+        if self._cola.agregar(rutas) and self._worker is None:
+            self.a_run.setEnabled(True)
+        self._status(f"Buscando archivos... {len(self._cola)} en la lista")
+
+    def _on_ingesta_terminada(self, encontrados, descartados):
+        if self._worker is not None:
+            return    # la barra de estado es del lote en curso
+        msg = f"{encontrados} archivo(s) encontrado(s), {len(self._cola)} en la lista."
+        if descartados:
+            msg += (f" {descartados} descartado(s): el contenido no "
+                    "coincide con la extensión.")
+        self._status(msg)
+
+    # ── Cola ─────────────────────────────────────────────────────
     def _set_checks(self, state):
-        for i in range(self._tree.topLevelItemCount()):
-            self._tree.topLevelItem(i).setCheckState(0, state)
+        self._cola.marcar_todos(state == Qt.CheckState.Checked)
 
     def _on_item_seleccionado(self, current, _previous):
-        if current:
-            ruta = current.text(2)
-            self._preview.set_archivo(ruta if ruta else None)
+        if current.isValid():
+            ruta = current.data(ROL_RUTA)
+            self._preview.set_archivo(ruta if ruta else None,
+                                      self._vecinos(current.row()))
+            if ruta:
+                self._visor.elegir(ruta)
+
+    def _vecinos(self, fila: int) -> list:
+        """Rutas de las filas cercanas, para adelantar su vista previa."""
+        rutas = []
+        for f in (fila + 1, fila - 1, fila + 2, fila - 2):
+            if 0 <= f < self._filtro.rowCount():
+                rutas.append(self._filtro.index(f, 0).data(ROL_RUTA))
+        return rutas
+
+    def _on_documento_visor(self, nombre):
+        self._lbl_texto.setText(
+            f"  Texto extraído — {nombre}" if nombre else "  Texto extraído")
 
     def _abrir(self):
         paths, _ = QFileDialog.getOpenFileNames(
             self, "Añadir archivos",
             self._cfg.get("output_dir", ""),
-            "Documentos (*.pdf *.png *.jpg *.jpeg *.tiff *.bmp);;"
-            "PDF (*.pdf);;Imágenes (*.png *.jpg *.jpeg *.tiff *.bmp)")
+            "Documentos (*.pdf *.png *.jpg *.jpeg *.tiff *.tif *.bmp);;"
+            "PDF (*.pdf);;Imágenes (*.png *.jpg *.jpeg *.tiff *.tif *.bmp)")
         if paths:
-            n = 0
-            for p in paths:
-                if p not in self._items_map:
-                    item = QTreeWidgetItem(
-                        [os.path.basename(p), "Pendiente", p])
-                    item.setCheckState(0, Qt.CheckState.Checked)
-                    self._tree.addTopLevelItem(item)
-                    self._items_map[p] = item
-                    n += 1
-            if n:
-                self.a_run.setEnabled(True)
-                self._status(f"{n} archivo(s) añadido(s).")
+            self._ingestar(paths)
+
+    def _abrir_carpeta(self):
+        carpeta = QFileDialog.getExistingDirectory(
+            self, "Añadir carpeta", self._cfg.get("output_dir", ""))
+        if carpeta:
+            self._ingestar([carpeta])
 
     def _quitar_seleccionados(self):
-        root = self._tree.invisibleRootItem()
-        for i in range(self._tree.topLevelItemCount() - 1, -1, -1):
-            item = self._tree.topLevelItem(i)
-            if item.checkState(0) == Qt.CheckState.Checked:
-                self._items_map.pop(item.text(2), None)
-                root.removeChild(item)
-        if self._tree.topLevelItemCount() == 0:
+        self._cola.quitar_marcadas()
+        if not len(self._cola):
             self.a_run.setEnabled(False)
             self._preview.set_archivo(None)
 
     def _limpiar_todo(self):
-        self._items_map.clear()
-        self._tree.clear()
-        self._texto.clear()
+        # Que una busqueda en curso no vuelva a llenar la lista: se
+        # desconecta una sola vez y queda en _retiradas hasta terminar
+        for w in self._ingestas:
+            w.bloque.disconnect(self._on_bloque_ingesta)
+            w.terminado.disconnect(self._on_ingesta_terminada)
+            w.detener()
+        self._retiradas.extend(self._ingestas)
+        self._ingestas.clear()
+        self._cola.vaciar()
+        self._visor.limpiar()
         self._preview.set_archivo(None)
         self.a_run.setEnabled(False)
         self._status("Listo.")
 
     # ── Procesar lote ────────────────────────────────────────────
     def _procesar_lote(self):
-        self._active_items = [
-            self._tree.topLevelItem(i)
-            for i in range(self._tree.topLevelItemCount())
-            if self._tree.topLevelItem(i).checkState(0) == Qt.CheckState.Checked
-        ]
-        if not self._active_items:
+        self._activas = rutas = self._cola.marcadas()
+        if not rutas:
             return
 
-        for item in self._active_items:
-            self._set_estado(item, "En cola...", "#555555")
+        for ruta in rutas:
+            self._set_estado(ruta, "En cola...", "#555555")
 
-        self._current_idx = 0
+        self._progreso_map = dict.fromkeys(rutas, 0)
+        self._progreso_suma = 0
+        self._agregador   = ProgresoAcumulado()
+        self._eta         = EstimadorLote(rutas)
+        self._hechos      = 0
         self._is_stopping = False
         self._t0          = time.time()
         self.a_run.setEnabled(False)
         self.a_stop.setEnabled(True)
         self.a_add.setEnabled(False)
+        self.a_add_dir.setEnabled(False)
         self._progress.setValue(0)
         self._progress.show()
         self._timer.start(1000)
-        self._procesar_siguiente()
-
-    def _procesar_siguiente(self):
-        if self._is_stopping or self._current_idx >= len(self._active_items):
-            self._finalizar_lote(success=not self._is_stopping)
-            return
+        self._timer_progreso.start()
+        self._visor.seguir()
+        self._status(f"Procesando {len(rutas)} archivo(s)...")
 
-        item  = self._active_items[self._current_idx]
-        total = len(self._active_items)
-        self._set_estado(item, "En curso...", "#3498db")
-        self._status(f"Procesando {self._current_idx+1}/{total}: {item.text(0)}")
-
-        self._worker = OCRWorker(item.text(2), dict(self._cfg))
-        self._worker.progreso.connect(self._progress.setValue)
-        self._worker.resultado.connect(
-            lambda t, it=item: self._on_resultado(t, it))
-        self._worker.error.connect(
-            lambda msg, it=item: self._on_error_worker(msg, it))
-        self._worker.terminado.connect(
-            lambda dur, it=item: self._on_archivo_terminado(dur, it))
+        # Al reanudar ya hay diario; si no, se abre uno nuevo
+        if self._diario is None:
+            try:
+                self._diario = DiarioLote.nuevo(rutas)
+            except OSError:
+                self._diario = None
+        self._worker = LoteWorker(rutas, dict(self._cfg), diario=self._diario,
+                                  agregador=self._agregador)
+        self._worker.paginas.connect(self._on_paginas)
+        self._worker.resultado.connect(self._on_resultado)
+        self._worker.error.connect(self._on_error_worker)
+        self._worker.registro.connect(self._on_registro)
+        self._worker.terminado.connect(self._on_archivo_terminado)
         self._worker.start()
 
-    def _on_resultado(self, texto, item):
-        self._texto.append(
-            f"\n{'─'*46}\n  {item.text(0)}\n{'─'*46}\n{texto}\n")
-
-    def _on_error_worker(self, msg, item):
-        self._set_estado(item, "Error", "#c0392b")
-        self._texto.append(f"\n[ERROR] {item.text(0)}:\n{msg}\n")
-
-    def _on_archivo_terminado(self, duracion, item):
-        if self._is_stopping:
+    def _volcar_progreso(self):
+        """Un cuadro: aplica el ultimo porcentaje de cada archivo que cambio."""
+        if self._agregador is None:
             return
-        if item.text(1) != "Error":
-            self._set_estado(item, f"OK  {duracion:.1f}s", "#27ae60")
-        self._current_idx += 1
-        self._procesar_siguiente()
-
-    def _set_estado(self, item, texto, color):
-        item.setText(1, texto)
-        item.setBackground(1, QBrush(QColor(color)))
-        item.setForeground(1, QBrush(QColor("white")))
+        cambios = self._agregador.tomar()
+        if not cambios:
+            return
+        for ruta, pct in cambios.items():
+            if ruta not in self._progreso_map:
+                continue
+            self._poner_progreso(ruta, pct)
+            self._eta.avance(ruta, pct)
+            self._set_estado(ruta, f"En curso {pct}%", "#3498db")
+        self._actualizar_barra()
+
+    def _poner_progreso(self, ruta, pct):
+        self._progreso_suma += pct - self._progreso_map[ruta]
+        self._progreso_map[ruta] = pct
+
+    def _actualizar_barra(self):
+        if self._progreso_map:
+            self._progress.setValue(self._progreso_suma // len(self._progreso_map))
+
+    def _on_paginas(self, ruta, n):
+        if self._eta is not None:
+            self._eta.paginas(ruta, n)
+
+    def _on_resultado(self, ruta, texto):
+        self._visor.agregar(ruta, texto, os.path.basename(ruta))
+
+    def _on_error_worker(self, ruta, msg):
+        self._set_estado(ruta, "Error", "#c0392b")
+        self._visor.agregar(ruta, msg, os.path.basename(ruta), error=True)
+
+    def _on_registro(self, ruta, reg):
+        """Tooltip de la columna Estado con el desglose de tiempos."""
+        if self._eta is not None:
+            self._eta.terminado(ruta, reg)
+        if not self._cola.contiene(ruta):
+            return
+        lineas = [f"Total {reg['total']:.2f}s  ·  {reg['n_paginas']} página(s)"]
+        if reg.get("confianza") is not None:
+            lineas[0] += f"  ·  confianza {reg['confianza']:.0%}"
+        if reg["estado"] == "cache":
+            lineas.append("Resultado tomado de la caché")
+        lineas.extend(f"Aviso: {aviso}" for aviso in reg.get("avisos", ()))
+        for origen, leyenda in (("capa",      "con texto incrustado, sin OCR"),
+                                ("blanca",    "en blanco, omitida(s)"),
+                                ("duplicada", "repetida(s), texto reutilizado")):
+            cuantas = sum(1 for p in reg["paginas"] if p.get("origen") == origen)
+            if cuantas:
+                lineas.append(f"{cuantas} página(s) {leyenda}")
+        for etapa, seg in sorted(reg["etapas"].items(), key=lambda e: -e[1]):
+            lineas.append(f"{etapa:<15} {seg:8.2f}s")
+        if reg["paginas"]:
+            costo = lambda p: (p["rasterizado"] + p.get("preproceso", 0.0)
+                               + p["reconocimiento"])
+            lenta = max(reg["paginas"], key=costo)
+            lineas.append(
+                f"Página más lenta: {lenta['pagina']} ({costo(lenta):.2f}s)")
+        self._cola.poner_tooltip(ruta, "\n".join(lineas))
+
+    def _on_archivo_terminado(self, ruta, duracion):
+        if self._cola.estado(ruta) != "Error":
+            self._set_estado(ruta, f"OK  {duracion:.1f}s", "#27ae60")
+        if self._agregador is not None:
+            # Un porcentaje atrasado no debe tapar el "OK"
+            self._agregador.descartar(ruta)
+        if ruta in self._progreso_map:
+            self._poner_progreso(ruta, 100)
+        if self._eta is not None:
+            self._eta.terminado(ruta)    # sin registro si fallo el pool
+        self._hechos += 1
+        self._actualizar_barra()
+        self._status(
+            f"Procesando... {self._hechos}/{len(self._activas)} listos")
+        if self._hechos >= len(self._activas):
+            self._finalizar_lote(success=True)
+
+    def _set_estado(self, ruta, texto, color):
+        self._cola.poner_estado(ruta, texto, color)
 
     def _detener(self):
         self._is_stopping = True
+        self._volcar_progreso()    # que "En curso" refleje lo ultimo recibido
         if self._worker:
-            self._worker.detener()
-        if 0 <= self._current_idx < len(self._active_items):
-            self._set_estado(
-                self._active_items[self._current_idx],
-                "Detenido", "#e67e22")
-        for i in range(self._current_idx + 1, len(self._active_items)):
-            self._set_estado(self._active_items[i], "Cancelado", "#7f8c8d")
+            # Los eventos tardios del lote detenido ya no tocan la UI;
+            # se guarda la referencia hasta que el hilo termine de verdad.
+            w = self._worker
+            for senal in (w.paginas, w.resultado, w.error, w.registro,
+                          w.terminado):
+                senal.disconnect()
+            w.detener()
+            self._workers_fin.append(w)
+            w.finished.connect(lambda w=w: self._workers_fin.remove(w))
+        for ruta in self._activas:
+            estado = self._cola.estado(ruta)
+            if estado.startswith("En curso"):
+                self._set_estado(ruta, "Detenido", "#e67e22")
+            elif estado == "En cola...":
+                self._set_estado(ruta, "Cancelado", "#7f8c8d")
         self._finalizar_lote(success=False)
 
     def _finalizar_lote(self, success):
         self._timer.stop()
+        self._timer_progreso.stop()
+        self._agregador = None
+        self._eta = None
         self.a_run.setEnabled(True)
         self.a_stop.setEnabled(False)
         self.a_add.setEnabled(True)
+        self.a_add_dir.setEnabled(True)
         self._progress.hide()
+        # El pico del lote queda a la vista hasta el proximo
+        self._mostrar_memoria()
         self._worker    = None
+        if self._diario:
+            self._diario.cerrar()
+            self._diario = None
         elapsed         = time.time() - self._t0
         if success:
-            n = len(self._active_items)
+            n = len(self._activas)
             self._status(f"✨ Completado — {n} archivo(s) en {elapsed:.1f}s")
             self._play_sound()
             self._verificar_apertura_carpeta()
@@ -668,6 +766,36 @@ class MainWindow(QMainWindow):
             self._status("🛑 Detenido.")
         self._time_lbl.setText("")
 
+    # ── Reanudar un lote interrumpido ────────────────────────────
+    def _ofrecer_reanudar(self):
+        hallado = lote_interrumpido()
+        if hallado is None:
+            return
+        ruta_diario, estados = hallado
+        hechos = {r for r, e in estados.items() if e.get("estado") == HECHO}
+        faltan = [r for r in estados
+                  if r not in hechos and os.path.exists(r)]
+        if not faltan:
+            descartar(ruta_diario)
+            return
+        resp = QMessageBox.question(
+            self, "Lote interrumpido",
+            f"El último lote no terminó: {len(hechos)} de {len(estados)} "
+            f"archivo(s) ya estaban listos.\n\n"
+            f"¿Reanudar con los {len(faltan)} restantes?")
+        if resp != QMessageBox.StandardButton.Yes:
+            descartar(ruta_diario)
+            return
+
+        self._cola.agregar((r for r in estados if os.path.exists(r)),
+                           marcado=False)
+        for r in faltan:
+            self._cola.marcar(r, True)
+        for r in hechos:
+            self._set_estado(r, "OK (anterior)", "#27ae60")
+        self._diario = DiarioLote(ruta_diario)
+        self._procesar_lote()
+
     def _verificar_apertura_carpeta(self):
         modo   = self._cfg.get("modo_salida", "ambos")
         outdir = self._cfg.get("output_dir", "")
@@ -679,17 +807,30 @@ class MainWindow(QMainWindow):
                     pass
 
     def _tick_timer(self):
+        """Transcurrido, ritmo en paginas/s y restante por trabajo pendiente."""
         elapsed = time.time() - self._t0
-        total   = len(self._active_items)
-        hecho   = self._current_idx
-        if hecho > 0 and total > 0:
-            est      = elapsed / (hecho / total)
-            restante = max(0.0, est - elapsed)
-            self._time_lbl.setText(
-                f"{hecho}/{total}  ·  {self._fmt(elapsed)}"
-                f"  ~{self._fmt(restante)} restante")
-        else:
+        total   = len(self._activas)
+        if self._eta is None:
+            return
+        self._eta.muestra()
+        self._mostrar_memoria()
+        ritmo, restante = self._eta.paginas_por_s(), self._eta.restante()
+        if ritmo is None:
             self._time_lbl.setText(f"Transcurrido: {self._fmt(elapsed)}")
+            return
+        texto = (f"{self._hechos}/{total}  ·  {self._fmt(elapsed)}"
+                 f"  ·  {ritmo:.1f} pág/s")
+        if restante is not None:
+            texto += f"  ~{self._fmt(restante)} restante"
+        self._time_lbl.setText(texto)
+
+    def _mostrar_memoria(self):
+        uso = self._worker.uso_memoria() if self._worker else None
+        if not uso:
+            return
+        en_uso, pico, limite = (v / (1024 * 1024) for v in uso)
+        tope = f" / {limite:.0f}" if limite else ""
+        self._mem_lbl.setText(f"Mem. {en_uso:.0f}{tope} MB (pico {pico:.0f})")
 
     def _abrir_config(self):
         dlg = ConfigDialog(self, self._cfg)
@@ -703,6 +844,7 @@ class MainWindow(QMainWindow):
 
     def _on_config_updated(self, cfg):
         self._cfg = cfg
+        self._preview.actualizar_cfg(cfg)
         self._aplicar_estilos_tema()
         self._actualizar_iconos_tema()
 
@@ -710,6 +852,7 @@ class MainWindow(QMainWindow):
         p = PALETAS.get(self._cfg.get("tema", "Oscuro"), PALETAS["Oscuro"])
         c = p["fg"]
         self.a_add.setIcon(icono("add",              c))
+        self.a_add_dir.setIcon(icono("add",          c))
         self.a_open_dir.setIcon(icono("folder",      c))
         self.a_limpiar_todo.setIcon(icono("trash",   c))
         self.a_run.setIcon(icono("play",              p["acento"]))
@@ -751,6 +894,7 @@ class MainWindow(QMainWindow):
     def _actualizar_iconos_tema_con(self, p: dict):
         c = p.get("fg", "#eff0f1")
         self.a_add.setIcon(icono("add",               c))
+        self.a_add_dir.setIcon(icono("add",           c))
         self.a_open_dir.setIcon(icono("folder",       c))
         self.a_limpiar_todo.setIcon(icono("trash",    c))
         self.a_run.setIcon(icono("play",               p.get("acento", c)))
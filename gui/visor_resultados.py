@@ -0,0 +1,185 @@
+# gui/visor_resultados.py
+# Visor del texto extraido
+# Arriba, la lista de archivos con resultado (QListView sobre un modelo:
+# solo se pintan las filas visibles); abajo, el texto de UN documento,
+# leido de ResultadosSesion al elegirlo. Mientras el usuario no elige
+# nada, el visor sigue al ultimo resultado que llega, con un respiro de
+# VISTA_MS para no redibujar en cada archivo de un lote rapido.
+
+import os
+
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QSplitter, QListView, QPlainTextEdit
+)
+from PyQt6.QtGui import QColor
+from PyQt6.QtCore import (
+    Qt, QAbstractListModel, QModelIndex, QTimer, pyqtSignal
+)
+
+from core.resultados import ResultadosSesion, formatear
+
+VISTA_MS = 150
+
+
+class ModeloResultados(QAbstractListModel):
+    """Una fila por archivo: (ruta, nombre, error). El texto no se guarda aqui."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._filas  = []
+        self._indice = {}    # ruta -> fila
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._filas)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        ruta, nombre, error = self._filas[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"[ERROR] {nombre}" if error else nombre
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return ruta
+        if role == Qt.ItemDataRole.ForegroundRole and error:
+            return QColor("#c0392b")
+        if role == Qt.ItemDataRole.UserRole:
+            return ruta
+        return None
+
+    def poner(self, ruta, nombre, error):
+        fila = self._indice.get(ruta)
+        if fila is not None:
+            self._filas[fila] = (ruta, nombre, error)
+            idx = self.index(fila)
+            self.dataChanged.emit(idx, idx)
+            return idx
+        fila = len(self._filas)
+        self.beginInsertRows(QModelIndex(), fila, fila)
+        self._filas.append((ruta, nombre, error))
+        self._indice[ruta] = fila
+        self.endInsertRows()
+        return self.index(fila)
+
+    def nombre(self, ruta):
+        fila = self._indice.get(ruta)
+        return self._filas[fila][1] if fila is not None else ""
+
+    def fila_de(self, ruta):
+        fila = self._indice.get(ruta)
+        return self.index(fila) if fila is not None else QModelIndex()
+
+    def vaciar(self):
+        self.beginResetModel()
+        self._filas.clear()
+        self._indice.clear()
+        self.endResetModel()
+
+
+class VisorResultados(QWidget):
+    """Lista de resultados + texto del documento elegido."""
+
+    documento_cambiado = pyqtSignal(str)    # nombre del documento a la vista
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._datos    = ResultadosSesion()
+        self._modelo   = ModeloResultados(self)
+        self._actual   = None     # ruta del documento a la vista
+        self._seguir   = True     # mostrar el ultimo resultado que llega
+        self._pendiente = None
+        self._interno  = False    # cambio de seleccion hecho por el visor
+
+        self._lista = QListView()
+        self._lista.setModel(self._modelo)
+        self._lista.setUniformItemSizes(True)
+        self._lista.setAlternatingRowColors(True)
+        self._lista.setEditTriggers(QListView.EditTrigger.NoEditTriggers)
+        self._lista.selectionModel().currentChanged.connect(self._on_elegido)
+
+        self._texto = QPlainTextEdit()
+        self._texto.setReadOnly(True)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(VISTA_MS)
+        self._timer.timeout.connect(self._mostrar_pendiente)
+
+        partes = QSplitter(Qt.Orientation.Vertical)
+        partes.addWidget(self._lista)
+        partes.addWidget(self._texto)
+        partes.setSizes([120, 480])
+        partes.setStretchFactor(1, 1)
+        lay = QVBoxLayout(self)
+        lay.setContentsMargins(0, 0, 0, 0)
+        lay.addWidget(partes)
+
+    # ── Entrada ──────────────────────────────────────────────────
+    def agregar(self, ruta, texto, nombre=None, error=False):
+        nombre = nombre or os.path.basename(ruta)
+        self._datos.guardar(ruta, nombre, texto, error)
+        self._modelo.poner(ruta, nombre, error)
+        if ruta == self._actual:
+            self.mostrar(ruta)
+        elif self._seguir:
+            self._pendiente = ruta
+            if not self._timer.isActive():
+                self._timer.start()
+
+    def seguir(self):
+        """Vuelve a mostrar el ultimo resultado que llegue (nuevo lote)."""
+        self._seguir = True
+
+    # ── Vista ────────────────────────────────────────────────────
+    def mostrar(self, ruta) -> bool:
+        """Carga el texto de `ruta`; False si ese archivo aun no tiene resultado."""
+        guardado = self._datos.texto(ruta)
+        if guardado is None:
+            return False
+        texto, error = guardado
+        self._actual = ruta
+        self._interno = True
+        self._lista.setCurrentIndex(self._modelo.fila_de(ruta))
+        self._interno = False
+        nombre = self._modelo.nombre(ruta)
+        self._texto.setPlainText(
+            formatear(nombre, texto, error=True) if error else texto)
+        self.documento_cambiado.emit(nombre)
+        return True
+
+    def elegir(self, ruta) -> bool:
+        """Muestra `ruta` por pedido del usuario: deja de seguir el lote."""
+        if self.mostrar(ruta):
+            self._seguir = False
+            return True
+        return False
+
+    def _mostrar_pendiente(self):
+        if self._pendiente is not None and self._seguir:
+            self.mostrar(self._pendiente)
+        self._pendiente = None
+
+    def _on_elegido(self, current, _previous):
+        if self._interno or not current.isValid():
+            return
+        self.elegir(current.data(Qt.ItemDataRole.UserRole))
+
+    # ── Acciones ─────────────────────────────────────────────────
+    def texto_actual(self) -> str:
+        return self._texto.toPlainText()
+
+    def texto_todo(self) -> str:
+        """Todos los resultados de la sesion, como un solo texto."""
+        return "\n".join(formatear(n, t, e) for n, t, e in self._datos.iterar())
+
+    def limpiar(self):
+        self._timer.stop()
+        self._pendiente = None
+        self._actual = None
+        self._seguir = True
+        self._datos.limpiar()
+        self._modelo.vaciar()
+        self._texto.clear()
+        self.documento_cambiado.emit("")
+
+    def cerrar(self):
+        self._datos.cerrar()
@@ -0,0 +1,223 @@
+# gui/vista_previa.py
+# Vista previa del documento elegido
+# La primera pagina del PDF (o la imagen) se reduce al tamano del widget
+# en un hilo aparte (VistaWorker): la UI nunca decodifica. Las vistas ya
+# reducidas quedan en una cache LRU con tope en bytes
+# (cfg["vista_cache_mb"]), y al elegir un archivo se adelantan sus
+# vecinos de la lista: bajar con las flechas pinta al instante.
+# Sin archivo elegido se dibuja la invitacion a agregar archivos.
+
+import os
+from collections import OrderedDict
+
+from PyQt6.QtWidgets import QWidget
+from PyQt6.QtGui import QPainter, QColor, QPen, QFont, QPixmap
+from PyQt6.QtCore import Qt, QRectF, QTimer
+
+from core.ocr_engine import VistaWorker
+
+MARGEN   = 12     # px entre el marco y la pagina
+VISTA_MS = 150    # espera tras un cambio de tamano antes de pedir otra
+
+
+def cache_max(cfg: dict) -> int:
+    try:
+        return max(0, int(float(cfg.get("vista_cache_mb", 64)) * 1024 * 1024))
+    except (TypeError, ValueError):
+        return 64 * 1024 * 1024
+
+
+class CacheMiniaturas:
+    """QPixmap por clave; al pasar el tope se descartan los menos usados."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.bytes     = 0
+        self._datos    = OrderedDict()    # clave -> (pixmap, bytes)
+
+    def __contains__(self, clave):
+        return clave in self._datos
+
+    def obtener(self, clave):
+        dato = self._datos.get(clave)
+        if dato is None:
+            return None
+        self._datos.move_to_end(clave)
+        return dato[0]
+
+    def poner(self, clave, pixmap: QPixmap):
+        tam = pixmap.width() * pixmap.height() * 4
+        if clave in self._datos:
+            self.bytes -= self._datos.pop(clave)[1]
+        self._datos[clave] = (pixmap, tam)
+        self.bytes += tam
+        self._recortar()
+
+    def poner_tope(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._recortar()
+
+    def _recortar(self):
+        # La recien puesta se queda aunque sola supere el tope
+        while self.bytes > self.max_bytes and len(self._datos) > 1:
+            _clave, (_pix, tam) = self._datos.popitem(last=False)
+            self.bytes -= tam
+
+
+class VistaPrevia(QWidget):
+    """Primera pagina del archivo elegido, ajustada al widget."""
+
+    def __init__(self, cfg: dict, parent=None):
+        super().__init__(parent)
+        self.setMinimumHeight(220)
+        self._acento  = "#3c7bd4"
+        self._archivo = None    # ruta del archivo elegido
+        self._vecinos = []
+        self._clave   = None    # clave de la vista que corresponde mostrar
+        self._pixmap  = None    # ultima vista de _archivo (puede ser de otro tamano)
+        self._error   = None
+        self._cache   = CacheMiniaturas(cache_max(cfg))
+
+        self._worker = VistaWorker(dict(cfg))
+        self._worker.lista.connect(self._on_lista)
+        self._worker.fallo.connect(self._on_fallo)
+        self._worker.start()
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(VISTA_MS)
+        self._timer.timeout.connect(lambda: self.set_archivo(self._archivo, self._vecinos))
+
+    def set_acento(self, color: str):
+        self._acento = color
+        self.update()
+
+    def actualizar_cfg(self, cfg: dict):
+        self._worker.cfg = dict(cfg)
+        self._cache.poner_tope(cache_max(cfg))
+
+    def cerrar(self):
+        self._worker.detener()
+        self._worker.wait(2000)
+
+    # ── Pedidos ──────────────────────────────────────────────────
+    def _claves(self, rutas) -> list:
+        """(ruta, ancho, alto, mtime) a pedir, en pixeles del dispositivo."""
+        escala = self.devicePixelRatioF()
+        ancho = int((self.width() - 2 * MARGEN) * escala)
+        alto  = int((self.height() - 2 * MARGEN) * escala)
+        claves = []
+        for ruta in rutas:
+            try:
+                mtime = os.stat(ruta).st_mtime_ns
+            except OSError:
+                continue
+            claves.append((ruta, max(1, ancho), max(1, alto), mtime))
+        return claves
+
+    def set_archivo(self, ruta, vecinos=()):
+        """Muestra `ruta` (None = ninguno) y adelanta `vecinos` en segundo plano."""
+        if ruta != self._archivo:
+            self._pixmap = None
+        self._archivo = ruta
+        self._vecinos = list(vecinos)
+        self._error   = None
+        self._clave   = None
+        if not ruta:
+            self._worker.pedir(None)
+            self.update()
+            return
+        claves = self._claves([ruta])
+        if not claves:
+            self._error = "No se encuentra el archivo"
+            self.update()
+            return
+        self._clave = claves[0]
+        pix = self._cache.obtener(self._clave)
+        if pix is not None:
+            self._pixmap = pix
+        pendientes = [c for c in self._claves(self._vecinos) if c not in self._cache]
+        self._worker.pedir(None if pix is not None else self._clave, pendientes)
+        self.update()
+
+    def _on_lista(self, clave, imagen):
+        pix = QPixmap.fromImage(imagen)
+        pix.setDevicePixelRatio(self.devicePixelRatioF())
+        self._cache.poner(clave, pix)
+        if clave == self._clave:
+            self._pixmap = pix
+            self.update()
+
+    def _on_fallo(self, clave, mensaje):
+        if clave == self._clave:
+            self._error = mensaje
+            self.update()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        # Mientras tanto se pinta la vista anterior escalada
+        if self._archivo:
+            self._timer.start()
+
+    # ── Pintado ──────────────────────────────────────────────────
+    def paintEvent(self, event):
+        p = QPainter(self)
+        p.setRenderHint(QPainter.RenderHint.Antialiasing)
+        w, h = self.width(), self.height()
+
+        # Marco punteado
+        p.setPen(QPen(QColor(self._acento), 1.5, Qt.PenStyle.DashLine))
+        p.drawRoundedRect(6, 6, w - 12, h - 12, 10, 10)
+
+        p.setFont(QFont("Segoe UI", 9))
+        p.setPen(QColor(self._acento))
+        if self._archivo and self._pixmap is not None and not self._error:
+            self._pintar_pagina(p, w, h)
+        elif self._archivo:
+            nombre = os.path.basename(self._archivo)
+            texto = (f"Vista previa no disponible:\n{nombre}\n\n{self._error}"
+                     if self._error else f"Cargando vista previa…\n{nombre}")
+            p.drawText(10, 0, w - 20, h,
+                       Qt.AlignmentFlag.AlignCenter | Qt.TextFlag.TextWordWrap,
+                       texto)
+        else:
+            self._pintar_invitacion(p, w, h)
+        p.end()
+
+    def _pintar_pagina(self, p, w, h):
+        pix = self._pixmap
+        escala = pix.devicePixelRatio()
+        pw, ph = pix.width() / escala, pix.height() / escala
+        # Tras achicar el widget la vista anterior puede no caber
+        factor = min(1.0, (w - 2 * MARGEN) / pw, (h - 2 * MARGEN) / ph)
+        pw, ph = pw * factor, ph * factor
+        destino = QRectF((w - pw) / 2, (h - ph) / 2, pw, ph)
+        if factor < 1.0:
+            p.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        p.drawPixmap(destino, pix, QRectF(pix.rect()))
+
+    def _pintar_invitacion(self, p, w, h):
+        # Flecha upload
+        cx, cy = w // 2, h // 2 - 16
+        ah, aw, sw = 52, 40, 14
+        tip_y  = cy - ah // 2
+        base_y = cy + ah // 4
+
+        p.setPen(QPen(QColor(self._acento), 2.5))
+        p.drawLine(cx,         tip_y,  cx - aw//2, base_y)
+        p.drawLine(cx,         tip_y,  cx + aw//2, base_y)
+        p.drawLine(cx - aw//2, base_y, cx - sw//2, base_y)
+        p.drawLine(cx + aw//2, base_y, cx + sw//2, base_y)
+        p.drawLine(cx - sw//2, base_y, cx - sw//2, cy + ah//2)
+        p.drawLine(cx + sw//2, base_y, cx + sw//2, cy + ah//2)
+        p.drawLine(cx - sw//2, cy + ah//2, cx + sw//2, cy + ah//2)
+
+        p.setFont(QFont("Segoe UI", 9))
+        p.setPen(QColor(self._acento))
+        by = cy + ah // 2
+        p.drawText(0, by + 14, w, 22,
+                   Qt.AlignmentFlag.AlignCenter,
+                   "Selecciona un archivo en la lista")
+        p.drawText(0, by + 34, w, 20,
+                   Qt.AlignmentFlag.AlignCenter,
+                   "o arrastra archivos aquí")
@@ -4,6 +4,7 @@
 
 import sys
 import os
+import multiprocessing
 
 BASE = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, BASE)
@@ -38,4 +39,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Necesario para el pool de procesos OCR en ejecutables congelados
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,119 @@
+# tests/test_huellas.py
+# Paginas en blanco y repetidas (core/huellas.py, pipeline.examinar_pagina)
+# Ejecutar: python -m unittest discover tests
+
+import os
+import sys
+import random
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+except ImportError:
+    Image = None
+
+from core import huellas as hu
+from core.pipeline import examinar_pagina
+
+CARTA = (2550, 3300)    # carta a 300 DPI
+
+
+def _fuente(tam: int):
+    try:
+        return ImageFont.load_default(size=tam)
+    except TypeError:       # Pillow < 10.1: solo la fuente de mapa de bits
+        return ImageFont.load_default()
+
+
+def _formulario(monto: str, pagina: int):
+    """Hoja de un mismo formulario: solo cambian el monto y el numero de pagina."""
+    img = Image.new("L", CARTA, 255)
+    d = ImageDraw.Draw(img)
+    d.rectangle((150, 150, 2400, 3150), outline=0, width=6)
+    d.text((250, 250), "FACTURA DE SERVICIOS", fill=0, font=_fuente(90))
+    for i, renglon in enumerate(("Cliente: Comercial del Norte S.A.",
+                                 "Concepto: mantenimiento mensual",
+                                 "Domicilio: Av. Principal 1234")):
+        d.text((250, 500 + i * 120), renglon, fill=0, font=_fuente(60))
+    d.text((250, 1200), f"Importe total: $ {monto}", fill=0, font=_fuente(60))
+    d.text((1200, 3000), f"Pagina {pagina}", fill=0, font=_fuente(40))
+    return img
+
+
+def _en_blanco_con_polvo():
+    img = Image.new("L", CARTA, 255)
+    d = ImageDraw.Draw(img)
+    rnd = random.Random(7)
+    for _ in range(40):
+        x, y = rnd.randrange(200, 2300), rnd.randrange(200, 3100)
+        d.point((x, y), fill=0)
+    return img
+
+
+def _titulo_suelto():
+    img = Image.new("L", CARTA, 255)
+    ImageDraw.Draw(img).text((1050, 1500), "Anexo II", fill=0, font=_fuente(44))
+    return img
+
+
+@unittest.skipIf(Image is None, "requiere Pillow")
+class TestDuplicadas(unittest.TestCase):
+
+    def setUp(self):
+        self.cfg = {"detectar_duplicadas": True}
+        self.base = hu.HuellasLote(":memory:", hu.max_diferencia(self.cfg))
+
+    def tearDown(self):
+        self.base.cerrar()
+
+    def _reconocer(self, img, texto):
+        origen, previo, clave = examinar_pagina(img, self.cfg, self.base)
+        if origen is None:
+            self.base.guardar(*clave, texto)
+        return origen, previo
+
+    def test_formulario_con_otro_monto_no_reusa_texto(self):
+        self.assertEqual(self._reconocer(_formulario("1.250,00", 1), "pagina 1"),
+                         (None, None))
+        origen, texto = self._reconocer(_formulario("9.870,50", 2), "pagina 2")
+        self.assertIsNone(origen)
+        self.assertIsNone(texto)
+
+    def test_pagina_identica_reusa_texto(self):
+        self._reconocer(_formulario("1.250,00", 1), "pagina 1")
+        self.assertEqual(self._reconocer(_formulario("1.250,00", 1), "otra"),
+                         ("duplicada", "pagina 1"))
+
+    def test_desactivada_por_defecto(self):
+        self.base.guardar(*examinar_pagina(_formulario("1", 1), self.cfg, self.base)[2], "x")
+        origen, _, clave = examinar_pagina(_formulario("1", 1), {}, self.base)
+        self.assertIsNone(origen)
+        self.assertIsNone(clave)
+
+    def test_tolerancia_con_tope(self):
+        self.assertLessEqual(hu.max_diferencia({"duplicado_max_dif": 0.02}),
+                             hu.DIFERENCIA_TOPE)
+
+
+@unittest.skipIf(Image is None, "requiere Pillow")
+class TestBlancas(unittest.TestCase):
+
+    def test_titulo_suelto_no_es_blanca(self):
+        img = _titulo_suelto()
+        # Poca tinta, incluso con el tope viejo: lo salvan los trazos
+        self.assertLessEqual(hu.tinta(img), 0.0003)
+        origen, _, _ = examinar_pagina(img, {"blanco_max_tinta": 0.0003})
+        self.assertIsNone(origen)
+        self.assertIsNone(examinar_pagina(img, {})[0])
+
+    def test_hoja_con_polvo_es_blanca(self):
+        self.assertEqual(examinar_pagina(_en_blanco_con_polvo(), {})[0], "blanca")
+
+    def test_hoja_vacia_es_blanca(self):
+        self.assertEqual(examinar_pagina(Image.new("L", CARTA, 255), {})[0], "blanca")
+
+
+if __name__ == "__main__":
+    unittest.main()